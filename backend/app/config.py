@@ -12,12 +12,79 @@ class Settings:
     NEO4J_URI: str = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     NEO4J_USER: str = os.getenv("NEO4J_USER", "neo4j")
     NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "password")
+    NEO4J_BATCH_SIZE: int = int(os.getenv("NEO4J_BATCH_SIZE", "500"))
+    NEO4J_MAX_POOL_SIZE: int = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+    NEO4J_ACQUISITION_TIMEOUT: float = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
+    NEO4J_MAX_CONNECTION_LIFETIME: float = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+    TRAVERSAL_MAX_DEPTH: int = int(os.getenv("TRAVERSAL_MAX_DEPTH", "4"))
+    TRAVERSAL_MAX_FANOUT: int = int(os.getenv("TRAVERSAL_MAX_FANOUT", "100"))
+    TRAVERSAL_MAX_NODES: int = int(os.getenv("TRAVERSAL_MAX_NODES", "2000"))
+    TRAVERSAL_SCAN_FACTOR: int = int(os.getenv("TRAVERSAL_SCAN_FACTOR", "20"))
+    TRAVERSAL_MAX_PAGE_SIZE: int = int(os.getenv("TRAVERSAL_MAX_PAGE_SIZE", "200"))
+    INGEST_QUEUE_SIZE: int = int(os.getenv("INGEST_QUEUE_SIZE", "1000"))
+    
+    # Concept extraction; empty path uses the built-in vocabulary
+    CONCEPT_VOCABULARY_PATH: str = os.getenv("CONCEPT_VOCABULARY_PATH", "")
+    
+    # In-memory concept index; loaded at startup if the file exists
+    CONCEPT_INDEX_PATH: str = os.getenv("CONCEPT_INDEX_PATH", "data/concept_index.npz")
+    CONCEPT_INDEX_TOP_K: int = int(os.getenv("CONCEPT_INDEX_TOP_K", "10"))
+    # Seconds between API checks for index files the worker rewrote after ingest; 0 disables
+    INDEX_RELOAD_INTERVAL: float = float(os.getenv("INDEX_RELOAD_INTERVAL", "30"))
+    
+    # Similar-publication index (hashed TF-IDF of titles and abstracts); loaded at startup if the file exists
+    SIMILARITY_INDEX_PATH: str = os.getenv("SIMILARITY_INDEX_PATH", "data/similarity_index.npz")
+    SIMILARITY_HASH_BITS: int = int(os.getenv("SIMILARITY_HASH_BITS", "18"))
+    # Score cells plus postings scanned per query block (about 24 bytes each at peak)
+    SIMILARITY_BLOCK_ELEMENTS: int = int(os.getenv("SIMILARITY_BLOCK_ELEMENTS", str(1 << 22)))
+    SIMILARITY_MAX_BATCH: int = int(os.getenv("SIMILARITY_MAX_BATCH", "1000"))
+    
+    # Local columnar copy of the publication corpus
+    CORPUS_SNAPSHOT_DIR: str = os.getenv("CORPUS_SNAPSHOT_DIR", "data/corpus")
+    CORPUS_EXPORT_PAGE_SIZE: int = int(os.getenv("CORPUS_EXPORT_PAGE_SIZE", "5000"))
+    
+    # Pre-forked API server (python -m app.serve)
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "2"))
+    # Worker N serves its own /metrics on API_METRICS_PORT + N; 0 disables them
+    API_METRICS_PORT: int = int(os.getenv("API_METRICS_PORT", "9200"))
     
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     
+    # Background jobs (state lives in Redis)
+    JOB_WORKER_CONCURRENCY: int = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+    JOB_RESULT_TTL: int = int(os.getenv("JOB_RESULT_TTL", "86400"))
+    JOB_PROGRESS_INTERVAL: float = float(os.getenv("JOB_PROGRESS_INTERVAL", "1.0"))
+    # A running job whose worker has not renewed its lease for this long is failed
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    # Port for the worker's /metrics endpoint; 0 disables it
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "9100"))
+    
+    # Result cache
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    
+    # Simulation
+    MONTE_CARLO_CHUNK_SIZE: int = int(os.getenv("MONTE_CARLO_CHUNK_SIZE", "100000"))
+    MONTE_CARLO_WORKERS: int = int(os.getenv("MONTE_CARLO_WORKERS", str(os.cpu_count() or 1)))
+    MONTE_CARLO_MAX_TRIALS: int = int(os.getenv("MONTE_CARLO_MAX_TRIALS", "5000000"))
+    TRAJECTORY_CHECKPOINT_DIR: str = os.getenv("TRAJECTORY_CHECKPOINT_DIR", "data/checkpoints")
+    # Oldest checkpoints are deleted beyond this many
+    TRAJECTORY_MAX_CHECKPOINTS: int = int(os.getenv("TRAJECTORY_MAX_CHECKPOINTS", "100"))
+    TRAJECTORY_MAX_DAYS: int = int(os.getenv("TRAJECTORY_MAX_DAYS", "3650"))
+    TRAJECTORY_MAX_CREW: int = int(os.getenv("TRAJECTORY_MAX_CREW", "100000"))
+    # What-if lookup table: duration bucket width and the max interpolation error verify() accepts
+    RISK_TABLE_BUCKET_DAYS: int = int(os.getenv("RISK_TABLE_BUCKET_DAYS", "5"))
+    RISK_TABLE_TOLERANCE: float = float(os.getenv("RISK_TABLE_TOLERANCE", "0.01"))
+    
     # NASA APIs
     NASA_PUBSPACE_API: str = "https://api.ncbi.nlm.nih.gov/lit/ctxp/v1/pubspace/"
     NASA_GENELAB_API: str = "https://genelab.nasa.gov/api/"
+    NASA_PAGE_SIZE: int = int(os.getenv("NASA_PAGE_SIZE", "100"))
+    NASA_HTTP_CONCURRENCY: int = int(os.getenv("NASA_HTTP_CONCURRENCY", "8"))
+    NASA_HTTP_POOL_SIZE: int = int(os.getenv("NASA_HTTP_POOL_SIZE", "32"))
+    NASA_HTTP_RATE_LIMIT: float = float(os.getenv("NASA_HTTP_RATE_LIMIT", "20"))
+    NASA_HTTP_MAX_RETRIES: int = int(os.getenv("NASA_HTTP_MAX_RETRIES", "5"))
+    NASA_HTTP_TIMEOUT: float = float(os.getenv("NASA_HTTP_TIMEOUT", "30"))
 
 settings = Settings()
\ No newline at end of file
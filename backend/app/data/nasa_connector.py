@@ -1,36 +1,198 @@
 import aiohttp
 import asyncio
-from typing import List, Dict, Any
+import math
+import random
+import sys
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional
 import json
 import logging
+from app.config import settings
+from app.services.cache import stable_hash
+from app.services.metrics import FETCH_RETRIES, FETCH_SECONDS
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def content_hash(record: Dict) -> str:
+    """Fingerprint of a parsed record's content, stored on its node to skip unchanged re-ingests"""
+    return stable_hash({k: v for k, v in record.items() if k != 'content_hash'})
+
+class PageFetchError(RuntimeError):
+    """A listing page still failed after all retries; the records it held were not read"""
+
+    def __init__(self, source: str, page: int):
+        super().__init__(f"{source} page {page} could not be fetched")
+        self.source = source
+        self.page = page
+
+class AsyncRateLimiter:
+    """Spaces request starts to at most `rate` per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
 class NASADataConnector:
-    def __init__(self):
-        self.base_urls = {
-            'pubspace': 'https://api.ncbi.nlm.nih.gov/lit/ctxp/v1/pubspace/',
-            'genelab': 'https://genelab.nasa.gov/api/',
+    def __init__(self, base_urls: Optional[Dict[str, str]] = None, page_size: Optional[int] = None,
+                 concurrency: Optional[int] = None, rate_limit: Optional[float] = None,
+                 max_retries: Optional[int] = None, backoff_base: float = 0.5, backoff_cap: float = 30.0):
+        self.base_urls = base_urls or {
+            'pubspace': settings.NASA_PUBSPACE_API,
+            'genelab': settings.NASA_GENELAB_API,
             'lsda': 'https://lsda.jsc.nasa.gov/api/'
         }
+        self.page_size = page_size or settings.NASA_PAGE_SIZE
+        self.concurrency = concurrency or settings.NASA_HTTP_CONCURRENCY
+        self.rate_limit = settings.NASA_HTTP_RATE_LIMIT if rate_limit is None else rate_limit
+        self.max_retries = settings.NASA_HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter: Optional[AsyncRateLimiter] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Long-lived pooled session, recreated if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=settings.NASA_HTTP_POOL_SIZE,
+                limit_per_host=settings.NASA_HTTP_POOL_SIZE,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.NASA_HTTP_TIMEOUT)
+            )
+            self._session_loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._rate_limiter = AsyncRateLimiter(self.rate_limit)
+        return self._session
+    
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends one"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_cap)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+    
+    async def _get_json(self, source: str, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """GET a JSON document, retrying transient failures; None on permanent failure"""
+        with FETCH_SECONDS.time(source):
+            session = await self._get_session()
+            for attempt in range(self.max_retries + 1):
+                retry_after = None
+                await self._rate_limiter.acquire()
+                try:
+                    async with self._semaphore:
+                        async with session.get(url, params=params) as response:
+                            if response.status == 200:
+                                return await response.json(content_type=None)
+                            if response.status not in RETRY_STATUSES:
+                                logger.error(f"{source} API error: {response.status}")
+                                return None
+                            retry_after = response.headers.get('Retry-After')
+                            failure = f"HTTP {response.status}"
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    failure = repr(e)
+                
+                if attempt < self.max_retries:
+                    FETCH_RETRIES.inc(labels=(source,))
+                    delay = self._backoff_delay(attempt, retry_after)
+                    logger.warning(f"{source} request failed ({failure}), retry {attempt + 1} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+            
+            logger.error(f"{source} request failed after {self.max_retries + 1} attempts: {failure}")
+            return None
+    
+    async def _iter_pages(self, source: str, url: str, params: Dict, items_key: str,
+                          parse: Callable[[Dict], List[Dict]], max_results: Optional[int]) -> AsyncIterator[Dict]:
+        """Walk a paginated listing with bounded concurrency, yielding parsed records.
+
+        After the first page, pages are fetched `concurrency` at a time and
+        yielded as they complete, so record order across pages is not
+        guaranteed. The walk stops at the reported total, at max_results, or
+        at the first short page when the API reports no total. A page that
+        still fails after retries raises PageFetchError rather than leaving
+        a silent gap in the listing.
+        """
+        size = self.page_size if max_results is None else min(self.page_size, max_results)
+        remaining = sys.maxsize if max_results is None else max_results
+        
+        async def fetch(page: int):
+            data = await self._get_json(source, url, {**params, 'page': page, 'size': size})
+            if data is None:
+                raise PageFetchError(source, page)
+            return data
+        
+        first = await fetch(1)
+        for record in parse(first)[:remaining]:
+            yield record
+            remaining -= 1
+        if len(first.get(items_key, [])) < size or remaining <= 0:
+            return
+        
+        total = first.get('total', first.get('count'))
+        last_page = math.ceil(min(int(total), size + remaining) / size) if total is not None else sys.maxsize
+        
+        # Fetch one window of pages at a time so a slow consumer holds back the fetchers
+        next_page = 2
+        while remaining > 0 and next_page <= last_page:
+            pages = range(next_page, min(next_page + self.concurrency, last_page + 1))
+            exhausted = False
+            tasks = [asyncio.ensure_future(fetch(page)) for page in pages]
+            try:
+                for future in asyncio.as_completed(tasks):
+                    data = await future
+                    if len(data.get(items_key, [])) < size:
+                        exhausted = True
+                    for record in parse(data)[:remaining]:
+                        yield record
+                        remaining -= 1
+                    if remaining <= 0:
+                        return
+            finally:
+                for task in tasks:
+                    task.cancel()
+            if exhausted:
+                return
+            next_page = pages[-1] + 1
+    
+    async def iter_pubspace_publications(self, query: str = "space biology",
+                                         max_results: Optional[int] = 50) -> AsyncIterator[Dict]:
+        """Stream publications from NASA PubSpace across all result pages"""
+        params = {'format': 'json', 'q': query}
+        async for record in self._iter_pages('PubSpace', self.base_urls['pubspace'], params,
+                                             'results', self._parse_pubspace_data, max_results):
+            yield record
     
     async def fetch_pubspace_publications(self, query: str = "space biology", max_results: int = 50) -> List[Dict]:
-        """Fetch publications from NASA PubSpace"""
+        """Fetch publications from NASA PubSpace; raises PageFetchError if part of the listing is missing"""
         try:
-            params = {
-                'format': 'json',
-                'q': query,
-                'size': max_results
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.base_urls['pubspace'], params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_pubspace_data(data)
-                    else:
-                        logger.error(f"PubSpace API error: {response.status}")
-                        return []
+            return [pub async for pub in self.iter_pubspace_publications(query, max_results)]
+        except PageFetchError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching PubSpace data: {e}")
             return []
@@ -50,21 +212,25 @@ class NASADataConnector:
                 'nasa_topics': item.get('topics', []),
                 'source': 'pubspace'
             }
+            publication['content_hash'] = content_hash(publication)
             publications.append(publication)
         return publications
     
-    async def fetch_genelab_data(self, dataset_type: str = "transcriptomics") -> List[Dict]:
-        """Fetch data from NASA GeneLab"""
+    async def iter_genelab_data(self, dataset_type: str = "transcriptomics",
+                                max_results: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Stream GeneLab datasets across all result pages"""
+        url = f"{self.base_urls['genelab']}search/{dataset_type}"
+        parse = lambda data: self._parse_genelab_data(data, dataset_type)
+        async for record in self._iter_pages('GeneLab', url, {}, 'data', parse, max_results):
+            yield record
+    
+    async def fetch_genelab_data(self, dataset_type: str = "transcriptomics",
+                                 max_results: Optional[int] = None) -> List[Dict]:
+        """Fetch data from NASA GeneLab; raises PageFetchError if part of the listing is missing"""
         try:
-            url = f"{self.base_urls['genelab']}search/{dataset_type}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_genelab_data(data, dataset_type)
-                    else:
-                        logger.error(f"GeneLab API error: {response.status}")
-                        return []
+            return [dataset async for dataset in self.iter_genelab_data(dataset_type, max_results)]
+        except PageFetchError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching GeneLab data: {e}")
             return []
@@ -83,6 +249,7 @@ class NASADataConnector:
                 'publication_date': item.get('release_date'),
                 'source': 'genelab'
             }
+            dataset['content_hash'] = content_hash(dataset)
             datasets.append(dataset)
         return datasets
 
@@ -0,0 +1,55 @@
+"""FastAPI dependency providers for the service singletons.
+
+Each service module is imported on first use, so importing the app does
+not load neo4j, numpy or aiohttp, and nothing connects to the graph until a
+request needs it. Providers are `async def` so FastAPI resolves them on the
+event loop; a plain `def` dependency would be sent to the threadpool just to
+return a module attribute. Code outside request handling (startup,
+app.serve, the mission simulator) calls `service` directly. Tests swap a
+service with `app.dependency_overrides`.
+"""
+import importlib
+
+# Singleton name -> module that defines it
+SERVICES = {
+    'kg_service': 'app.services.knowledge_graph',
+    'async_kg_service': 'app.services.knowledge_graph',
+    'concept_index': 'app.services.concept_index',
+    'similarity_index': 'app.services.similarity_index',
+    'mission_simulator': 'app.services.simulation_engine',
+    'batch_risk_engine': 'app.services.batch_simulation',
+    'monte_carlo_simulator': 'app.services.monte_carlo',
+    'trajectory_simulator': 'app.services.trajectory',
+    'risk_table': 'app.services.risk_table'
+}
+
+def service(name: str):
+    """The singleton `name`, importing (and so creating) it on first use"""
+    return getattr(importlib.import_module(SERVICES[name]), name)
+
+async def get_kg_service():
+    return service('kg_service')
+
+async def get_async_kg_service():
+    return service('async_kg_service')
+
+async def get_concept_index():
+    return service('concept_index')
+
+async def get_similarity_index():
+    return service('similarity_index')
+
+async def get_mission_simulator():
+    return service('mission_simulator')
+
+async def get_batch_risk_engine():
+    return service('batch_risk_engine')
+
+async def get_monte_carlo_simulator():
+    return service('monte_carlo_simulator')
+
+async def get_trajectory_simulator():
+    return service('trajectory_simulator')
+
+async def get_risk_table():
+    return service('risk_table')
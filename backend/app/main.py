@@ -1,24 +1,82 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
+import asyncio
 import os
+import sys
+import time
+import logging
 from dotenv import load_dotenv
+from app.config import settings
+from app.dependencies import service
 from app.routes import data
-from app.services.knowledge_graph import kg_service
 from app.routes import simulation
+from app.routes import jobs
+from app.services.cache import result_cache
+from app.services.metrics import REQUEST_SECONDS, metrics
 
-app.include_router(simulation.router)
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+def _created(module: str, name: str):
+    """Singleton `name` of `module` if something already built it; never imports or creates it"""
+    return vars(sys.modules[module]).get(name) if module in sys.modules else None
+
+async def reload_changed_indexes(indexes, interval: float):
+    """Pick up index files the worker saves after each ingest job"""
+    while True:
+        await asyncio.sleep(interval)
+        for index in indexes:
+            try:
+                await asyncio.to_thread(index.reload_if_changed)
+            except Exception as e:
+                logger.warning(f"Reloading {type(index).__name__} failed: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🚀Starting Bio-Synapse Engine")
-    kg_service.init_schema()
+    logger.info("Starting Bio-Synapse Engine")
+    # Simulation routes work without the graph, so an unreachable database does not block startup
+    try:
+        service('kg_service').init_schema()
+    except Exception as e:
+        logger.warning(f"Knowledge graph schema not initialized: {e}")
+    concept_index = service('concept_index')
+    # Under app.serve the parent loaded the tables before forking; reuse its copy
+    if not concept_index.ready:
+        concept_index.load()
+    similarity_index = service('similarity_index')
+    if not similarity_index.ready:
+        similarity_index.load()
+    service('risk_table').snapshot()
+    reloader = None
+    if settings.INDEX_RELOAD_INTERVAL > 0:
+        indexes = [concept_index, similarity_index]
+        reloader = asyncio.create_task(reload_changed_indexes(indexes, settings.INDEX_RELOAD_INTERVAL))
     yield
     # Shutdown
-    kg_service.close()
-    print("🛑Shutting down Bio-Synapse Engine")
+    logger.info("Shutting down Bio-Synapse Engine")
+    if reloader is not None:
+        reloader.cancel()
+    if concept_index.ready and concept_index.dirty:
+        concept_index.save()
+    if similarity_index.ready and similarity_index.dirty:
+        similarity_index.save()
+    kg_service = _created('app.services.knowledge_graph', 'kg_service')
+    if kg_service is not None:
+        kg_service.close()
+    async_kg_service = _created('app.services.knowledge_graph', 'async_kg_service')
+    if async_kg_service is not None:
+        await async_kg_service.close()
+    monte_carlo_simulator = _created('app.services.monte_carlo', 'monte_carlo_simulator')
+    if monte_carlo_simulator is not None:
+        monte_carlo_simulator.close()
+    nasa_connector = _created('app.data.nasa_connector', 'nasa_connector')
+    if nasa_connector is not None:
+        await nasa_connector.close()
+    logger.info("Bio-Synapse Engine stopped")
 
 app = FastAPI(
     title="NASA Bio-Synapse Engine",
@@ -27,6 +85,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+app.include_router(data.router)
+app.include_router(simulation.router)
+app.include_router(jobs.router)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -36,6 +98,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Latency histogram per route template, so /graph/concepts/{concept_name} is one series"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get('route')
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            (request.method, route.path if route is not None else 'unmatched', str(status))
+        )
+
 @app.get("/")
 async def root():
     return {"message": "NASA Bio-Synapse Engine API", "status": "active"}
@@ -44,6 +122,14 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "bio-synapse-api"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return result_cache.stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
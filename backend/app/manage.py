@@ -0,0 +1,120 @@
+"""Maintenance commands: python -m app.manage <command>"""
+import argparse
+import json
+import logging
+
+def reconcile_stats(args):
+    from app.services.knowledge_graph import kg_service
+    try:
+        print(json.dumps(kg_service.reconcile_graph_stats(), indent=2))
+    finally:
+        kg_service.close()
+
+def build_concept_index(args):
+    from app.services.concept_index import concept_index
+    from app.services.knowledge_graph import kg_service
+    try:
+        concept_index.build(kg_service.iter_concept_edges())
+        concept_index.save(args.path)
+        print(json.dumps(concept_index.memory_report(), indent=2))
+    finally:
+        kg_service.close()
+
+def build_similarity_index(args):
+    from app.services.similarity_index import similarity_index
+    if args.from_corpus:
+        from app.services.corpus_snapshot import CorpusSnapshot
+        similarity_index.build(CorpusSnapshot(args.corpus_path).iter_batches(('id', 'title', 'abstract')))
+    else:
+        from app.services.knowledge_graph import kg_service
+        try:
+            similarity_index.build(kg_service.iter_publication_pages())
+        finally:
+            kg_service.close()
+    similarity_index.save(args.path)
+    print(json.dumps(similarity_index.memory_report(), indent=2))
+
+def export_corpus(args):
+    from app.services.corpus_snapshot import CorpusSnapshot
+    from app.services.knowledge_graph import kg_service
+    try:
+        snapshot = CorpusSnapshot(args.path)
+        totals = snapshot.export_from(kg_service, args.page_size)
+        print(json.dumps({**totals, **snapshot.stats()}, indent=2))
+    finally:
+        kg_service.close()
+
+def reextract_corpus(args):
+    from app.services.concept_extractor import concept_extractor
+    from app.services.corpus_snapshot import CorpusSnapshot
+    from app.services.knowledge_graph import kg_service
+    snapshot = CorpusSnapshot(args.path)
+    publications = concepts = 0
+    try:
+        for batch, concepts_by_key in snapshot.reextract(concept_extractor, args.batch_size):
+            publications += len(batch)
+            concepts += sum(len(found) for found in concepts_by_key.values())
+            if args.update_graph:
+                # Publication nodes are keyed by id alone; only their DISCUSSES edges change, since the
+                # snapshot may be older than the graph and has no content_hash
+                concepts_by_pub = {pub_id: found for (_, pub_id), found in concepts_by_key.items()}
+                kg_service.replace_publication_concepts(concepts_by_pub)
+    finally:
+        kg_service.close()
+    print(json.dumps({'publications': publications, 'concepts': concepts}, indent=2))
+
+def verify_risk_table(args):
+    from app.services.risk_table import RiskLookupTable, risk_table
+    from app.services.batch_simulation import batch_risk_engine
+    table = RiskLookupTable(batch_risk_engine, args.bucket_days) if args.bucket_days else risk_table
+    report = table.verify()
+    print(json.dumps(report, indent=2))
+    if not report['passed']:
+        raise SystemExit(1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description="Bio-Synapse maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "reconcile-stats", help="Recompute materialized graph counts exactly"
+    ).set_defaults(handler=reconcile_stats)
+
+    build_index = commands.add_parser(
+        "build-concept-index", help="Build the in-memory concept index from the graph and save it"
+    )
+    build_index.add_argument("--path", default=None, help="Output file (default: CONCEPT_INDEX_PATH)")
+    build_index.set_defaults(handler=build_concept_index)
+
+    build_similarity = commands.add_parser(
+        "build-similarity-index", help="Build the similar-publication index from the graph and save it"
+    )
+    build_similarity.add_argument("--path", default=None, help="Output file (default: SIMILARITY_INDEX_PATH)")
+    build_similarity.add_argument("--from-corpus", action="store_true",
+                                  help="Read titles and abstracts from the corpus snapshot instead of Neo4j")
+    build_similarity.add_argument("--corpus-path", default=None, help="Snapshot directory (default: CORPUS_SNAPSHOT_DIR)")
+    build_similarity.set_defaults(handler=build_similarity_index)
+
+    export = commands.add_parser("export-corpus", help="Append new or changed publications to the corpus snapshot")
+    export.add_argument("--path", default=None, help="Snapshot directory (default: CORPUS_SNAPSHOT_DIR)")
+    export.add_argument("--page-size", type=int, default=None)
+    export.set_defaults(handler=export_corpus)
+
+    reextract = commands.add_parser("reextract-corpus", help="Re-run concept extraction over the corpus snapshot")
+    reextract.add_argument("--path", default=None, help="Snapshot directory (default: CORPUS_SNAPSHOT_DIR)")
+    reextract.add_argument("--batch-size", type=int, default=1000)
+    reextract.add_argument("--update-graph", action="store_true", help="Write the extracted concepts back to Neo4j")
+    reextract.set_defaults(handler=reextract_corpus)
+
+    verify = commands.add_parser(
+        "verify-risk-table", help="Check the what-if lookup table against the exact risk kernel"
+    )
+    verify.add_argument("--bucket-days", type=int, default=None, help="Bucket width (default: RISK_TABLE_BUCKET_DAYS)")
+    verify.set_defaults(handler=verify_risk_table)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
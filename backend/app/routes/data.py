@@ -1,60 +1,141 @@
-from fastapi import APIRouter, HTTPException
-from app.data.nasa_connector import nasa_connector
-from app.services.knowledge_graph import kg_service
+from fastapi import APIRouter, Depends, HTTPException
+from app.dependencies import get_async_kg_service, get_concept_index, get_kg_service, get_similarity_index
+from app.services.cache import result_cache
+from app.services.traversal import InvalidCursor, paginate
+from app.config import settings
+from app.services.concept_extractor import concept_extractor
+from app.services.jobs import job_queue
+from pydantic import BaseModel
 import asyncio
+from typing import List, Optional
 
 router = APIRouter(prefix="/data", tags=["data"])
 
-@router.post("/ingest/pubspace")
-async def ingest_pubspace_data(query: str = "space biology microgravity", max_results: int = 20):
-    """Ingest data from NASA PubSpace"""
+class SimilarPublicationsQuery(BaseModel):
+    publication_ids: List[str]
+    limit: int = 10
+
+@router.post("/ingest/pubspace", status_code=202)
+async def ingest_pubspace_data(query: str = "space biology microgravity", max_results: int = 20,
+                               full_refresh: bool = False):
+    """Queue a streaming ingest from NASA PubSpace for the job worker.
+
+    Unchanged and already-seen records are skipped; full_refresh rewrites every fetched record.
+    """
+    try:
+        params = {'query': query, 'max_results': max_results, 'full_refresh': full_refresh}
+        job, created = await asyncio.to_thread(job_queue.submit, 'ingest_pubspace', params)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {str(e)}")
+    return {
+        "message": "PubSpace ingest queued" if created else "Identical ingest already queued or running",
+        "job_id": job['job_id'],
+        "status": job['status']
+    }
+
+@router.post("/ingest/genelab", status_code=202)
+async def ingest_genelab_data(dataset_type: str = "transcriptomics", max_results: Optional[int] = None,
+                              full_refresh: bool = False):
+    """Queue a GeneLab catalog sync (datasets, organisms, missions) for the job worker"""
     try:
-        publications = await nasa_connector.fetch_pubspace_publications(query, max_results)
-        
-        # Add to knowledge graph
-        for pub in publications:
-            kg_service.create_publication_node(pub)
-            
-            # Extract basic concepts from title (simplified - will be replaced with AI)
-            concepts = extract_concepts_from_text(pub['title'] + " " + pub['abstract'])
-            for concept in concepts:
-                kg_service.create_concept_relationship(pub['id'], concept)
-        
-        return {
-            "message": f"Successfully ingested {len(publications)} publications",
-            "publications": len(publications)
-        }
+        params = {'dataset_type': dataset_type, 'max_results': max_results, 'full_refresh': full_refresh}
+        job, created = await asyncio.to_thread(job_queue.submit, 'ingest_genelab', params)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Data ingestion failed: {str(e)}")
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {str(e)}")
+    return {
+        "message": "GeneLab ingest queued" if created else "Identical ingest already queued or running",
+        "job_id": job['job_id'],
+        "status": job['status']
+    }
 
 @router.get("/graph/stats")
-async def get_graph_stats():
-    """Get knowledge graph statistics"""
+async def get_graph_stats(async_kg_service=Depends(get_async_kg_service)):
+    """Get knowledge graph statistics from the materialized counts"""
     try:
-        stats = kg_service.get_graph_stats()
+        stats = await async_kg_service.get_graph_stats()
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get graph stats: {str(e)}")
 
+@router.post("/graph/stats/reconcile")
+async def reconcile_graph_stats(kg_service=Depends(get_kg_service)):
+    """Recompute the materialized graph counts from the database count store"""
+    try:
+        stats = await asyncio.to_thread(kg_service.reconcile_graph_stats)
+        result_cache.invalidate("graph")
+        return stats
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reconcile graph stats: {str(e)}")
+
 @router.get("/graph/concepts/{concept_name}")
-async def get_concept_connections(concept_name: str, depth: int = 2):
+async def get_concept_connections(concept_name: str, depth: int = 2,
+                                  async_kg_service=Depends(get_async_kg_service)):
     """Get concepts connected to a given concept"""
     try:
-        result = kg_service.get_connected_concepts(concept_name, depth)
+        result = await async_kg_service.get_connected_concepts(concept_name, depth)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get concept connections: {str(e)}")
 
+@router.get("/graph/concepts/{concept_name}/neighborhood")
+async def get_concept_neighborhood(concept_name: str, depth: int = 2, fanout: int = 25,
+                                   limit: int = 50, cursor: Optional[str] = None,
+                                   async_kg_service=Depends(get_async_kg_service)):
+    """Bounded, strength-ranked neighborhood of a concept with cursor pagination"""
+    depth = min(max(depth, 1), settings.TRAVERSAL_MAX_DEPTH)
+    fanout = min(max(fanout, 1), settings.TRAVERSAL_MAX_FANOUT)
+    try:
+        neighborhood = await async_kg_service.traverse_neighborhood(concept_name, depth, fanout)
+        params = {'concept': concept_name, 'depth': depth, 'fanout': fanout}
+        return paginate(neighborhood, params, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to traverse concept neighborhood: {str(e)}")
+
+@router.get("/graph/concepts/{concept_name}/related")
+async def get_related_concepts(concept_name: str, limit: int = 10, concept_index=Depends(get_concept_index)):
+    """Study count and most co-discussed concepts from the in-memory concept index"""
+    if not concept_index.ready:
+        raise HTTPException(status_code=503, detail="Concept index has not been built")
+    return {
+        'concept': concept_name,
+        'study_count': concept_index.study_count(concept_name),
+        'related': concept_index.related(concept_name, max(limit, 1))
+    }
+
+@router.get("/graph/concept-index")
+async def get_concept_index_stats(concept_index=Depends(get_concept_index)):
+    """Size and memory footprint of the in-memory concept index"""
+    return {'ready': concept_index.ready, **concept_index.memory_report()}
+
+@router.get("/publications/{publication_id}/similar")
+async def get_similar_publications(publication_id: str, limit: int = 10,
+                                   similarity_index=Depends(get_similarity_index)):
+    """Publications with the most similar title and abstract (TF-IDF cosine)"""
+    if not similarity_index.ready:
+        raise HTTPException(status_code=503, detail="Similarity index has not been built")
+    similar = await asyncio.to_thread(similarity_index.similar, publication_id, max(limit, 1))
+    if similar is None:
+        raise HTTPException(status_code=404, detail=f"Publication {publication_id} is not indexed")
+    return {'publication_id': publication_id, 'similar': similar}
+
+@router.post("/publications/similar")
+async def get_similar_publications_batch(query: SimilarPublicationsQuery,
+                                         similarity_index=Depends(get_similarity_index)):
+    """Similar publications for many ids at once; unknown ids map to null"""
+    if not similarity_index.ready:
+        raise HTTPException(status_code=503, detail="Similarity index has not been built")
+    if len(query.publication_ids) > settings.SIMILARITY_MAX_BATCH:
+        raise HTTPException(status_code=422, detail=f"At most {settings.SIMILARITY_MAX_BATCH} publication ids per query")
+    results = await asyncio.to_thread(similarity_index.similar_batch, query.publication_ids, max(query.limit, 1))
+    return {'results': dict(zip(query.publication_ids, results))}
+
+@router.get("/publications/similarity-index")
+async def get_similarity_index_stats(similarity_index=Depends(get_similarity_index)):
+    """Size and memory footprint of the similar-publication index"""
+    return {'ready': similarity_index.ready, **similarity_index.memory_report()}
+
 def extract_concepts_from_text(text: str) -> List[str]:
-    """Simple concept extraction - will be replaced with AI model"""
-    # Basic keyword extraction (replace with proper NLP)
-    keywords = ["microgravity", "radiation", "bone loss", "muscle atrophy", 
-                "cardiovascular", "immune system", "cognitive", "sleep",
-                "nutrition", "exercise", "mars", "moon", "iss"]
-    
-    found_concepts = []
-    for keyword in keywords:
-        if keyword.lower() in text.lower():
-            found_concepts.append(keyword)
-    
-    return found_concepts[:5]  # Limit to top 5 concepts
\ No newline at end of file
+    """Top 5 vocabulary concepts in `text`, ranked by frequency"""
+    return concept_extractor.extract(text, limit=5)
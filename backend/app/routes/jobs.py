@@ -0,0 +1,80 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, Optional
+from app.routes.simulation import MissionParameters, MonteCarloParameters
+from app.services.jobs import JOB_TYPES, job_queue
+import asyncio
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+class PubSpaceIngestParameters(BaseModel):
+    query: str = "space biology microgravity"
+    max_results: int = 20
+    full_refresh: bool = False
+
+class GeneLabIngestParameters(BaseModel):
+    dataset_type: str = "transcriptomics"
+    max_results: Optional[int] = None
+    full_refresh: bool = False
+
+class JobSubmission(BaseModel):
+    type: str
+    params: Dict[str, Any] = {}
+
+# Params are validated and filled with defaults before hashing, so omitted
+# defaults and explicit defaults deduplicate to the same job
+JOB_PARAMETERS = {
+    'ingest_pubspace': PubSpaceIngestParameters,
+    'ingest_genelab': GeneLabIngestParameters,
+    'mission': MissionParameters,
+    'monte_carlo': MonteCarloParameters
+}
+
+async def queue_call(method, *args):
+    """Run a blocking job queue call off the event loop; Redis errors become 503"""
+    try:
+        return await asyncio.to_thread(method, *args)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {str(e)}")
+
+@router.post("", status_code=202)
+async def submit_job(submission: JobSubmission):
+    """Queue a background job; identical submissions return the existing job"""
+    if submission.type not in JOB_TYPES:
+        raise HTTPException(status_code=422, detail=f"Unknown job type '{submission.type}'")
+    try:
+        params = JOB_PARAMETERS[submission.type](**submission.params).model_dump()
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    job, created = await queue_call(job_queue.submit, submission.type, params)
+    return {**job, 'deduplicated': not created}
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Get job status and progress"""
+    job = await queue_call(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    job.pop('result', None)
+    return job
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Get the result of a completed job"""
+    job = await queue_call(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job['status'] == 'failed':
+        raise HTTPException(status_code=409, detail=f"Job {job_id} failed: {job['error']}")
+    if job['status'] != 'completed':
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    return {'job_id': job_id, 'result': job['result']}
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = await queue_call(job_queue.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    job.pop('result', None)
+    return job
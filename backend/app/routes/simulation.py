@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from app.services.simulation_engine import mission_simulator
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from app.dependencies import (
+    get_batch_risk_engine, get_mission_simulator, get_monte_carlo_simulator, get_risk_table,
+    get_trajectory_simulator
+)
+from app.services.simulation_engine import RISK_AREAS
+from app.services.cache import stable_hash
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import asyncio
 
 router = APIRouter(prefix="/simulation", tags=["simulation"])
 
@@ -13,28 +20,148 @@ class MissionParameters(BaseModel):
     radiation_shielding: str = "standard"
     exercise_regimen: str = "standard"
 
+class MonteCarloParameters(MissionParameters):
+    trials: int = 10000
+    seed: Optional[int] = None
+    distributions: Optional[Dict[str, Dict[str, Any]]] = None
+
+class TrajectoryParameters(MissionParameters):
+    crew_size: int = 1
+    seed: int = 0
+    risk_threshold: float = 0.5
+    sample_every: int = 1
+    resume_from: Optional[str] = None
+    save_checkpoint: bool = False
+
+class BatchMissionParameters(BaseModel):
+    """Columnar scenario arrays; length-1 columns broadcast against the others"""
+    duration_days: List[int] = [365]
+    destination: List[str] = ["mars"]
+    artificial_gravity: List[bool] = [False]
+    radiation_shielding: List[str] = ["standard"]
+
 @router.post("/mission")
-async def simulate_mission(params: MissionParameters):
+async def simulate_mission(params: MissionParameters, mission_simulator=Depends(get_mission_simulator)):
     """Run mission simulation with given parameters"""
     try:
-        mission_params = params.dict()
-        results = mission_simulator.simulate_mission(mission_params)
+        mission_params = params.model_dump()
+        results = await asyncio.to_thread(mission_simulator.simulate_mission, mission_params)
         
         return {
             "success": True,
-            "simulation_id": f"sim_{hash(str(mission_params))}",
+            "simulation_id": f"sim_{stable_hash(mission_params)[:16]}",
             "results": results
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
 
+@router.post("/mission/monte-carlo")
+async def simulate_mission_monte_carlo(params: MonteCarloParameters,
+                                       monte_carlo_simulator=Depends(get_monte_carlo_simulator)):
+    """Run a seeded Monte Carlo simulation and return risk percentiles"""
+    try:
+        mission_params = params.model_dump(exclude={'trials', 'seed', 'distributions'})
+        results = await asyncio.to_thread(
+            monte_carlo_simulator.simulate,
+            mission_params, params.trials, params.seed, params.distributions
+        )
+        
+        return {
+            "success": True,
+            "results": results
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Monte Carlo simulation failed: {str(e)}")
+
+@router.post("/trajectory")
+async def simulate_trajectory(params: TrajectoryParameters,
+                              trajectory_simulator=Depends(get_trajectory_simulator)):
+    """Evolve mission risk day by day, optionally extending or saving a checkpoint"""
+    def run():
+        state = trajectory_simulator.load_checkpoint(params.resume_from) if params.resume_from else None
+        state = trajectory_simulator.simulate(
+            params.model_dump(), params.crew_size, params.seed, params.risk_threshold, state
+        )
+        checkpoint_id = trajectory_simulator.save_checkpoint(state) if params.save_checkpoint else None
+        return checkpoint_id, trajectory_simulator.summarize(state, params.duration_days, params.sample_every)
+    
+    try:
+        checkpoint_id, results = await asyncio.to_thread(run)
+        
+        return {
+            "success": True,
+            "checkpoint_id": checkpoint_id,
+            "results": results
+        }
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Trajectory simulation failed: {str(e)}")
+
+@router.post("/batch")
+async def simulate_batch(params: BatchMissionParameters, batch_risk_engine=Depends(get_batch_risk_engine)):
+    """Score many mission scenarios in one vectorized pass"""
+    from app.services.batch_simulation import total_risk_scores
+
+    try:
+        risks = batch_risk_engine.calculate_risks(
+            params.duration_days, params.destination,
+            params.artificial_gravity, params.radiation_shielding
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Scenario arrays do not broadcast: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch simulation failed: {str(e)}")
+    
+    # Bypass jsonable_encoder: the matrix is already plain floats
+    return JSONResponse({
+        "success": True,
+        "scenarios": risks.shape[0],
+        "risk_areas": list(RISK_AREAS),
+        "risks": risks.tolist(),
+        "total_risk_score": total_risk_scores(risks).tolist()
+    })
+
+@router.post("/what-if")
+async def what_if(params: BatchMissionParameters, risk_table=Depends(get_risk_table)):
+    """Interactive risk curves from the precomputed lookup table (see /simulation/what-if/table)"""
+    from app.services.batch_simulation import total_risk_scores
+
+    try:
+        risks = risk_table.lookup(
+            params.duration_days, params.destination,
+            params.artificial_gravity, params.radiation_shielding
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid what-if scenarios: {str(e)}")
+    
+    return JSONResponse({
+        "success": True,
+        "interpolated": True,
+        "scenarios": risks.shape[0],
+        "risk_areas": list(RISK_AREAS),
+        "risks": risks.tolist(),
+        "total_risk_score": total_risk_scores(risks).tolist()
+    })
+
+@router.get("/what-if/table")
+async def what_if_table(verify: bool = False, risk_table=Depends(get_risk_table)):
+    """Lookup table shape and version; verify=true also checks it against the exact kernel"""
+    if not verify:
+        return risk_table.info()
+    report = await asyncio.to_thread(risk_table.verify)
+    return {**risk_table.info(), 'verification': report}
+
 @router.get("/destinations")
-async def get_destinations():
+async def get_destinations(mission_simulator=Depends(get_mission_simulator)):
     """Get available mission destinations"""
     return {
         "destinations": [
-            {"id": "moon", "name": "Lunar Base", "transit_days": 3},
-            {"id": "mars", "name": "Mars Colony", "transit_days": 210},
-            {"id": "deep_space", "name": "Deep Space Mission", "transit_days": 365}
+            {"id": destination_id, **destination}
+            for destination_id, destination in mission_simulator.destinations.items()
         ]
     }
\ No newline at end of file
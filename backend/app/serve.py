@@ -0,0 +1,173 @@
+"""Pre-forked API server: python -m app.serve --workers N
+
+The parent imports the app (which builds the concept vocabulary), builds the
+other tables the workers only read (concept and similarity indexes, risk
+lookup table) and freezes the garbage collector, then binds the listening
+socket and forks. Workers share those pages copy-on-write instead of each
+building a copy. Anything holding a connection, thread or pool (graph
+drivers, Redis, the Monte Carlo pool) is created lazily in each worker,
+after the fork.
+
+Metrics live in each worker's memory, so /metrics on the shared port
+answers for whichever worker took the connection. Scrape every worker
+instead: worker N (a slot kept across respawns) also serves /metrics on
+--metrics-port + N, and all its samples carry a worker="N" label.
+"""
+from typing import Dict, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies sooner than this after starting is respawned with a delay
+MIN_WORKER_UPTIME = 1.0
+
+def preload():
+    """Import the app and build the shared read-only tables before forking"""
+    from app.main import app
+    from app.dependencies import service
+
+    # The driver library is shared too; each worker still creates its own drivers on first use
+    import neo4j
+    for name in ('mission_simulator', 'batch_risk_engine', 'monte_carlo_simulator', 'trajectory_simulator'):
+        service(name)
+    concept_index = service('concept_index')
+    if not concept_index.ready:
+        concept_index.load()
+    similarity_index = service('similarity_index')
+    if not similarity_index.ready:
+        similarity_index.load()
+    risk_table = service('risk_table')
+    risk_table.snapshot()
+    logger.info(f"Preloaded tables: concept index ready={concept_index.ready}, "
+                f"similarity index ready={similarity_index.ready}, "
+                f"risk table {risk_table.info().get('shape')}")
+    # Keep collections in the workers from writing to (and so copying) the inherited objects
+    gc.collect()
+    gc.freeze()
+    return app
+
+def bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        from app.services.metrics import metrics
+
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", metrics.CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(host: str, port: int) -> Optional[ThreadingHTTPServer]:
+    """Serve this process's metrics from a daemon thread, so a scrape never waits on the event loop"""
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Worker {os.getpid()} metrics not served on :{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+def run_worker(app, sock: socket.socket, log_level: str):
+    import uvicorn
+
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+def spawn(app, sock: socket.socket, log_level: str, slot: int, metrics_port: int) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    status = 0
+    try:
+        from app.services.metrics import metrics
+        metrics.constant_labels = {'worker': str(slot)}
+        if metrics_port:
+            start_metrics_server(sock.getsockname()[0], metrics_port + slot)
+        run_worker(app, sock, log_level)
+    except BaseException:
+        logger.exception(f"Worker {os.getpid()} crashed")
+        status = 1
+    finally:
+        os._exit(status)
+
+def serve(host: str, port: int, workers: int, log_level: str = "info", metrics_port: int = 0):
+    app = preload()
+    sock = bind(host, port)
+    started: Dict[int, float] = {}
+    slots: Dict[int, int] = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(started):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for slot in range(workers):
+        pid = spawn(app, sock, log_level, slot, metrics_port)
+        started[pid], slots[pid] = time.monotonic(), slot
+    logger.info(f"Serving on {host}:{port} with {workers} workers: {sorted(started)}")
+    if metrics_port:
+        logger.info(f"Worker metrics on ports {metrics_port}-{metrics_port + workers - 1}")
+
+    while started:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        uptime = time.monotonic() - started.pop(pid, time.monotonic())
+        slot = slots.pop(pid, None)
+        if stopping or slot is None:
+            continue
+        logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; respawning")
+        if uptime < MIN_WORKER_UPTIME:
+            time.sleep(MIN_WORKER_UPTIME)
+        pid = spawn(app, sock, log_level, slot, metrics_port)
+        started[pid], slots[pid] = time.monotonic(), slot
+    sock.close()
+    logger.info("All workers stopped")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Pre-forked Bio-Synapse API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.API_WORKERS)
+    parser.add_argument("--metrics-port", type=int, default=settings.API_METRICS_PORT,
+                        help="first per-worker metrics port; 0 disables them")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, max(args.workers, 1), args.log_level, args.metrics_port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from typing import Dict, Sequence, Union
+import numpy as np
+from app.services.simulation_engine import MissionSimulator, mission_simulator, RISK_AREAS, RISK_CAP
+from app.services.metrics import SIMULATION_SECONDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[np.ndarray, Sequence, float]
+
+def risk_kernel(duration_factor: ArrayLike, gravity: ArrayLike, radiation: ArrayLike,
+                artificial_gravity: ArrayLike, shielding_factor: ArrayLike,
+                coefficients: Dict[str, ArrayLike]) -> np.ndarray:
+    """Vectorized form of MissionSimulator._calculate_risks.
+
+    Every argument broadcasts against the others, so the same kernel scores a
+    parameter sweep (one coefficient set, many scenarios) or a Monte Carlo run
+    (one scenario, many sampled coefficient sets). Operations are applied in the
+    same order as the scalar path so float64 results are bit-identical.
+    Returns a (scenarios, len(RISK_AREAS)) matrix.
+    """
+    duration_factor, gravity, radiation, artificial_gravity, shielding_factor = np.broadcast_arrays(
+        np.asarray(duration_factor, dtype=np.float64),
+        np.asarray(gravity, dtype=np.float64),
+        np.asarray(radiation, dtype=np.float64),
+        np.asarray(artificial_gravity, dtype=bool),
+        np.asarray(shielding_factor, dtype=np.float64)
+    )
+    n = duration_factor.shape[0] if duration_factor.ndim else 1
+    risks = np.empty((n, len(RISK_AREAS)), dtype=np.float64)
+
+    risks[:, 0] = np.where(artificial_gravity, 0.0, coefficients['bone_density'] * gravity * duration_factor)
+    risks[:, 1] = np.where(artificial_gravity, 0.0, coefficients['muscle_mass'] * gravity * duration_factor)
+    risks[:, 2] = coefficients['cardiovascular'] * (1 - gravity) * duration_factor
+    risks[:, 3] = radiation * duration_factor * shielding_factor
+    risks[:, 4] = coefficients['psychological_base'] * duration_factor
+    risks[:, 5] = coefficients['immune_function'] * duration_factor
+
+    np.minimum(risks, RISK_CAP, out=risks)
+    return risks
+
+def total_risk_scores(risks: np.ndarray) -> np.ndarray:
+    """Row means summed left to right, matching sum(risks.values()) / len(risks)"""
+    total = risks[:, 0].copy()
+    for column in range(1, risks.shape[1]):
+        total += risks[:, column]
+    return total / risks.shape[1]
+
+class BatchRiskEngine:
+    """Scores many mission scenarios in one vectorized pass.
+
+    Coefficient tables are read from the wrapped MissionSimulator on every call,
+    so the batch and scalar paths never drift apart.
+    """
+
+    def __init__(self, simulator: MissionSimulator):
+        self.simulator = simulator
+
+    def coefficients(self) -> Dict[str, float]:
+        microgravity = self.simulator.risk_factors['microgravity']
+        return {
+            'bone_density': microgravity['bone_density'],
+            'muscle_mass': microgravity['muscle_mass'],
+            'cardiovascular': microgravity['cardiovascular'],
+            'psychological_base': self.simulator.risk_factors['isolation']['psychological_base'],
+            'immune_function': microgravity['immune_function']
+        }
+
+    def destination_arrays(self, destinations: ArrayLike):
+        """Look up gravity and radiation per scenario; unknown destinations fall back to mars"""
+        table = self.simulator.destination_factors
+        names, inverse = np.unique(np.asarray(destinations, dtype=str), return_inverse=True)
+        rows = [table.get(name, table['mars']) for name in names]
+        gravity = np.array([row['gravity'] for row in rows], dtype=np.float64)[inverse]
+        radiation = np.array([row['radiation'] for row in rows], dtype=np.float64)[inverse]
+        return gravity, radiation
+
+    def shielding_array(self, shielding: ArrayLike) -> np.ndarray:
+        names, inverse = np.unique(np.asarray(shielding, dtype=str), return_inverse=True)
+        factors = np.array([self.simulator.shielding_factors.get(name, 1.0) for name in names], dtype=np.float64)
+        return factors[inverse]
+
+    @SIMULATION_SECONDS.time('batch')
+    def calculate_risks(self, duration_days: ArrayLike, destination: ArrayLike,
+                        artificial_gravity: ArrayLike, radiation_shielding: ArrayLike) -> np.ndarray:
+        """Return a scenarios x RISK_AREAS matrix; inputs broadcast against each other"""
+        duration_days, destination, artificial_gravity, radiation_shielding = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(duration_days)),
+            np.atleast_1d(np.asarray(destination, dtype=str)),
+            np.atleast_1d(np.asarray(artificial_gravity, dtype=bool)),
+            np.atleast_1d(np.asarray(radiation_shielding, dtype=str))
+        )
+        duration_factor = np.minimum(duration_days / 365, 2.0)
+        gravity, radiation = self.destination_arrays(destination)
+        return risk_kernel(
+            duration_factor, gravity, radiation, artificial_gravity,
+            self.shielding_array(radiation_shielding), self.coefficients()
+        )
+
+# Singleton instance
+batch_risk_engine = BatchRiskEngine(mission_simulator)
@@ -0,0 +1,233 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from app.config import settings
+from app.services.metrics import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+def canonicalize(value: Any) -> Any:
+    """Convert `value` into plain JSON types with a deterministic layout"""
+    if isinstance(value, dict):
+        return {str(k): canonicalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(canonicalize(v) for v in value)
+    if hasattr(value, 'item') and callable(value.item):  # NumPy scalars
+        return value.item()
+    if hasattr(value, 'model_dump') and callable(value.model_dump):  # pydantic models
+        return canonicalize(value.model_dump())
+    return value
+
+def stable_hash(value: Any) -> str:
+    """Content hash that is identical across processes and restarts (unlike hash())"""
+    encoded = json.dumps(canonicalize(value), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class ResultCache:
+    """Two-tier result cache: in-process LRU, then Redis.
+
+    Keys are `{namespace}:{generation}:{stable_hash(params)}`. Invalidating a
+    namespace bumps its generation counter in Redis, so every worker stops
+    reading the old entries within GENERATION_REFRESH_SECONDS and they age out
+    by TTL. Redis failures never fail the request; the cache degrades to the
+    local tier and retries Redis after a back-off. Cached values are shared and
+    must be treated as read-only.
+    """
+
+    GENERATION_REFRESH_SECONDS = 1.0
+    REDIS_RETRY_SECONDS = 30.0
+
+    def __init__(self, redis_client=None, redis_url: Optional[str] = None,
+                 max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.ttl = ttl or settings.CACHE_TTL_SECONDS
+        self.local = LRUCache(max_entries or settings.CACHE_MAX_ENTRIES, self.ttl)
+        self.redis_url = settings.REDIS_URL if redis_url is None else redis_url
+        self._redis = redis_client
+        self._redis_down_until = 0.0
+        self._generations: Dict[str, Tuple[float, int]] = {}
+        self.counters = {
+            'local_hits': 0, 'local_misses': 0,
+            'redis_hits': 0, 'redis_misses': 0, 'redis_errors': 0
+        }
+
+    @property
+    def redis(self):
+        """Lazily connected Redis client, or None while Redis is unavailable"""
+        if self._redis_down_until > time.monotonic():
+            return None
+        if self._redis is None and self.redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(self.redis_url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        return self._redis
+
+    def _redis_call(self, method: str, *args, **kwargs):
+        client = self.redis
+        if client is None:
+            return None
+        try:
+            return getattr(client, method)(*args, **kwargs)
+        except Exception as e:
+            self.counters['redis_errors'] += 1
+            self._redis_down_until = time.monotonic() + self.REDIS_RETRY_SECONDS
+            logger.warning(f"Redis cache unavailable, using local tier only: {e}")
+            return None
+
+    def _generation(self, namespace: str) -> int:
+        now = time.monotonic()
+        checked_at, generation = self._generations.get(namespace, (0.0, 0))
+        if now - checked_at >= self.GENERATION_REFRESH_SECONDS:
+            remote = self._redis_call('get', f"cache:generation:{namespace}")
+            if remote is not None:
+                generation = int(remote)
+            self._generations[namespace] = (now, generation)
+        return generation
+
+    def make_key(self, namespace: str, params: Any) -> str:
+        return f"{namespace}:{self._generation(namespace)}:{stable_hash(params)}"
+
+    def get(self, namespace: str, params: Any) -> Any:
+        """Return the cached value or the module-level _MISSING sentinel"""
+        key = self.make_key(namespace, params)
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self.counters['local_hits'] += 1
+            return value
+        self.counters['local_misses'] += 1
+
+        raw = self._redis_call('get', f"cache:{key}")
+        if raw is None:
+            self.counters['redis_misses'] += 1
+            return _MISSING
+        self.counters['redis_hits'] += 1
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    def set(self, namespace: str, params: Any, value: Any, ttl: Optional[float] = None):
+        key = self.make_key(namespace, params)
+        self.local.set(key, value, ttl)
+        try:
+            encoded = json.dumps(value, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Value for {namespace} is not JSON serializable, caching locally only: {e}")
+            return
+        self._redis_call('set', f"cache:{key}", encoded, ex=int(ttl or self.ttl))
+
+    def invalidate(self, namespace: str):
+        """Drop every entry in `namespace` across all workers"""
+        generation = self._generations.get(namespace, (0.0, 0))[1]
+        remote = self._redis_call('incr', f"cache:generation:{namespace}")
+        generation = int(remote) if remote is not None else generation + 1
+        self._generations[namespace] = (time.monotonic(), generation)
+        logger.info(f"Invalidated cache namespace '{namespace}' (generation {generation})")
+
+    def cached(self, namespace: str, ttl: Optional[float] = None,
+               should_cache: Callable[[Any], bool] = lambda result: result is not None):
+        """Decorate a function or method; `self` is excluded from the key"""
+        def decorator(func):
+            parameters = list(inspect.signature(func).parameters)
+            is_method = bool(parameters) and parameters[0] == 'self'
+
+            def key_for(args, kwargs):
+                if is_method:
+                    args = args[1:]
+                return [func.__module__, func.__qualname__, list(args), kwargs]
+
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    params = key_for(args, kwargs)
+                    value = self.get(namespace, params)
+                    if value is not _MISSING:
+                        return value
+                    value = await func(*args, **kwargs)
+                    if should_cache(value):
+                        self.set(namespace, params, value, ttl)
+                    return value
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                params = key_for(args, kwargs)
+                value = self.get(namespace, params)
+                if value is not _MISSING:
+                    return value
+                value = func(*args, **kwargs)
+                if should_cache(value):
+                    self.set(namespace, params, value, ttl)
+                return value
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        counters = dict(self.counters)
+        lookups = counters['local_hits'] + counters['local_misses']
+        hits = counters['local_hits'] + counters['redis_hits']
+        counters['hit_rate'] = hits / lookups if lookups else 0.0
+        counters['local_entries'] = len(self.local)
+        return counters
+
+    def clear_local(self):
+        self.local.clear()
+        self._generations.clear()
+
+# Singleton instance
+result_cache = ResultCache()
+
+metrics.counter(
+    "biosynapse_cache_lookups_total", "Result cache lookups by tier and outcome", ('tier', 'result'),
+    collect=lambda: {
+        tuple(name.split('_')): value
+        for name, value in result_cache.counters.items() if name != 'redis_errors'
+    }
+)
+metrics.gauge(
+    "biosynapse_cache_hit_ratio", "Result cache hits (local or Redis) per lookup since start",
+    collect=lambda: {(): result_cache.stats()['hit_rate']}
+)
@@ -0,0 +1,148 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import re
+from app.config import settings
+from app.services.metrics import EXTRACTION_SECONDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Canonical concept -> synonyms. Canonical names match the original keyword list.
+DEFAULT_VOCABULARY = {
+    "microgravity": ["weightlessness", "zero gravity", "reduced gravity", "spaceflight"],
+    "radiation": ["space radiation", "cosmic radiation", "ionizing radiation", "galactic cosmic rays",
+                  "solar particle events"],
+    "bone loss": ["bone density loss", "bone demineralization", "osteopenia", "osteoporosis"],
+    "muscle atrophy": ["muscle wasting", "muscle loss", "sarcopenia"],
+    "cardiovascular": ["cardiac", "cardiovascular deconditioning", "orthostatic intolerance"],
+    "immune system": ["immune", "immunity", "immune function", "immune dysregulation"],
+    "cognitive": ["cognition", "cognitive performance", "neurocognitive"],
+    "sleep": ["sleep deprivation", "circadian", "insomnia"],
+    "nutrition": ["diet", "dietary", "nutritional"],
+    "exercise": ["physical activity", "resistive exercise", "countermeasure exercise"],
+    "mars": ["martian"],
+    "moon": ["lunar"],
+    "iss": ["international space station"]
+}
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def load_vocabulary(path: str) -> Dict[str, List[str]]:
+    """Load `{concept: [synonyms]}` from JSON, or TSV lines of `concept<TAB>syn1|syn2`"""
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    vocabulary: Dict[str, List[str]] = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            concept, _, synonyms = line.rstrip('\n').partition('\t')
+            vocabulary.setdefault(concept.strip(), []).extend(s.strip() for s in synonyms.split('|') if s.strip())
+    return vocabulary
+
+class ConceptExtractor:
+    """Aho-Corasick automaton over word tokens.
+
+    Terms and synonyms are tokenized the same way as the text, so matches
+    always fall on word boundaries ("iss" never matches inside "mission").
+    The automaton is built once; matching is linear in the number of tokens
+    and independent of vocabulary size. Tokens that appear in no term reset
+    the automaton directly to the root.
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]):
+        self.concepts: List[str] = []
+        self.token_ids: Dict[str, int] = {}
+        self.goto: List[Dict[int, int]] = [{}]
+        self.fail: List[int] = [0]
+        # (concept id, term length in tokens) for every term ending at a node
+        self.outputs: List[Tuple[Tuple[int, int], ...]] = [()]
+
+        pending: List[List[Tuple[int, int]]] = [[]]
+        for concept, synonyms in vocabulary.items():
+            concept_id = len(self.concepts)
+            self.concepts.append(concept)
+            for term in {concept, *synonyms}:
+                tokens = tokenize(term)
+                if not tokens:
+                    continue
+                node = 0
+                for token in tokens:
+                    token_id = self.token_ids.setdefault(token, len(self.token_ids))
+                    child = self.goto[node].get(token_id)
+                    if child is None:
+                        child = len(self.goto)
+                        self.goto[node][token_id] = child
+                        self.goto.append({})
+                        self.fail.append(0)
+                        pending.append([])
+                    node = child
+                pending[node].append((concept_id, len(tokens)))
+        self._link(pending)
+        logger.info(f"Concept automaton built: {len(self.concepts)} concepts, {len(self.goto)} states")
+
+    def _link(self, pending: List[List[Tuple[int, int]]]):
+        """Compute failure links breadth-first and fold outputs along them"""
+        self.outputs = [()] * len(self.goto)
+        queue = deque()
+        for child in self.goto[0].values():
+            queue.append(child)
+            self.outputs[child] = tuple(pending[child])
+        while queue:
+            node = queue.popleft()
+            for token_id, child in self.goto[node].items():
+                state = self.fail[node]
+                while state and token_id not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(token_id, 0)
+                self.outputs[child] = tuple(pending[child]) + self.outputs[self.fail[child]]
+                queue.append(child)
+
+    @classmethod
+    def from_path(cls, path: Optional[str] = None) -> "ConceptExtractor":
+        path = settings.CONCEPT_VOCABULARY_PATH if path is None else path
+        return cls(load_vocabulary(path) if path else DEFAULT_VOCABULARY)
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Occurrences per concept, in order of first appearance.
+
+        Overlapping matches of the same concept (a synonym inside a longer
+        synonym) count once.
+        """
+        token_ids = self.token_ids
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        counts: Dict[int, int] = {}
+        last_end: Dict[int, int] = {}
+        state = 0
+        for position, token in enumerate(TOKEN_PATTERN.findall(text.lower())):
+            token_id = token_ids.get(token)
+            if token_id is None:
+                state = 0
+                continue
+            while state and token_id not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token_id, 0)
+            for concept_id, length in outputs[state]:
+                if position - length < last_end.get(concept_id, -1):
+                    continue
+                last_end[concept_id] = position
+                counts[concept_id] = counts.get(concept_id, 0) + 1
+        return {self.concepts[concept_id]: n for concept_id, n in counts.items()}
+
+    def extract(self, text: str, limit: Optional[int] = 5) -> List[str]:
+        """Concepts ranked by frequency, ties broken by first appearance"""
+        counts = self.count(text)
+        ranked = sorted(counts, key=counts.get, reverse=True)  # stable: keeps first-appearance order
+        return ranked[:limit] if limit else ranked
+
+    @EXTRACTION_SECONDS.time()
+    def extract_batch(self, texts: Iterable[str], limit: Optional[int] = 5) -> List[List[str]]:
+        return [self.extract(text, limit) for text in texts]
+
+# Singleton instance, built once at startup
+concept_extractor = ConceptExtractor.from_path()
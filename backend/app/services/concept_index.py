@@ -0,0 +1,272 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import os
+import sys
+import tempfile
+import threading
+import numpy as np
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_PUB_BITS = 32
+_PUB_MASK = (1 << _PUB_BITS) - 1
+
+def _intern(names: List[str], ids: Dict[str, int], name: str) -> int:
+    index = ids.get(name)
+    if index is None:
+        index = ids[name] = len(names)
+        names.append(name)
+    return index
+
+def _csr_indptr(rows: np.ndarray, n_rows: int) -> np.ndarray:
+    """Row pointer for COO rows that are already sorted"""
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr
+
+def _file_version(path: str) -> Tuple[int, int, int]:
+    """Identity of a saved index file; save() replaces the file, so a rewrite changes the inode"""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+def _save_npz(path: str, **arrays: np.ndarray):
+    """Write an uncompressed npz atomically through a temp file unique to this call.
+
+    The worker can save the same index from concurrent jobs, so a fixed temp
+    name would let one save overwrite or move away another's file.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        # mkstemp creates the file owner-only; the API may read it as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def co_occurrence(concepts: np.ndarray, publications: np.ndarray, n_concepts: int,
+                  top_k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Top-k co-occurring concepts per concept, as CSR (indptr, indices, counts).
+
+    Pairs are generated per publication from the publication-sorted edge
+    list, so the work is sum(concepts_per_publication ** 2) rather than
+    concepts ** 2.
+    """
+    order = np.argsort(publications, kind='stable')
+    by_pub_concept, by_pub = concepts[order], publications[order]
+    starts = np.flatnonzero(np.r_[True, by_pub[1:] != by_pub[:-1]]) if len(by_pub) else np.empty(0, np.int64)
+    sizes = np.diff(np.r_[starts, len(by_pub)])
+    group_start = np.repeat(starts, sizes)
+    group_size = np.repeat(sizes, sizes)
+
+    left = np.repeat(by_pub_concept, group_size)
+    first = np.repeat(np.cumsum(group_size) - group_size, group_size)
+    right = by_pub_concept[np.repeat(group_start, group_size) + np.arange(len(left)) - first]
+    keep = left != right
+    pairs, counts = np.unique(left[keep].astype(np.int64) * n_concepts + right[keep], return_counts=True)
+    left, right = pairs // n_concepts, pairs % n_concepts
+
+    order = np.lexsort((right, -counts, left))
+    left, right, counts = left[order], right[order], counts[order]
+    indptr = _csr_indptr(left, n_concepts)
+    rank = np.arange(len(left)) - indptr[left]
+    top = rank < top_k
+    return _csr_indptr(left[top], n_concepts), right[top].astype(np.int32), counts[top].astype(np.int32)
+
+class IndexArrays(NamedTuple):
+    keys: np.ndarray  # sorted unique (concept << 32 | publication)
+    indptr: np.ndarray
+    indices: np.ndarray
+    related_indptr: np.ndarray
+    related_indices: np.ndarray
+    related_counts: np.ndarray
+
+EMPTY_ARRAYS = IndexArrays(
+    np.empty(0, np.int64), np.zeros(1, np.int64), np.empty(0, np.int32),
+    np.zeros(1, np.int64), np.empty(0, np.int32), np.empty(0, np.int32)
+)
+
+class ConceptIndex:
+    """In-memory concept -> publication adjacency in CSR form.
+
+    Edges are kept as one sorted array of packed (concept, publication)
+    keys. New edges from ingest are buffered and merged on the next read,
+    so writers never block on a rebuild; as in the graph, a publication
+    added again replaces its old edges. Study counts are row lengths and
+    co-occurring concepts are precomputed at merge time. Readers work from
+    one IndexArrays snapshot, which a merge swaps in a single assignment.
+    The worker saves the index after ingest; the API picks the new file up
+    with reload_if_changed.
+    """
+
+    def __init__(self, top_k: Optional[int] = None):
+        self.top_k = top_k or settings.CONCEPT_INDEX_TOP_K
+        self.ready = False
+        self.file_version: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.concepts: List[str] = []
+        self.concept_ids: Dict[str, int] = {}
+        self.publications: List[str] = []
+        self.publication_ids: Dict[str, int] = {}
+        self.arrays = EMPTY_ARRAYS
+        # (publication rows whose old edges are dropped, new keys), in arrival order
+        self._pending: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.dirty = False
+
+    def add_edges(self, concepts_by_pub: Dict[str, List[str]]):
+        """Buffer each publication's DISCUSSES edges, replacing the edges it had before.
+
+        Ignored until the index is built or loaded: nothing reads an index
+        that is not ready, so buffering would only grow without bound.
+        """
+        if self.ready:
+            self._buffer(concepts_by_pub, replace=True)
+
+    def _buffer(self, concepts_by_pub: Dict[str, List[str]], replace: bool = False):
+        with self._lock:
+            rows = {pub_id: _intern(self.publications, self.publication_ids, pub_id) for pub_id in concepts_by_pub}
+            keys = [
+                (_intern(self.concepts, self.concept_ids, concept) << _PUB_BITS) | rows[pub_id]
+                for pub_id, concepts in concepts_by_pub.items() for concept in concepts
+            ]
+            replaced = list(rows.values()) if replace else []
+            if keys or replaced:
+                self._pending.append((np.array(replaced, dtype=np.int64), np.array(keys, dtype=np.int64)))
+                self.dirty = True
+
+    def build(self, edges: Iterable[Tuple[str, str]], batch_size: int = 10000) -> "ConceptIndex":
+        """Replace the index with (publication id, concept name) edges"""
+        with self._lock:
+            self._reset()
+        batch: Dict[str, List[str]] = {}
+        for n, (pub_id, concept) in enumerate(edges, 1):
+            batch.setdefault(pub_id, []).append(concept)
+            if n % batch_size == 0:
+                self._buffer(batch)
+                batch = {}
+        self._buffer(batch)
+        self._merge()
+        self.ready = True
+        logger.info(f"Concept index built: {self.memory_report()}")
+        return self
+
+    def _merge(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            # Keep a replaced publication's keys only from the last batch that replaced it
+            last = np.full(len(self.publications), -1, dtype=np.int64)
+            for batch, (replaced, _) in enumerate(pending):
+                last[replaced] = batch
+            keys = self.arrays.keys
+            keys = keys[last[keys & _PUB_MASK] < 0]
+            new_keys = np.concatenate([batch_keys for _, batch_keys in pending])
+            batches = np.repeat(np.arange(len(pending)), [len(batch_keys) for _, batch_keys in pending])
+            new_keys = new_keys[last[new_keys & _PUB_MASK] <= batches]
+            keys = np.union1d(keys, new_keys)
+            n_concepts = len(self.concepts)
+            concepts = (keys >> _PUB_BITS).astype(np.int32)
+            publications = (keys & _PUB_MASK).astype(np.int32)
+            self.arrays = IndexArrays(
+                keys, _csr_indptr(concepts, n_concepts), publications,
+                *co_occurrence(concepts, publications, n_concepts, self.top_k)
+            )
+
+    def _snapshot(self, concept: str) -> Tuple[IndexArrays, Optional[int]]:
+        if self._pending:
+            self._merge()
+        arrays = self.arrays
+        row = self.concept_ids.get(concept)
+        return arrays, row if row is not None and row < len(arrays.indptr) - 1 else None
+
+    def study_count(self, concept: str) -> int:
+        arrays, row = self._snapshot(concept)
+        return 0 if row is None else int(arrays.indptr[row + 1] - arrays.indptr[row])
+
+    def studies(self, concept: str, limit: Optional[int] = None) -> List[str]:
+        arrays, row = self._snapshot(concept)
+        if row is None:
+            return []
+        ids = arrays.indices[arrays.indptr[row]:arrays.indptr[row + 1]][:limit]
+        return [self.publications[i] for i in ids]
+
+    def related(self, concept: str, limit: Optional[int] = None) -> List[Dict]:
+        """Most frequently co-discussed concepts, strongest first"""
+        arrays, row = self._snapshot(concept)
+        if row is None:
+            return []
+        start, end = arrays.related_indptr[row], arrays.related_indptr[row + 1]
+        return [
+            {'concept': self.concepts[i], 'co_occurrences': int(n)}
+            for i, n in zip(arrays.related_indices[start:end][:limit], arrays.related_counts[start:end][:limit])
+        ]
+
+    def memory_report(self) -> Dict:
+        array_bytes = {name: int(array.nbytes) for name, array in self.arrays._asdict().items()}
+        name_bytes = sum(sys.getsizeof(name) for name in self.concepts + self.publications)
+        lookup_bytes = sys.getsizeof(self.concept_ids) + sys.getsizeof(self.publication_ids)
+        return {
+            'concepts': len(self.concepts),
+            'publications': len(self.publications),
+            'edges': int(len(self.arrays.keys)),
+            'pending_batches': len(self._pending),
+            'array_bytes': array_bytes,
+            'name_bytes': name_bytes + lookup_bytes,
+            'total_bytes': sum(array_bytes.values()) + name_bytes + lookup_bytes
+        }
+
+    def save(self, path: Optional[str] = None):
+        """Write the merged index atomically as an uncompressed npz"""
+        path = path or settings.CONCEPT_INDEX_PATH
+        self._merge()
+        _save_npz(
+            path,
+            concepts=np.array(self.concepts, dtype=str), publications=np.array(self.publications, dtype=str),
+            top_k=np.array(self.top_k), **self.arrays._asdict()
+        )
+        self.dirty = False
+        self.file_version = _file_version(path)
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """Load a saved index; returns False if there is none at `path`"""
+        path = path or settings.CONCEPT_INDEX_PATH
+        if not os.path.exists(path):
+            return False
+        version = _file_version(path)
+        with np.load(path, allow_pickle=False) as saved:
+            concepts = saved['concepts'].tolist()
+            publications = saved['publications'].tolist()
+            arrays = IndexArrays(*(saved[field] for field in IndexArrays._fields))
+            top_k = int(saved['top_k'])
+        concept_ids = {name: i for i, name in enumerate(concepts)}
+        publication_ids = {name: i for i, name in enumerate(publications)}
+        # Names before arrays: a reader racing a reload of a grown file still finds every id it looks up
+        with self._lock:
+            self.concepts, self.concept_ids = concepts, concept_ids
+            self.publications, self.publication_ids = publications, publication_ids
+            self.arrays, self.top_k = arrays, top_k
+            self._pending = []
+            self.dirty = False
+            self.file_version = version
+        self.ready = True
+        logger.info(f"Concept index loaded from {path}: {len(self.concepts)} concepts, {len(self.arrays.keys)} edges")
+        return True
+
+    def reload_if_changed(self, path: Optional[str] = None) -> bool:
+        """Load the saved index again if the file changed since this process last loaded or saved it"""
+        path = path or settings.CONCEPT_INDEX_PATH
+        if not os.path.exists(path) or _file_version(path) == self.file_version:
+            return False
+        return self.load(path)
+
+# Singleton instance
+concept_index = ConceptIndex()
@@ -0,0 +1,262 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import time
+import numpy as np
+from app.config import settings
+from app.services.knowledge_graph import PUBLICATION_FIELDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+FINGERPRINT_BYTES = 16
+LIST_SEPARATOR = '\x1f'
+LIST_FIELDS = ('authors',)
+
+def fingerprint(pub: Dict) -> bytes:
+    """Content hash of every stored field; decides whether a re-export is a change"""
+    payload = json.dumps([pub.get(field) for field in PUBLICATION_FIELDS], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=FINGERPRINT_BYTES).digest()
+
+def encode_value(field: str, value) -> bytes:
+    if value is None:
+        return b''
+    if field in LIST_FIELDS:
+        value = LIST_SEPARATOR.join(str(item) for item in value)
+    return str(value).encode('utf-8')
+
+def decode_value(field: str, raw: bytes):
+    if not raw:
+        return [] if field in LIST_FIELDS else None
+    text = raw.decode('utf-8')
+    return text.split(LIST_SEPARATOR) if field in LIST_FIELDS else text
+
+def _map(path: str, dtype, count: int, mode: str = 'r') -> np.ndarray:
+    """Memory-map the first `count` items of a file (empty files cannot be mapped)"""
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, shape=(count,))
+
+class StringColumn:
+    """Variable-length utf-8 values as one data file plus an int64 offsets file"""
+
+    def __init__(self, field: str, data: np.ndarray, offsets: np.ndarray):
+        self.field = field
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return max(len(self.offsets) - 1, 0)
+
+    def raw(self, row: int) -> memoryview:
+        """Zero-copy view of one value's bytes in the mapped file"""
+        return memoryview(self.data[self.offsets[row]:self.offsets[row + 1]])
+
+    def __getitem__(self, row: int):
+        return decode_value(self.field, bytes(self.raw(row)))
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.offsets[-1]) if len(self.offsets) else 0
+
+class CorpusSnapshot:
+    """Append-only columnar snapshot of Publication nodes on local disk.
+
+    Each field is a `<field>.data` / `<field>.offsets` pair, with a live
+    mask and per-row content fingerprints alongside. A changed publication
+    is appended as a new row and its old row is marked dead, so existing
+    bytes are never rewritten. manifest.json holds the committed row count
+    and is replaced last, so a crashed append leaves only ignored trailing
+    bytes that the next append truncates.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.CORPUS_SNAPSHOT_DIR
+        self.rows = 0
+        self.columns: Dict[str, StringColumn] = {}
+        self.live = np.empty(0, dtype=np.uint8)
+        self.fingerprints = np.empty((0, FINGERPRINT_BYTES), dtype=np.uint8)
+        self._keys: Optional[Dict[Tuple[str, str], int]] = None
+        self.open()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self._file('manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {'format': FORMAT_VERSION, 'rows': 0}
+        if manifest.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus snapshot format {manifest.get('format')}")
+        return manifest
+
+    def open(self) -> "CorpusSnapshot":
+        """(Re)map the committed rows read-only"""
+        self.rows = self._read_manifest()['rows']
+        self.columns = {}
+        for field in PUBLICATION_FIELDS:
+            offsets = _map(self._file(f"{field}.offsets"), np.int64, self.rows + 1 if self.rows else 0)
+            data = _map(self._file(f"{field}.data"), np.uint8, int(offsets[-1]) if self.rows else 0)
+            self.columns[field] = StringColumn(field, data, offsets)
+        self.live = _map(self._file('live.mask'), np.uint8, self.rows)
+        self.fingerprints = _map(
+            self._file('fingerprints.bin'), np.uint8, self.rows * FINGERPRINT_BYTES
+        ).reshape(self.rows, FINGERPRINT_BYTES)
+        self._keys = None
+        return self
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.live))
+
+    def _key_index(self) -> Dict[Tuple[str, str], int]:
+        """(source, id) -> live row; also retires stale duplicates left by a crash"""
+        if self._keys is None:
+            keys: Dict[Tuple[str, str], int] = {}
+            stale = []
+            ids, sources = self.columns['id'], self.columns['source']
+            for row in np.flatnonzero(self.live):
+                key = (sources[row] or '', ids[row])
+                if key in keys:
+                    stale.append(keys[key])
+                keys[key] = int(row)
+            if stale:
+                self._retire(stale)
+            self._keys = keys
+        return self._keys
+
+    def _retire(self, rows: List[int]):
+        live = _map(self._file('live.mask'), np.uint8, self.rows, mode='r+')
+        live[rows] = 0
+        live.flush()
+
+    def _truncate_uncommitted(self):
+        expected = {'live.mask': self.rows, 'fingerprints.bin': self.rows * FINGERPRINT_BYTES}
+        for field, column in self.columns.items():
+            expected[f"{field}.offsets"] = (self.rows + 1) * 8 if self.rows else 0
+            expected[f"{field}.data"] = column.nbytes
+        for name, size in expected.items():
+            path = self._file(name)
+            if not os.path.exists(path):
+                open(path, 'wb').close()
+            elif os.path.getsize(path) != size:
+                os.truncate(path, size)
+
+    def append(self, publications: Iterable[Dict]) -> Dict[str, int]:
+        """Append new and changed publications; unchanged ones are skipped"""
+        os.makedirs(self.path, exist_ok=True)
+        keys = self._key_index()
+        self._truncate_uncommitted()
+        added: Dict[Tuple[str, str], int] = {}
+        new_rows: List[Dict] = []
+        new_fingerprints: List[bytes] = []
+        new_live: List[int] = []
+        retired: List[int] = []
+        counts = {'appended': 0, 'updated': 0, 'unchanged': 0}
+
+        for pub in publications:
+            key = (pub.get('source') or '', str(pub.get('id')))
+            digest = fingerprint(pub)
+            row = added.get(key, keys.get(key))
+            if row is not None:
+                previous = (bytes(self.fingerprints[row]) if row < self.rows
+                            else new_fingerprints[row - self.rows])
+                if previous == digest:
+                    counts['unchanged'] += 1
+                    continue
+                if row < self.rows:
+                    retired.append(row)
+                else:
+                    new_live[row - self.rows] = 0
+                counts['updated'] += 1
+            else:
+                counts['appended'] += 1
+            added[key] = self.rows + len(new_rows)
+            new_rows.append(pub)
+            new_fingerprints.append(digest)
+            new_live.append(1)
+
+        if new_rows:
+            self._write_rows(new_rows, new_fingerprints, new_live)
+            live_rows = len(self) + sum(new_live) - len(retired)
+            self._write_manifest(self.rows + len(new_rows), live_rows)
+            self.rows += len(new_rows)
+            if retired:
+                self._retire(retired)
+            self.open()
+            keys.update(added)
+            self._keys = keys
+        return counts
+
+    def _write_rows(self, rows: List[Dict], fingerprints: List[bytes], live: List[int]):
+        for field, column in self.columns.items():
+            values = [encode_value(field, pub.get(field)) for pub in rows]
+            lengths = np.fromiter((len(value) for value in values), dtype=np.int64, count=len(values))
+            offsets = column.nbytes + np.cumsum(lengths)
+            with open(self._file(f"{field}.data"), 'ab') as f:
+                f.write(b''.join(values))
+            with open(self._file(f"{field}.offsets"), 'ab') as f:
+                if self.rows == 0:
+                    f.write(np.zeros(1, dtype=np.int64).tobytes())
+                f.write(offsets.tobytes())
+        with open(self._file('fingerprints.bin'), 'ab') as f:
+            f.write(b''.join(fingerprints))
+        with open(self._file('live.mask'), 'ab') as f:
+            f.write(bytes(live))
+
+    def _write_manifest(self, rows: int, live_rows: int):
+        manifest = {
+            'format': FORMAT_VERSION,
+            'rows': rows,
+            'live_rows': live_rows,
+            'columns': list(PUBLICATION_FIELDS),
+            'updated_at': time.time()
+        }
+        tmp_path = self._file('manifest.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._file('manifest.json'))
+
+    def iter_batches(self, fields: Sequence[str] = PUBLICATION_FIELDS,
+                     batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """Stream live rows from the mapped files in batches of dicts"""
+        live_rows = np.flatnonzero(self.live)
+        for start in range(0, len(live_rows), batch_size):
+            yield [
+                {field: self.columns[field][row] for field in fields}
+                for row in live_rows[start:start + batch_size]
+            ]
+
+    def reextract(self, extractor, batch_size: int = 1000, limit: Optional[int] = 5,
+                  fields: Sequence[str] = ('id', 'title', 'abstract', 'source')
+                  ) -> Iterator[Tuple[List[Dict], Dict[Tuple[str, str], List[str]]]]:
+        """Re-run concept extraction over title + abstract; yields (publications, {(source, id): concepts}).
+
+        Keys match the snapshot's own (source, id) row keys; `fields` gains
+        'source' if it lacks it.
+        """
+        fields = tuple(fields) + (() if 'source' in fields else ('source',))
+        for batch in self.iter_batches(fields, batch_size):
+            texts = (f"{pub['title'] or ''} {pub['abstract'] or ''}" for pub in batch)
+            keys = ((pub['source'] or '', pub['id']) for pub in batch)
+            yield batch, dict(zip(keys, extractor.extract_batch(texts, limit)))
+
+    def export_from(self, kg, page_size: Optional[int] = None) -> Dict[str, int]:
+        """Page Publication nodes out of the graph and append what changed"""
+        totals = {'appended': 0, 'updated': 0, 'unchanged': 0}
+        for page in kg.iter_publication_pages(page_size):
+            for name, count in self.append(page).items():
+                totals[name] += count
+        logger.info(f"Corpus snapshot export to {self.path}: {totals}")
+        return totals
+
+    def stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'rows': self.rows,
+            'live_rows': len(self),
+            'column_bytes': {field: column.nbytes for field, column in self.columns.items()}
+        }
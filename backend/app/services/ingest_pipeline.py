@@ -0,0 +1,280 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+import time
+import uuid
+from app.config import settings
+from app.services.cache import result_cache, stable_hash
+from app.services.metrics import INGEST_ROWS, INGEST_ROWS_PER_SECOND
+import logging
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+# Record kind -> (graph label, name of the kg batch upsert method)
+RECORD_KINDS = {
+    'publications': ('Publication', 'upsert_publications_batch'),
+    'datasets': ('Dataset', 'upsert_datasets_batch')
+}
+
+class StageMetrics:
+    """Throughput and input-queue depth for one pipeline stage"""
+
+    def __init__(self, name: str, queue: Optional[asyncio.Queue] = None):
+        self.name = name
+        self.queue = queue
+        self.items = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+
+    def finish(self):
+        self.finished_at = time.monotonic()
+
+    def observe_queue(self):
+        if self.queue is not None:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            'items': self.items,
+            'batches': self.batches,
+            'elapsed_seconds': elapsed,
+            'items_per_second': self.items / elapsed if elapsed else 0.0,
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'max_queue_depth': self.max_queue_depth
+        }
+
+class IngestJob:
+    def __init__(self, source: str, params: Dict):
+        self.id = uuid.uuid4().hex
+        self.source = source
+        self.params = params
+        self.status = 'pending'
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.stages: Dict[str, StageMetrics] = {}
+        self.changes = {'new': 0, 'updated': 0, 'skipped': 0}
+        self.watermark: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def watermark_scope(self) -> str:
+        """High-water marks are kept per source and query; full_refresh does not change the scope"""
+        params = {k: v for k, v in self.params.items() if k not in ('full_refresh', 'max_results')}
+        return f"{self.source}:{stable_hash(params)[:16]}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'source': self.source,
+            'params': self.params,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'changes': dict(self.changes),
+            'watermark': self.watermark,
+            'stages': {name: stage.snapshot() for name, stage in self.stages.items()}
+        }
+
+class WatermarkStore:
+    """Per-source ingest high-water marks (latest publication_date of a fully read listing) in Redis.
+
+    Losing a mark is harmless: the next run re-reads everything and the
+    content hashes still keep unchanged records out of the database.
+    """
+
+    def __init__(self, redis_client=None, redis_url: Optional[str] = None, prefix: str = "ingest:watermark"):
+        self.redis_url = settings.REDIS_URL if redis_url is None else redis_url
+        self.prefix = prefix
+        self._redis = redis_client
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            import redis
+            self._redis = redis.Redis.from_url(self.redis_url)
+        return self._redis
+
+    def get(self, scope: str) -> Optional[str]:
+        value = self.redis.get(f"{self.prefix}:{scope}")
+        return value.decode() if value is not None else None
+
+    def advance(self, scope: str, value: Optional[str]):
+        current = self.get(scope)
+        if value and (current is None or value > current):
+            self.redis.set(f"{self.prefix}:{scope}", value)
+
+class IngestPipeline:
+    """Three-stage streaming ingest: fetch -> extract concepts -> write batches.
+
+    Stages are connected by bounded asyncio.Queues, so a slow graph writer
+    pauses extraction, which in turn pauses the connector. Memory stays
+    proportional to the queue sizes rather than to max_results.
+    `on_batch` is called with each batch's concepts once it is written, and
+    `on_records` with the written records themselves.
+
+    Incremental: records older than the scope's high-water mark are dropped
+    at the producer, and the writer drops records whose content_hash matches
+    the stored node. Records dated on the mark itself are re-checked by
+    hash. `full_refresh` in the job params turns both off, so every fetched
+    record is rewritten (e.g. to repair graph data). The mark only
+    advances after a run that read the whole listing: a run cut short by
+    max_results has not seen the older records on the pages it never
+    fetched (pages arrive in any order), and a failed page fails the run.
+
+    `record_kind` selects the graph label and upsert method (see
+    RECORD_KINDS); every kind shares the batching and the kg's driver pool.
+    """
+
+    def __init__(self, kg, extract_concepts: Callable[[str], List[str]],
+                 queue_size: Optional[int] = None, batch_size: Optional[int] = None,
+                 on_batch: Optional[Callable[[Dict[str, List[str]]], None]] = None,
+                 on_records: Optional[Callable[[List[Dict]], None]] = None,
+                 watermarks: Optional[WatermarkStore] = None, record_kind: str = 'publications'):
+        self.kg = kg
+        self.label, upsert = RECORD_KINDS[record_kind]
+        self.upsert_batch = getattr(kg, upsert)
+        self.extract_concepts = extract_concepts
+        self.on_batch = on_batch
+        self.on_records = on_records
+        self.watermarks = watermarks
+        self.queue_size = queue_size or settings.INGEST_QUEUE_SIZE
+        self.batch_size = batch_size or settings.NEO4J_BATCH_SIZE
+
+    def start(self, job: IngestJob, records: AsyncIterator[Dict]) -> IngestJob:
+        """Run the pipeline in the background and return immediately"""
+        job.task = asyncio.create_task(self.run(job, records))
+        return job
+
+    async def run(self, job: IngestJob, records: AsyncIterator[Dict]) -> IngestJob:
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        extracted: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        job.stages = {
+            'fetch': StageMetrics('fetch'),
+            'extract': StageMetrics('extract', fetched),
+            'write': StageMetrics('write', extracted)
+        }
+        job.status = 'running'
+        since = None
+        if self.watermarks and not job.params.get('full_refresh'):
+            since = self.watermarks.get(job.watermark_scope)
+        stages = [
+            asyncio.create_task(self._produce(job, records, fetched, since)),
+            asyncio.create_task(self._extract(fetched, extracted, job.stages['extract'])),
+            asyncio.create_task(self._write(job, extracted))
+        ]
+        try:
+            await asyncio.gather(*stages)
+            if self.watermarks and self._read_whole_listing(job):
+                self.watermarks.advance(job.watermark_scope, job.watermark)
+            job.status = 'completed'
+        except Exception as e:
+            for stage in stages:
+                stage.cancel()
+            job.status = 'failed'
+            job.error = str(e)
+            logger.error(f"Ingest job {job.id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            result_cache.invalidate("graph")
+            self._record_metrics(job)
+        logger.info(f"Ingest job {job.id} {job.status}: {job.to_dict()['stages']}")
+        return job
+
+    @staticmethod
+    def _read_whole_listing(job: IngestJob) -> bool:
+        """True if the source ran out of records before max_results, so none were left unread"""
+        max_results = job.params.get('max_results')
+        return max_results is None or job.stages['fetch'].items < max_results
+
+    @staticmethod
+    def _record_metrics(job: IngestJob):
+        for outcome, count in job.changes.items():
+            INGEST_ROWS.inc(count, (job.source, outcome))
+        for name, stage in job.stages.items():
+            INGEST_ROWS_PER_SECOND.set(stage.snapshot()['items_per_second'], (job.source, name))
+
+    async def _produce(self, job: IngestJob, records: AsyncIterator[Dict], output: asyncio.Queue,
+                       since: Optional[str]):
+        metrics = job.stages['fetch']
+        metrics.start()
+        try:
+            async for record in records:
+                metrics.items += 1
+                date = record.get('publication_date')
+                if date and (job.watermark is None or date > job.watermark):
+                    job.watermark = date
+                if since and date and date < since:
+                    job.changes['skipped'] += 1
+                    continue
+                await output.put(record)
+        finally:
+            await output.put(_END)
+            metrics.finish()
+
+    async def _extract(self, source: asyncio.Queue, output: asyncio.Queue, metrics: StageMetrics):
+        metrics.start()
+        while True:
+            metrics.observe_queue()
+            pub = await source.get()
+            if pub is _END:
+                break
+            body = pub.get('abstract') or pub.get('description') or ''
+            concepts = self.extract_concepts(f"{pub.get('title') or ''} {body}")
+            await output.put((pub, concepts))
+            metrics.items += 1
+        await output.put(_END)
+        metrics.finish()
+
+    async def _write(self, job: IngestJob, source: asyncio.Queue):
+        metrics = job.stages['write']
+        metrics.start()
+        refresh = bool(job.params.get('full_refresh'))
+        batch: List[Dict] = []
+        concepts_by_pub: Dict[str, List[str]] = {}
+        while True:
+            metrics.observe_queue()
+            item = await source.get()
+            if item is not _END:
+                pub, concepts = item
+                batch.append(pub)
+                concepts_by_pub[pub['id']] = concepts
+            if batch and (item is _END or len(batch) >= self.batch_size):
+                stored = await self.kg.existing_content_hashes([pub['id'] for pub in batch], self.label)
+                changed = []
+                for pub in batch:
+                    if pub['id'] not in stored:
+                        job.changes['new'] += 1
+                    elif not refresh and pub.get('content_hash') and stored[pub['id']] == pub['content_hash']:
+                        job.changes['skipped'] += 1
+                        continue
+                    else:
+                        job.changes['updated'] += 1
+                    changed.append(pub)
+                if changed:
+                    concepts_by_pub = {pub['id']: concepts_by_pub[pub['id']] for pub in changed}
+                    await self.upsert_batch(changed, concepts_by_pub)
+                    if self.on_batch:
+                        self.on_batch(concepts_by_pub)
+                    if self.on_records:
+                        self.on_records(changed)
+                    metrics.items += len(changed)
+                    metrics.batches += 1
+                batch, concepts_by_pub = [], {}
+            if item is _END:
+                break
+        metrics.finish()
+
+# Singleton instance
+ingest_watermarks = WatermarkStore()
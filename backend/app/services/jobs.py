@@ -0,0 +1,172 @@
+from typing import Any, Dict, Optional, Tuple
+import json
+import time
+import uuid
+from app.config import settings
+from app.services.cache import canonicalize, stable_hash
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = ('ingest_pubspace', 'ingest_genelab', 'mission', 'monte_carlo')
+FINISHED = ('completed', 'failed', 'cancelled')
+# Finished jobs that a duplicate submission should not reuse
+RETRYABLE = ('failed', 'cancelled')
+# Job types whose completed result answers an identical submission; re-running an
+# ingest fetches whatever the source has now, so only a queued or running one is a duplicate
+REUSE_COMPLETED = ('mission', 'monte_carlo')
+JSON_FIELDS = ('params', 'progress', 'result')
+
+class UnknownJobType(ValueError):
+    pass
+
+class JobQueue:
+    """Redis-backed job records and FIFO queue shared by the API and workers.
+
+    Layout: `{prefix}:{id}` hash per job, `{prefix}:queue` list of pending ids,
+    and `{prefix}:dedupe:{hash}` -> id so identical submissions (same type
+    and normalized params) return the existing job while it is queued or
+    running. A completed simulation job is also returned, until its record
+    expires; a completed ingest is not (see REUSE_COMPLETED).
+
+    A claimed job holds a lease that its worker renews while the job runs.
+    If the worker dies, the lease runs out and the next read of the job
+    marks it failed, so an identical submission starts a new job instead of
+    waiting on a dead one.
+    """
+
+    def __init__(self, redis_client=None, redis_url: Optional[str] = None, prefix: str = "jobs"):
+        self.redis_url = settings.REDIS_URL if redis_url is None else redis_url
+        self.prefix = prefix
+        self._redis = redis_client
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            import redis
+            self._redis = redis.Redis.from_url(self.redis_url)
+        return self._redis
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def submit(self, job_type: str, params: Dict[str, Any]) -> Tuple[Dict, bool]:
+        """Enqueue a job; returns (job, created), where created is False for a duplicate"""
+        if job_type not in JOB_TYPES:
+            raise UnknownJobType(f"Unknown job type '{job_type}'")
+        dedupe_key = self._key("dedupe", stable_hash({'type': job_type, 'params': params}))
+        job_id = uuid.uuid4().hex
+        for _ in range(2):
+            if self.redis.set(dedupe_key, job_id, nx=True, ex=settings.JOB_RESULT_TTL):
+                break
+            existing_id = self.redis.get(dedupe_key)
+            if existing_id is None:
+                continue
+            existing = self.get(existing_id.decode())
+            if existing is not None and self._is_duplicate(job_type, existing['status']):
+                return existing, False
+            self.redis.delete(dedupe_key)
+        job = {
+            'job_id': job_id,
+            'type': job_type,
+            'params': params,
+            'status': 'pending',
+            'progress': {},
+            'result': None,
+            'error': None,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'lease_expires_at': None
+        }
+        self._save(job_id, job)
+        self.redis.lpush(self._key("queue"), job_id)
+        logger.info(f"Job {job_id} ({job_type}) queued")
+        return job, True
+
+    @staticmethod
+    def _is_duplicate(job_type: str, status: str) -> bool:
+        if status in RETRYABLE:
+            return False
+        return status != 'completed' or job_type in REUSE_COMPLETED
+
+    def _save(self, job_id: str, fields: Dict[str, Any]):
+        encoded = {
+            name: json.dumps(canonicalize(value)) if name in JSON_FIELDS or value is None else value
+            for name, value in fields.items()
+        }
+        self.redis.hset(self._key(job_id), mapping=encoded)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = self._read(job_id)
+        return self._expire_lease(job) if job is not None else None
+
+    def _read(self, job_id: str) -> Optional[Dict]:
+        raw = self.redis.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        job = {}
+        for name, value in raw.items():
+            name, value = name.decode(), value.decode()
+            if name in JSON_FIELDS or value == 'null':
+                value = json.loads(value)
+            elif name.endswith('_at'):
+                value = float(value)
+            job[name] = value
+        return job
+
+    def _expire_lease(self, job: Dict) -> Dict:
+        """Finish a running job whose worker stopped renewing its lease"""
+        if job['status'] not in ('running', 'cancelling'):
+            return job
+        if (job.get('lease_expires_at') or float('inf')) > time.time():
+            return job
+        status, error = ('cancelled', None) if job['status'] == 'cancelling' else ('failed', "Worker lease expired")
+        logger.warning(f"Job {job['job_id']} lease expired")
+        self.finish(job['job_id'], status, error=error)
+        return self._read(job['job_id'])
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a pending job immediately; a running one is stopped by its worker"""
+        job = self.get(job_id)
+        if job is None or job['status'] in FINISHED:
+            return job
+        if job['status'] == 'pending':
+            self._save(job_id, {'status': 'cancelled', 'finished_at': time.time()})
+        else:
+            self._save(job_id, {'status': 'cancelling'})
+        return self.get(job_id)
+
+    def next_job(self, timeout: float = 1.0) -> Optional[str]:
+        """Block up to `timeout` seconds for the next queued job id"""
+        item = self.redis.brpop(self._key("queue"), timeout=timeout)
+        return item[1].decode() if item else None
+
+    def claim(self, job_id: str) -> Optional[Dict]:
+        """Mark a dequeued job running, unless it was cancelled while queued"""
+        job = self.get(job_id)
+        if job is None or job['status'] != 'pending':
+            return None
+        now = time.time()
+        started = {'status': 'running', 'started_at': now, 'lease_expires_at': now + settings.JOB_LEASE_SECONDS}
+        self._save(job_id, started)
+        return {**job, **started}
+
+    def renew(self, job_id: str):
+        """Extend a running job's lease; its worker calls this until the job finishes"""
+        self._save(job_id, {'lease_expires_at': time.time() + settings.JOB_LEASE_SECONDS})
+
+    def report(self, job_id: str, progress: Dict[str, Any]):
+        self._save(job_id, {'progress': progress})
+
+    def status(self, job_id: str) -> Optional[str]:
+        status = self.redis.hget(self._key(job_id), 'status')
+        return status.decode() if status is not None else None
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        self._save(job_id, {'status': status, 'result': result, 'error': error, 'finished_at': time.time()})
+        self.redis.expire(self._key(job_id), settings.JOB_RESULT_TTL)
+        logger.info(f"Job {job_id} {status}")
+
+# Singleton instance
+job_queue = JobQueue()
@@ -1,99 +1,625 @@
-from neo4j import GraphDatabase
 from app.config import settings
+from app.services.cache import result_cache
+from app.services.metrics import GRAPH_QUERY_SECONDS, metrics
+from app.services.traversal import EXPAND_QUERY, START_NODE_QUERY, NeighborhoodTraversal, as_connected_concepts
 import logging
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+UPSERT_PUBLICATIONS_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Publication {id: row.id})
+SET p.title = row.title,
+    p.abstract = row.abstract,
+    p.authors = row.authors,
+    p.publication_date = row.publication_date,
+    p.journal = row.journal,
+    p.doi = row.doi,
+    p.source = row.source,
+    p.content_hash = row.content_hash
+"""
+
+CONTENT_HASHES_QUERY = """
+UNWIND $ids AS id
+MATCH (p:Publication {id: id})
+RETURN p.id AS id, p.content_hash AS content_hash
+"""
+
+UPSERT_DATASETS_QUERY = """
+UNWIND $rows AS row
+MERGE (d:Dataset {id: row.id})
+SET d.title = row.title,
+    d.description = row.description,
+    d.experiment_type = row.experiment_type,
+    d.publication_date = row.publication_date,
+    d.source = row.source,
+    d.content_hash = row.content_hash
+"""
+
+UPSERT_ORGANISMS_QUERY = """
+UNWIND $organisms AS organism_name
+MERGE (o:Organism {name: organism_name})
+"""
+
+UPSERT_ENVIRONMENTS_QUERY = """
+UNWIND $environments AS environment_name
+MERGE (e:Environment {name: environment_name})
+"""
+
+UPSERT_STUDIES_QUERY = """
+UNWIND $rows AS row
+WITH row WHERE row.organism IS NOT NULL
+MATCH (d:Dataset {id: row.id})
+MATCH (o:Organism {name: row.organism})
+MERGE (d)-[:STUDIES]->(o)
+"""
+
+UPSERT_CONDUCTED_IN_QUERY = """
+UNWIND $rows AS row
+WITH row WHERE row.space_mission IS NOT NULL
+MATCH (d:Dataset {id: row.id})
+MATCH (e:Environment {name: row.space_mission})
+MERGE (d)-[:CONDUCTED_IN]->(e)
+"""
+
+UPSERT_DATASET_DISCUSSES_QUERY = """
+UNWIND $rows AS row
+MATCH (d:Dataset {id: row.id})
+UNWIND row.concepts AS concept_name
+MATCH (c:Concept {name: concept_name})
+MERGE (d)-[r:DISCUSSES]->(c)
+SET r.strength = 1.0
+"""
+
+DATASET_CONTENT_HASHES_QUERY = """
+UNWIND $ids AS id
+MATCH (d:Dataset {id: id})
+RETURN d.id AS id, d.content_hash AS content_hash
+"""
+
+DATASET_LINK_QUERIES = {
+    'STUDIES': UPSERT_STUDIES_QUERY,
+    'CONDUCTED_IN': UPSERT_CONDUCTED_IN_QUERY,
+    'DISCUSSES': UPSERT_DATASET_DISCUSSES_QUERY
+}
+
+# A re-ingested dataset's links are rebuilt from its current record, so drop the old ones first
+DELETE_DATASET_LINKS_QUERY = """
+UNWIND $rows AS row
+MATCH (d:Dataset {id: row.id})-[r:STUDIES|CONDUCTED_IN|DISCUSSES]->()
+WITH r, type(r) AS rel_type
+DELETE r
+RETURN rel_type, count(*) AS deleted
+"""
+
+CONTENT_HASH_QUERIES = {'Publication': CONTENT_HASHES_QUERY, 'Dataset': DATASET_CONTENT_HASHES_QUERY}
+
+UPSERT_CONCEPTS_QUERY = """
+UNWIND $concepts AS concept_name
+MERGE (c:Concept {name: concept_name})
+"""
+
+UPSERT_DISCUSSES_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Publication {id: row.id})
+UNWIND row.concepts AS concept_name
+MATCH (c:Concept {name: concept_name})
+MERGE (p)-[r:DISCUSSES]->(c)
+SET r.strength = 1.0
+"""
+
+# Concepts a publication no longer discusses after re-extraction of its current text
+DELETE_STALE_DISCUSSES_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Publication {id: row.id})-[r:DISCUSSES]->(c:Concept)
+WHERE NOT c.name IN row.concepts
+DELETE r
+"""
+
+# Materialized per-label / per-type counts, one GraphCount node per key
+UPDATE_GRAPH_COUNTS_QUERY = """
+UNWIND $deltas AS delta
+MERGE (c:GraphCount {key: delta.key})
+ON CREATE SET c.kind = delta.kind, c.name = delta.name, c.count = 0
+SET c.count = c.count + delta.count
+"""
+
+CONCEPT_EDGES_QUERY = """
+MATCH (p:Publication)-[:DISCUSSES]->(c:Concept)
+RETURN p.id AS publication, c.name AS concept
+"""
+
+# Keyset pagination over the Publication.id uniqueness index. Later pages use a plain
+# `p.id > $after` so the planner seeks the index; an `$after IS NULL OR ...` predicate
+# cannot be planned as a range seek and rescans every earlier id on each page.
+EXPORT_PAGE_RETURN = """
+RETURN p.id AS id, p.title AS title, p.abstract AS abstract, p.authors AS authors,
+       p.publication_date AS publication_date, p.journal AS journal, p.doi AS doi, p.source AS source
+ORDER BY p.id
+LIMIT $limit
+"""
+
+EXPORT_FIRST_PUBLICATIONS_QUERY = "MATCH (p:Publication)" + EXPORT_PAGE_RETURN
+
+EXPORT_NEXT_PUBLICATIONS_QUERY = "MATCH (p:Publication) WHERE p.id > $after" + EXPORT_PAGE_RETURN
+
+READ_GRAPH_COUNTS_QUERY = "MATCH (c:GraphCount) RETURN c.kind AS kind, c.name AS name, c.count AS count"
+
+GRAPH_COUNTS_SEEDED_QUERY = "MATCH (c:GraphCount) RETURN c.key AS key LIMIT 1"
+
+STATS_LABEL = 'GraphCount'
+
+PUBLICATION_FIELDS = ('id', 'title', 'abstract', 'authors', 'publication_date', 'journal', 'doi', 'source')
+
+DATASET_FIELDS = ('id', 'title', 'description', 'experiment_type', 'publication_date', 'source', 'content_hash')
+
+# Parser placeholders that must not become shared Organism/Environment nodes
+UNKNOWN_NAMES = {None, '', 'Unknown'}
+
+def chunked(items: List[Any], size: int):
+    """Yield successive slices of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def driver_config() -> Dict[str, Any]:
+    """Connection pool settings shared by the sync and async drivers"""
+    return {
+        'auth': (settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+        'max_connection_pool_size': settings.NEO4J_MAX_POOL_SIZE,
+        'connection_acquisition_timeout': settings.NEO4J_ACQUISITION_TIMEOUT,
+        'max_connection_lifetime': settings.NEO4J_MAX_CONNECTION_LIFETIME
+    }
+
+def publication_rows(publications: List[Dict], concepts_by_pub: Dict[str, List[str]]) -> List[Dict]:
+    """Flatten publications and their concepts into UNWIND rows"""
+    rows = []
+    for pub in publications:
+        row = {field: pub.get(field) for field in PUBLICATION_FIELDS}
+        row['concepts'] = list(concepts_by_pub.get(pub.get('id'), []))
+        row['content_hash'] = pub.get('content_hash')
+        rows.append(row)
+    return rows
+
+def dataset_rows(datasets: List[Dict], concepts_by_dataset: Dict[str, List[str]]) -> List[Dict]:
+    """Flatten GeneLab datasets into UNWIND rows; unknown organisms and missions become null"""
+    rows = []
+    for dataset in datasets:
+        row = {field: dataset.get(field) for field in DATASET_FIELDS}
+        row['organism'] = None if dataset.get('organism') in UNKNOWN_NAMES else dataset['organism']
+        row['space_mission'] = None if dataset.get('space_mission') in UNKNOWN_NAMES else dataset['space_mission']
+        row['concepts'] = list(concepts_by_dataset.get(dataset.get('id'), []))
+        rows.append(row)
+    return rows
+
+def dataset_chunk_names(rows: List[Dict]) -> Dict[str, List[str]]:
+    return {
+        'organisms': sorted({row['organism'] for row in rows if row['organism']}),
+        'environments': sorted({row['space_mission'] for row in rows if row['space_mission']}),
+        'concepts': sorted({concept for row in rows for concept in row['concepts']})
+    }
+
+def count_deltas(nodes_created: Dict[str, int], relationships_created: Dict[str, int]) -> List[Dict]:
+    """GraphCount changes for the labels and types a write created (or, if negative, deleted)"""
+    deltas = [
+        {'key': f"node:{name}", 'kind': 'node', 'name': name, 'count': count}
+        for name, count in nodes_created.items() if count
+    ]
+    deltas += [
+        {'key': f"relationship:{name}", 'kind': 'relationship', 'name': name, 'count': count}
+        for name, count in relationships_created.items() if count
+    ]
+    return deltas
+
+def format_graph_stats(records: List[Dict]) -> Dict:
+    node_counts = {r['name']: r['count'] for r in records if r['kind'] == 'node'}
+    relationship_counts = {r['name']: r['count'] for r in records if r['kind'] == 'relationship'}
+    return {
+        "node_counts": node_counts,
+        "relationship_counts": relationship_counts,
+        "total_relationships": sum(relationship_counts.values())
+    }
+
+def pool_usage(driver) -> Dict[str, int]:
+    """In-use and idle connections in a driver's pool; reads driver internals, so empty if they change"""
+    connections = getattr(getattr(driver, '_pool', None), 'connections', None)
+    if not isinstance(connections, dict):
+        return {}
+    pooled = [connection for address in list(connections.values()) for connection in list(address)]
+    in_use = sum(1 for connection in pooled if getattr(connection, 'in_use', False))
+    return {'in_use': in_use, 'idle': len(pooled) - in_use}
+
+def escape_name(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
 class KnowledgeGraphService:
-    def __init__(self):
-        self.driver = GraphDatabase.driver(
-            settings.NEO4J_URI,
-            auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD)
-        )
+    def __init__(self, driver=None, batch_size: Optional[int] = None):
+        if driver is None:
+            from neo4j import GraphDatabase
+            driver = GraphDatabase.driver(settings.NEO4J_URI, **driver_config())
+        self.driver = driver
+        self.batch_size = batch_size or settings.NEO4J_BATCH_SIZE
     
     def close(self):
         self.driver.close()
     
     def init_schema(self):
-        """Initialize the knowledge graph schema"""
+        """Initialize the knowledge graph schema and seed GraphCount on a database written before it existed"""
         with self.driver.session() as session:
             # Create constraints for uniqueness
             session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (p:Publication) REQUIRE p.id IS UNIQUE")
             session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (c:Concept) REQUIRE c.name IS UNIQUE")
             session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (o:Organism) REQUIRE o.name IS UNIQUE")
             session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (e:Environment) REQUIRE e.name IS UNIQUE")
+            session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (d:Dataset) REQUIRE d.id IS UNIQUE")
+            session.run(f"CREATE CONSTRAINT IF NOT EXISTS FOR (c:{STATS_LABEL}) REQUIRE c.key IS UNIQUE")
+            seeded = session.run(GRAPH_COUNTS_SEEDED_QUERY).single() is not None
             
             logger.info("Knowledge graph schema initialized")
+        if not seeded:
+            self.reconcile_graph_stats()
+    
+    def upsert_publications_batch(self, publications: List[Dict], concepts_by_pub: Dict[str, List[str]],
+                                  batch_size: Optional[int] = None) -> int:
+        """Upsert publications, concepts and DISCUSSES edges in chunked UNWIND transactions.
+
+        Each publication ends up discussing exactly its `concepts_by_pub` entry
+        (none if absent): edges to concepts its text no longer mentions are deleted.
+        """
+        batch_size = batch_size or self.batch_size
+        rows = publication_rows(publications, concepts_by_pub)
+        
+        with self.driver.session() as session:
+            for chunk in chunked(rows, batch_size):
+                session.execute_write(self._write_publication_chunk, chunk)
+        
+        logger.info(f"Upserted {len(rows)} publications in batches of {batch_size}")
+        return len(rows)
     
-    def create_publication_node(self, publication: Dict):
-        """Create a publication node in the graph"""
+    def replace_publication_concepts(self, concepts_by_pub: Dict[str, List[str]],
+                                     batch_size: Optional[int] = None) -> int:
+        """Replace the DISCUSSES edges of existing publications, leaving their properties alone.
+
+        For re-extraction from a snapshot, whose rows may be older than the
+        graph and carry no content_hash. Ids not in the graph are ignored.
+        """
+        batch_size = batch_size or self.batch_size
+        rows = [{'id': pub_id, 'concepts': list(concepts)} for pub_id, concepts in concepts_by_pub.items()]
+        
         with self.driver.session() as session:
-            query = """
-            MERGE (p:Publication {id: $id})
-            SET p.title = $title,
-                p.abstract = $abstract,
-                p.authors = $authors,
-                p.publication_date = $publication_date,
-                p.journal = $journal,
-                p.doi = $doi,
-                p.source = $source
-            """
-            session.run(query, **publication)
-    
-    def create_concept_relationship(self, publication_id: str, concept: str, relationship_type: str = "DISCUSSES"):
-        """Create relationship between publication and concept"""
+            for chunk in chunked(rows, batch_size):
+                session.execute_write(self._write_concept_chunk, chunk)
+        
+        logger.info(f"Replaced concepts of {len(rows)} publications in batches of {batch_size}")
+        return len(rows)
+    
+    def existing_content_hashes(self, ids: List[str], label: str = 'Publication') -> Dict[str, Optional[str]]:
+        """Stored content_hash per Publication (or Dataset) id; ids not in the graph are absent"""
         with self.driver.session() as session:
-            query = f"""
-            MATCH (p:Publication {{id: $publication_id}})
-            MERGE (c:Concept {{name: $concept}})
-            MERGE (p)-[r:{relationship_type}]->(c)
-            SET r.strength = 1.0
-            """
-            session.run(query, publication_id=publication_id, concept=concept)
-    
-    def get_connected_concepts(self, concept_name: str, depth: int = 2) -> List[Dict]:
+            return session.execute_read(self._read_content_hashes, ids, label)
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('content_hashes')
+    def _read_content_hashes(tx, ids: List[str], label: str) -> Dict[str, Optional[str]]:
+        records = tx.run(CONTENT_HASH_QUERIES[label], ids=ids).data()
+        return {record['id']: record['content_hash'] for record in records}
+    
+    def upsert_datasets_batch(self, datasets: List[Dict], concepts_by_dataset: Dict[str, List[str]],
+                              batch_size: Optional[int] = None) -> int:
+        """Upsert GeneLab datasets with their Organism, Environment and Concept links"""
+        batch_size = batch_size or self.batch_size
+        rows = dataset_rows(datasets, concepts_by_dataset)
+        
+        with self.driver.session() as session:
+            for chunk in chunked(rows, batch_size):
+                session.execute_write(self._write_dataset_chunk, chunk)
+        
+        logger.info(f"Upserted {len(rows)} datasets in batches of {batch_size}")
+        return len(rows)
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('write_datasets')
+    def _write_dataset_chunk(tx, rows: List[Dict]):
+        """Upsert one dataset chunk, replacing its links, and update GraphCount in the same transaction"""
+        names = dataset_chunk_names(rows)
+        deleted = {r['rel_type']: r['deleted'] for r in tx.run(DELETE_DATASET_LINKS_QUERY, rows=rows).data()}
+        datasets = tx.run(UPSERT_DATASETS_QUERY, rows=rows).consume().counters.nodes_created
+        organisms = tx.run(UPSERT_ORGANISMS_QUERY, organisms=names['organisms']).consume().counters.nodes_created
+        environments = tx.run(
+            UPSERT_ENVIRONMENTS_QUERY, environments=names['environments']
+        ).consume().counters.nodes_created
+        concepts = tx.run(UPSERT_CONCEPTS_QUERY, concepts=names['concepts']).consume().counters.nodes_created
+        links = {
+            rel_type: tx.run(query, rows=rows).consume().counters.relationships_created - deleted.get(rel_type, 0)
+            for rel_type, query in DATASET_LINK_QUERIES.items()
+        }
+        deltas = count_deltas(
+            {'Dataset': datasets, 'Organism': organisms, 'Environment': environments, 'Concept': concepts}, links
+        )
+        if deltas:
+            tx.run(UPDATE_GRAPH_COUNTS_QUERY, deltas=deltas).consume()
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('write_publications')
+    def _write_publication_chunk(tx, rows: List[Dict]):
+        """Upsert one chunk (concept edges replaced) and update GraphCount in the same transaction"""
+        concepts = sorted({concept for row in rows for concept in row['concepts']})
+        publications = tx.run(UPSERT_PUBLICATIONS_QUERY, rows=rows).consume().counters.nodes_created
+        new_concepts = tx.run(UPSERT_CONCEPTS_QUERY, concepts=concepts).consume().counters.nodes_created
+        stale = tx.run(DELETE_STALE_DISCUSSES_QUERY, rows=rows).consume().counters.relationships_deleted
+        edges = tx.run(UPSERT_DISCUSSES_QUERY, rows=rows).consume().counters.relationships_created
+        deltas = count_deltas({'Publication': publications, 'Concept': new_concepts}, {'DISCUSSES': edges - stale})
+        if deltas:
+            tx.run(UPDATE_GRAPH_COUNTS_QUERY, deltas=deltas).consume()
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('write_concepts')
+    def _write_concept_chunk(tx, rows: List[Dict]):
+        """Replace one chunk's DISCUSSES edges and update GraphCount in the same transaction"""
+        concepts = sorted({concept for row in rows for concept in row['concepts']})
+        new_concepts = tx.run(UPSERT_CONCEPTS_QUERY, concepts=concepts).consume().counters.nodes_created
+        stale = tx.run(DELETE_STALE_DISCUSSES_QUERY, rows=rows).consume().counters.relationships_deleted
+        edges = tx.run(UPSERT_DISCUSSES_QUERY, rows=rows).consume().counters.relationships_created
+        deltas = count_deltas({'Concept': new_concepts}, {'DISCUSSES': edges - stale})
+        if deltas:
+            tx.run(UPDATE_GRAPH_COUNTS_QUERY, deltas=deltas).consume()
+    
+    def iter_concept_edges(self):
+        """Stream (publication id, concept name) for every DISCUSSES edge"""
+        with self.driver.session() as session:
+            for record in session.run(CONCEPT_EDGES_QUERY):
+                yield record['publication'], record['concept']
+    
+    def iter_publication_pages(self, page_size: Optional[int] = None):
+        """Yield all Publication nodes in id order, one read transaction per page"""
+        page_size = page_size or settings.CORPUS_EXPORT_PAGE_SIZE
+        after = None
+        with self.driver.session() as session:
+            while True:
+                page = session.execute_read(self._read_publication_page, after, page_size)
+                if not page:
+                    return
+                yield page
+                if len(page) < page_size:
+                    return
+                after = page[-1]['id']
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('publication_page')
+    def _read_publication_page(tx, after, limit: int) -> List[Dict]:
+        if after is None:
+            return tx.run(EXPORT_FIRST_PUBLICATIONS_QUERY, limit=limit).data()
+        return tx.run(EXPORT_NEXT_PUBLICATIONS_QUERY, after=after, limit=limit).data()
+    
+    def get_connected_concepts(self, concept_name: str, depth: int = 2) -> Dict:
         """Get concepts connected to a given concept"""
+        return as_connected_concepts(
+            self.traverse_neighborhood(concept_name, depth, settings.TRAVERSAL_MAX_FANOUT)
+        )
+    
+    @result_cache.cached("graph")
+    def traverse_neighborhood(self, concept_name: str, depth: int = 2, fanout: int = 25) -> Dict:
+        """Bounded, strength-ranked neighborhood of a concept (see NeighborhoodTraversal)"""
         with self.driver.session() as session:
-            query = """
-            MATCH path = (start:Concept {name: $concept_name})-[*1..$depth]-(connected:Concept)
-            UNWIND nodes(path) as node
-            UNWIND relationships(path) as rel
-            RETURN COLLECT(DISTINCT {
-                id: id(node),
-                name: node.name,
-                type: labels(node)[0]
-            }) as nodes,
-            COLLECT(DISTINCT {
-                source: id(startNode(rel)),
-                target: id(endNode(rel)),
-                type: type(rel)
-            }) as relationships
-            """
-            result = session.run(query, concept_name=concept_name, depth=depth)
-            return result.single()
+            return session.execute_read(self._traverse_neighborhood, concept_name, depth, fanout)
     
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('traverse_neighborhood')
+    def _traverse_neighborhood(tx, concept_name: str, depth: int, fanout: int) -> Dict:
+        traversal = NeighborhoodTraversal(depth, fanout)
+        record = tx.run(START_NODE_QUERY, concept_name=concept_name).single()
+        if traversal.start(record.data() if record else None):
+            hop = 1
+            while traversal.expanding(hop):
+                traversal.absorb(hop, tx.run(EXPAND_QUERY, **traversal.hop_params()).data())
+                hop += 1
+        return traversal.result()
+    
+    @result_cache.cached("graph")
     def get_graph_stats(self) -> Dict:
         """Get knowledge graph statistics"""
         with self.driver.session() as session:
-            # Node counts by type
-            node_query = """
-            CALL apoc.meta.stats()
-            YIELD labels
-            RETURN labels
-            """
-            result = session.run(node_query)
-            stats = result.single()
-            
-            return {
-                "node_counts": stats["labels"] if stats else {},
-                "total_relationships": self._count_relationships()
-            }
+            return session.execute_read(self._read_graph_stats)
     
-    def _count_relationships(self) -> int:
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('graph_stats')
+    def _read_graph_stats(tx) -> Dict:
+        return format_graph_stats(tx.run(READ_GRAPH_COUNTS_QUERY).data())
+    
+    def reconcile_graph_stats(self) -> Dict:
+        """Recompute GraphCount exactly from the label and relationship-type count stores"""
         with self.driver.session() as session:
-            result = session.run("MATCH ()-[r]->() RETURN COUNT(r) as count")
-            return result.single()["count"]
+            stats = session.execute_write(self._reconcile_graph_stats)
+        logger.info(f"Graph statistics reconciled: {stats}")
+        return stats
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('reconcile_graph_stats')
+    def _reconcile_graph_stats(tx) -> Dict:
+        nodes = {}
+        for record in tx.run("CALL db.labels() YIELD label RETURN label").data():
+            label = record['label']
+            if label != STATS_LABEL:
+                nodes[label] = tx.run(f"MATCH (n:{escape_name(label)}) RETURN count(n) AS count").single()['count']
+        relationships = {}
+        for record in tx.run("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType").data():
+            rel_type = record['relationshipType']
+            query = f"MATCH ()-[r:{escape_name(rel_type)}]->() RETURN count(r) AS count"
+            relationships[rel_type] = tx.run(query).single()['count']
+        
+        tx.run(f"MATCH (c:{STATS_LABEL}) DELETE c").consume()
+        deltas = count_deltas(nodes, relationships)
+        if deltas:
+            tx.run(UPDATE_GRAPH_COUNTS_QUERY, deltas=deltas).consume()
+        return format_graph_stats(deltas)
+
+class AsyncKnowledgeGraphService:
+    """Async counterpart of KnowledgeGraphService for use from async routes.
+
+    Built on AsyncGraphDatabase with the same pool settings; reads go through
+    managed read transactions so they can be routed to cluster readers.
+    """
+
+    def __init__(self, driver=None, batch_size: Optional[int] = None):
+        if driver is None:
+            from neo4j import AsyncGraphDatabase
+            driver = AsyncGraphDatabase.driver(settings.NEO4J_URI, **driver_config())
+        self.driver = driver
+        self.batch_size = batch_size or settings.NEO4J_BATCH_SIZE
+    
+    async def close(self):
+        await self.driver.close()
+    
+    async def upsert_publications_batch(self, publications: List[Dict], concepts_by_pub: Dict[str, List[str]],
+                                        batch_size: Optional[int] = None) -> int:
+        """Upsert publications, concepts and DISCUSSES edges in chunked UNWIND transactions.
+
+        Each publication ends up discussing exactly its `concepts_by_pub` entry
+        (none if absent): edges to concepts its text no longer mentions are deleted.
+        """
+        batch_size = batch_size or self.batch_size
+        rows = publication_rows(publications, concepts_by_pub)
+        
+        async with self.driver.session() as session:
+            for chunk in chunked(rows, batch_size):
+                await session.execute_write(self._write_publication_chunk, chunk)
+        
+        logger.info(f"Upserted {len(rows)} publications in batches of {batch_size}")
+        return len(rows)
+    
+    async def existing_content_hashes(self, ids: List[str], label: str = 'Publication') -> Dict[str, Optional[str]]:
+        """Stored content_hash per Publication (or Dataset) id; ids not in the graph are absent"""
+        async with self.driver.session() as session:
+            return await session.execute_read(self._read_content_hashes, ids, label)
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('content_hashes')
+    async def _read_content_hashes(tx, ids: List[str], label: str) -> Dict[str, Optional[str]]:
+        result = await tx.run(CONTENT_HASH_QUERIES[label], ids=ids)
+        return {record['id']: record['content_hash'] for record in await result.data()}
+    
+    async def upsert_datasets_batch(self, datasets: List[Dict], concepts_by_dataset: Dict[str, List[str]],
+                                    batch_size: Optional[int] = None) -> int:
+        """Upsert GeneLab datasets with their Organism, Environment and Concept links"""
+        batch_size = batch_size or self.batch_size
+        rows = dataset_rows(datasets, concepts_by_dataset)
+        
+        async with self.driver.session() as session:
+            for chunk in chunked(rows, batch_size):
+                await session.execute_write(self._write_dataset_chunk, chunk)
+        
+        logger.info(f"Upserted {len(rows)} datasets in batches of {batch_size}")
+        return len(rows)
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('write_datasets')
+    async def _write_dataset_chunk(tx, rows: List[Dict]):
+        """Upsert one dataset chunk, replacing its links, and update GraphCount in the same transaction"""
+        async def created(query: str, **params):
+            return (await (await tx.run(query, **params)).consume()).counters
+        
+        names = dataset_chunk_names(rows)
+        records = await (await tx.run(DELETE_DATASET_LINKS_QUERY, rows=rows)).data()
+        deleted = {r['rel_type']: r['deleted'] for r in records}
+        datasets = (await created(UPSERT_DATASETS_QUERY, rows=rows)).nodes_created
+        organisms = (await created(UPSERT_ORGANISMS_QUERY, organisms=names['organisms'])).nodes_created
+        environments = (await created(UPSERT_ENVIRONMENTS_QUERY, environments=names['environments'])).nodes_created
+        concepts = (await created(UPSERT_CONCEPTS_QUERY, concepts=names['concepts'])).nodes_created
+        links = {
+            rel_type: (await created(query, rows=rows)).relationships_created - deleted.get(rel_type, 0)
+            for rel_type, query in DATASET_LINK_QUERIES.items()
+        }
+        deltas = count_deltas(
+            {'Dataset': datasets, 'Organism': organisms, 'Environment': environments, 'Concept': concepts}, links
+        )
+        if deltas:
+            await (await tx.run(UPDATE_GRAPH_COUNTS_QUERY, deltas=deltas)).consume()
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('write_publications')
+    async def _write_publication_chunk(tx, rows: List[Dict]):
+        """Upsert one chunk (concept edges replaced) and update GraphCount in the same transaction"""
+        concepts = sorted({concept for row in rows for concept in row['concepts']})
+        publications = (await (await tx.run(UPSERT_PUBLICATIONS_QUERY, rows=rows)).consume()).counters.nodes_created
+        new_concepts = (await (await tx.run(UPSERT_CONCEPTS_QUERY, concepts=concepts)).consume()).counters.nodes_created
+        stale = (await (await tx.run(DELETE_STALE_DISCUSSES_QUERY, rows=rows)).consume()).counters.relationships_deleted
+        edges = (await (await tx.run(UPSERT_DISCUSSES_QUERY, rows=rows)).consume()).counters.relationships_created
+        deltas = count_deltas({'Publication': publications, 'Concept': new_concepts}, {'DISCUSSES': edges - stale})
+        if deltas:
+            await (await tx.run(UPDATE_GRAPH_COUNTS_QUERY, deltas=deltas)).consume()
+    
+    async def get_connected_concepts(self, concept_name: str, depth: int = 2) -> Dict:
+        """Get concepts connected to a given concept"""
+        return as_connected_concepts(
+            await self.traverse_neighborhood(concept_name, depth, settings.TRAVERSAL_MAX_FANOUT)
+        )
+    
+    @result_cache.cached("graph")
+    async def traverse_neighborhood(self, concept_name: str, depth: int = 2, fanout: int = 25) -> Dict:
+        """Bounded, strength-ranked neighborhood of a concept (see NeighborhoodTraversal)"""
+        async with self.driver.session() as session:
+            return await session.execute_read(self._traverse_neighborhood, concept_name, depth, fanout)
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('traverse_neighborhood')
+    async def _traverse_neighborhood(tx, concept_name: str, depth: int, fanout: int) -> Dict:
+        traversal = NeighborhoodTraversal(depth, fanout)
+        record = await (await tx.run(START_NODE_QUERY, concept_name=concept_name)).single()
+        if traversal.start(record.data() if record else None):
+            hop = 1
+            while traversal.expanding(hop):
+                result = await tx.run(EXPAND_QUERY, **traversal.hop_params())
+                traversal.absorb(hop, await result.data())
+                hop += 1
+        return traversal.result()
+    
+    @result_cache.cached("graph")
+    async def get_graph_stats(self) -> Dict:
+        """Get knowledge graph statistics"""
+        async with self.driver.session() as session:
+            return await session.execute_read(self._read_graph_stats)
+    
+    @staticmethod
+    @GRAPH_QUERY_SECONDS.time('graph_stats')
+    async def _read_graph_stats(tx) -> Dict:
+        result = await tx.run(READ_GRAPH_COUNTS_QUERY)
+        return format_graph_stats(await result.data())
+
+# Singleton instances, built on first access so importing this module neither
+# loads neo4j nor creates a driver (and a forked worker builds its own)
+_SINGLETONS = {'kg_service': KnowledgeGraphService, 'async_kg_service': AsyncKnowledgeGraphService}
+_singleton_lock = threading.Lock()
+
+def __getattr__(name: str):
+    if name not in _SINGLETONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _singleton_lock:
+        if name not in globals():
+            globals()[name] = _SINGLETONS[name]()
+            logger.info(f"Created {name} for {settings.NEO4J_URI}")
+    return globals()[name]
+
+def _pool_gauge(field: Optional[str] = None) -> Dict:
+    values = {}
+    for label, name in (('sync', 'kg_service'), ('async', 'async_kg_service')):
+        service = globals().get(name)
+        if service is None:
+            continue
+        usage = pool_usage(service.driver)
+        if not usage:
+            continue
+        if field is None:
+            values[(label,)] = usage['in_use'] / settings.NEO4J_MAX_POOL_SIZE
+        else:
+            values[(label, field)] = usage[field]
+    return values
 
-# Singleton instance
-kg_service = KnowledgeGraphService()
\ No newline at end of file
+metrics.gauge(
+    "biosynapse_neo4j_pool_connections", "Pooled Neo4j connections by driver and state", ('driver', 'state'),
+    collect=lambda: {**_pool_gauge('in_use'), **_pool_gauge('idle')}
+)
+metrics.gauge(
+    "biosynapse_neo4j_pool_utilization", "In-use Neo4j connections as a fraction of NEO4J_MAX_POOL_SIZE",
+    ('driver',), collect=_pool_gauge
+)
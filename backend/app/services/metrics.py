@@ -0,0 +1,235 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import functools
+import inspect
+import threading
+from time import perf_counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond cache hits through multi-second ingests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _with_constant_labels(labels: str, constant: str) -> str:
+    """Prepend already formatted `name="value"` pairs to a formatted label set"""
+    if not constant:
+        return labels
+    return "{" + constant + ("," + labels[1:] if labels else "}")
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(suffixed name, formatted labels, value) triples"""
+        return ()
+
+    def render(self, constant_labels: str = "") -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [
+            f"{name}{_with_constant_labels(labels, constant_labels)} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        ]
+        return lines
+
+class Counter(Metric):
+    """Monotonic count; `collect` may supply {labels: value} read at scrape time from existing counters"""
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 collect: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.collect = collect
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self):
+        values = dict(self._values)
+        if self.collect:
+            try:
+                values.update(self.collect())
+            except Exception as e:
+                logger.warning(f"Metric {self.name} collection failed: {e}")
+        for labels, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+class Gauge(Counter):
+    """Point-in-time value, set directly or computed by `collect`"""
+    kind = 'gauge'
+
+    def set(self, value: float, labels: LabelValues = ()):
+        self._values[labels] = value
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def _series_for(self, labels: LabelValues) -> List[float]:
+        series = self._series.get(labels)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+        return series
+
+    def observe(self, value: float, labels: LabelValues = ()):
+        series = self._series_for(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, labels: LabelValues = ()) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def time(self, *labels: str) -> "Timer":
+        return Timer(self, labels)
+
+    def samples(self):
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else _format_value(bound)
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, labels, f'le="{le}"'), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labels), series[-1]
+            yield f"{self.name}_count", _format_labels(self.labelnames, labels), cumulative
+
+class Timer:
+    """Context manager and decorator that observes elapsed seconds into a histogram.
+
+    The decorator form skips the context-manager protocol and costs about
+    one observe() per call, which matters on microsecond paths.
+    """
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: Histogram, labels: LabelValues):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(perf_counter() - self.start, self.labels)
+        return False
+
+    def __call__(self, func):
+        observe, labels = self.histogram.observe, self.labels
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(perf_counter() - start, labels)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start, labels)
+        return wrapper
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text exposition format.
+
+    `constant_labels` are added to every sample, e.g. the worker slot of a
+    pre-forked API process (see app.serve).
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self.constant_labels: Dict[str, str] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = (), collect=None) -> Counter:
+        return self.register(Counter(name, help_text, labelnames, collect))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = (), collect=None) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames, collect))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        constant = _format_labels(tuple(self.constant_labels), tuple(self.constant_labels.values()))[1:-1]
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines += metric.render(constant)
+        return "\n".join(lines) + "\n"
+
+# Singleton instance
+metrics = MetricsRegistry()
+
+REQUEST_SECONDS = metrics.histogram(
+    "biosynapse_http_request_duration_seconds", "API request latency by route", ('method', 'route', 'status')
+)
+GRAPH_QUERY_SECONDS = metrics.histogram(
+    "biosynapse_graph_query_duration_seconds", "Neo4j transaction latency by query name", ('query',)
+)
+FETCH_SECONDS = metrics.histogram(
+    "biosynapse_http_fetch_duration_seconds", "NASA API request latency by source, including retries", ('source',)
+)
+FETCH_RETRIES = metrics.counter(
+    "biosynapse_http_fetch_retries_total", "NASA API retries by source", ('source',)
+)
+SIMULATION_SECONDS = metrics.histogram(
+    "biosynapse_simulation_phase_duration_seconds", "Simulation latency by phase", ('phase',)
+)
+# Per batch: a single abstract takes tens of microseconds, about the cost of the timer itself
+EXTRACTION_SECONDS = metrics.histogram(
+    "biosynapse_concept_extraction_duration_seconds", "Concept extraction latency per batch of documents"
+)
+INGEST_ROWS = metrics.counter(
+    "biosynapse_ingest_rows_total", "Records seen by ingest, by source and outcome", ('source', 'outcome')
+)
+INGEST_ROWS_PER_SECOND = metrics.gauge(
+    "biosynapse_ingest_rows_per_second", "Throughput of the most recent ingest job, by source and stage",
+    ('source', 'stage')
+)
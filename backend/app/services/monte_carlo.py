@@ -0,0 +1,203 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+import numpy as np
+from app.config import settings
+from app.services.batch_simulation import BatchRiskEngine, batch_risk_engine, risk_kernel, total_risk_scores
+from app.services.metrics import SIMULATION_SECONDS
+from app.services.simulation_engine import RISK_AREAS, RISK_CAP
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fixed-width histogram over [0, RISK_CAP]; chunk histograms merge by addition,
+# so percentiles never need every trial in memory at once.
+HISTOGRAM_BINS = 9500
+BIN_WIDTH = RISK_CAP / HISTOGRAM_BINS
+SUMMARY_ROWS = RISK_AREAS + ('total_risk_score',)
+
+SAMPLED_COEFFICIENTS = (
+    'bone_density', 'muscle_mass', 'cardiovascular', 'psychological_base', 'immune_function',
+    'gravity', 'radiation'
+)
+
+# Spreads are relative to the deterministic coefficient value
+DEFAULT_DISTRIBUTIONS = {
+    name: {'distribution': 'normal', 'scale': 0.1} for name in SAMPLED_COEFFICIENTS
+}
+
+def _sample(rng: np.random.Generator, base: float, spec: Dict, size: int) -> np.ndarray:
+    """Draw `size` values of one coefficient around its deterministic value"""
+    kind = spec.get('distribution', 'normal')
+    scale = spec.get('scale', 0.1)
+    if kind == 'fixed':
+        return np.full(size, base)
+    if kind == 'normal':
+        values = base * (1 + scale * rng.standard_normal(size))
+    elif kind == 'uniform':
+        values = base * rng.uniform(1 - scale, 1 + scale, size)
+    elif kind == 'lognormal':
+        values = base * rng.lognormal(0.0, scale, size)
+    else:
+        raise ValueError(f"Unknown distribution '{kind}'")
+    return np.clip(values, 0.0, None)
+
+def _simulate_chunk(scenario: Dict, base: Dict[str, float], distributions: Dict[str, Dict],
+                    seed: np.random.SeedSequence, trials: int) -> Dict:
+    """Run one chunk of trials and reduce it to per-row histograms.
+
+    Top-level so it can be pickled into a process pool worker.
+    """
+    rng = np.random.default_rng(seed)
+    sampled = {name: _sample(rng, base[name], distributions[name], trials) for name in SAMPLED_COEFFICIENTS}
+    risks = risk_kernel(
+        scenario['duration_factor'],
+        np.minimum(sampled['gravity'], 1.0),
+        sampled['radiation'],
+        scenario['artificial_gravity'],
+        scenario['shielding_factor'],
+        sampled
+    )
+    values = np.column_stack([risks, total_risk_scores(risks)])
+
+    bins = np.minimum((values / BIN_WIDTH).astype(np.int64), HISTOGRAM_BINS - 1)
+    bins += np.arange(values.shape[1]) * HISTOGRAM_BINS
+    histogram = np.bincount(bins.ravel(), minlength=values.shape[1] * HISTOGRAM_BINS)
+    return {
+        'histogram': histogram.reshape(values.shape[1], HISTOGRAM_BINS),
+        'sum': values.sum(axis=0),
+        'min': values.min(axis=0),
+        'max': values.max(axis=0),
+        'trials': trials
+    }
+
+class _RunningSummary:
+    """Merges chunk results as they arrive"""
+
+    def __init__(self):
+        self.histogram = np.zeros((len(SUMMARY_ROWS), HISTOGRAM_BINS), dtype=np.int64)
+        self.sum = np.zeros(len(SUMMARY_ROWS))
+        self.min = np.full(len(SUMMARY_ROWS), np.inf)
+        self.max = np.full(len(SUMMARY_ROWS), -np.inf)
+        self.trials = 0
+
+    def merge(self, chunk: Dict):
+        self.histogram += chunk['histogram']
+        self.sum += chunk['sum']
+        np.minimum(self.min, chunk['min'], out=self.min)
+        np.maximum(self.max, chunk['max'], out=self.max)
+        self.trials += chunk['trials']
+
+    def percentile(self, row: int, q: float) -> float:
+        """Interpolate within the histogram bin holding the q-th quantile"""
+        cumulative = np.cumsum(self.histogram[row])
+        target = q * self.trials
+        index = int(np.searchsorted(cumulative, target, side='left'))
+        index = min(index, HISTOGRAM_BINS - 1)
+        below = cumulative[index - 1] if index else 0
+        in_bin = self.histogram[row, index]
+        fraction = (target - below) / in_bin if in_bin else 0.0
+        value = (index + fraction) * BIN_WIDTH
+        return float(np.clip(value, self.min[row], self.max[row]))
+
+    def summarize(self, row: int) -> Dict[str, float]:
+        return {
+            'p5': self.percentile(row, 0.05),
+            'p50': self.percentile(row, 0.50),
+            'p95': self.percentile(row, 0.95),
+            'mean': float(self.sum[row] / self.trials),
+            'min': float(self.min[row]),
+            'max': float(self.max[row])
+        }
+
+class MonteCarloSimulator:
+    """Stochastic mode for MissionSimulator.
+
+    Samples the risk and destination coefficients from configurable
+    distributions and reports per-area percentiles. Large runs are split into
+    seeded chunks and fanned out over a process pool (or run inline with one
+    worker). Chunks merge in submission order, so results are identical for a
+    given seed and chunk size regardless of the number of workers.
+    """
+
+    def __init__(self, engine: BatchRiskEngine, chunk_size: Optional[int] = None,
+                 max_workers: Optional[int] = None):
+        self.engine = engine
+        self.chunk_size = chunk_size or settings.MONTE_CARLO_CHUNK_SIZE
+        self.max_workers = max_workers or settings.MONTE_CARLO_WORKERS
+        self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    @SIMULATION_SECONDS.time('monte_carlo')
+    def simulate(self, mission_params: Dict, trials: int = 10000, seed: Optional[int] = None,
+                 distributions: Optional[Dict[str, Dict]] = None) -> Dict:
+        """Run `trials` sampled scenarios and return p5/p50/p95 per risk area"""
+        if trials < 1 or trials > settings.MONTE_CARLO_MAX_TRIALS:
+            raise ValueError(f"trials must be between 1 and {settings.MONTE_CARLO_MAX_TRIALS}")
+        unknown = set(distributions or {}) - set(SAMPLED_COEFFICIENTS)
+        if unknown:
+            raise ValueError(f"Unknown coefficients: {', '.join(sorted(unknown))}")
+
+        duration_days = mission_params.get('duration_days', 365)
+        destination = mission_params.get('destination', 'mars')
+        simulator = self.engine.simulator
+        dest = simulator.destination_factors.get(destination, simulator.destination_factors['mars'])
+        scenario = {
+            'duration_factor': min(duration_days / 365, 2.0),
+            'artificial_gravity': bool(mission_params.get('artificial_gravity', False)),
+            'shielding_factor': simulator.shielding_factors.get(
+                mission_params.get('radiation_shielding', 'standard'), 1.0)
+        }
+        base = {**self.engine.coefficients(), 'gravity': dest['gravity'], 'radiation': dest['radiation']}
+        distributions = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+
+        seed_sequence = np.random.SeedSequence(seed)
+        chunk_sizes = [min(self.chunk_size, trials - start) for start in range(0, trials, self.chunk_size)]
+        chunk_seeds = seed_sequence.spawn(len(chunk_sizes))
+
+        summary = _RunningSummary()
+        if len(chunk_sizes) == 1 or self.max_workers == 1:
+            for chunk_seed, size in zip(chunk_seeds, chunk_sizes):
+                summary.merge(_simulate_chunk(scenario, base, distributions, chunk_seed, size))
+        else:
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_simulate_chunk, scenario, base, distributions, chunk_seed, size)
+                for chunk_seed, size in zip(chunk_seeds, chunk_sizes)
+            ]
+            # Floating-point sums depend on order, so merge in submission order rather than as completed
+            for future in futures:
+                summary.merge(future.result())
+
+        percentiles = {area: summary.summarize(row) for row, area in enumerate(RISK_AREAS)}
+        total = summary.summarize(len(RISK_AREAS))
+        return {
+            'mission_summary': {
+                'destination': destination,
+                'duration_days': duration_days,
+                'total_risk_score': total
+            },
+            'risk_percentiles': percentiles,
+            'trials': trials,
+            'seed': seed_sequence.entropy,
+            'confidence_level': self._confidence_level(total)
+        }
+
+    def _confidence_level(self, total: Dict[str, float]) -> str:
+        spread = total['p95'] - total['p5']
+        if spread < 0.05:
+            return 'high'
+        if spread < 0.15:
+            return 'medium'
+        return 'low'
+
+# Singleton instance
+monte_carlo_simulator = MonteCarloSimulator(batch_risk_engine)
@@ -0,0 +1,157 @@
+from typing import Dict, NamedTuple, Optional, Tuple
+import copy
+import threading
+import numpy as np
+from app.config import settings
+from app.services.batch_simulation import ArrayLike, BatchRiskEngine, batch_risk_engine
+from app.services.cache import stable_hash
+from app.services.simulation_engine import RISK_AREAS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# duration_factor saturates at 2 x 365 days, so risks are flat beyond this
+MAX_DURATION_DAYS = 730
+
+class TableSnapshot(NamedTuple):
+    fingerprint: str
+    # Copies of the simulator tables the tensor was built from
+    sources: Tuple[Dict, Dict, Dict]
+    bucket_days: int
+    destinations: Dict[str, int]
+    shielding: Dict[str, int]
+    # destination x shielding (+ unknown) x artificial gravity x duration bucket x RISK_AREAS
+    risks: np.ndarray
+
+class RiskLookupTable:
+    """Precomputed risk tensor for interactive what-if queries.
+
+    Risks are piecewise linear in duration, so linear interpolation between
+    buckets is exact except within one bucket of the RISK_CAP kink. Every
+    lookup compares the simulator's coefficient tables with the copies the
+    tensor was built from (about a microsecond; hashing them costs 100x
+    that) and rebuilds on any change. verify() measures the worst error
+    against the exact batch kernel.
+    """
+
+    def __init__(self, engine: BatchRiskEngine, bucket_days: Optional[int] = None):
+        self.engine = engine
+        self.bucket_days = bucket_days or settings.RISK_TABLE_BUCKET_DAYS
+        self._snapshot: Optional[TableSnapshot] = None
+        self._lock = threading.Lock()
+
+    def sources(self) -> Tuple[Dict, Dict, Dict]:
+        simulator = self.engine.simulator
+        return simulator.risk_factors, simulator.destination_factors, simulator.shielding_factors
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def snapshot(self) -> TableSnapshot:
+        """Current tensor, rebuilt first if the simulator's tables changed"""
+        sources = self.sources()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.sources != sources:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot.sources != sources:
+                    snapshot = self._snapshot = self._build(copy.deepcopy(sources))
+        return snapshot
+
+    def _build(self, sources: Tuple[Dict, Dict, Dict]) -> TableSnapshot:
+        simulator = self.engine.simulator
+        destinations = list(simulator.destination_factors)
+        # Trailing unnamed slot: shielding names the simulator does not know score with factor 1.0
+        shielding = list(simulator.shielding_factors) + ['']
+        buckets = -(-MAX_DURATION_DAYS // self.bucket_days) + 1
+        durations = np.arange(buckets) * self.bucket_days
+
+        grid = np.meshgrid(np.arange(len(destinations)), np.arange(len(shielding)), [False, True], durations,
+                           indexing='ij')
+        dest_index, shield_index, gravity, duration = (axis.ravel() for axis in grid)
+        risks = self.engine.calculate_risks(
+            duration, np.array(destinations)[dest_index], gravity, np.array(shielding)[shield_index]
+        )
+        shape = (len(destinations), len(shielding), 2, buckets, len(RISK_AREAS))
+        logger.info(f"Risk lookup table built: {shape[:-1]} scenarios x {len(RISK_AREAS)} areas")
+        fingerprint = stable_hash({'sources': sources, 'bucket_days': self.bucket_days})
+        return TableSnapshot(
+            fingerprint, sources, self.bucket_days,
+            {name: i for i, name in enumerate(destinations)},
+            {name: i for i, name in enumerate(shielding[:-1])},
+            risks.reshape(shape)
+        )
+
+    def lookup(self, duration_days: ArrayLike, destination: ArrayLike,
+               artificial_gravity: ArrayLike, radiation_shielding: ArrayLike) -> np.ndarray:
+        """Interpolated scenarios x RISK_AREAS matrix; inputs broadcast like calculate_risks"""
+        table = self.snapshot()
+        duration_days = np.atleast_1d(np.asarray(duration_days, dtype=np.float64))
+        if (duration_days < 0).any():
+            raise ValueError("duration_days must be non-negative")
+        # Unknown destinations fall back to mars, as in the exact path
+        dest = self._indices(destination, table.destinations, table.destinations['mars'])
+        shield = self._indices(radiation_shielding, table.shielding, len(table.shielding))
+        gravity = np.asarray(artificial_gravity, dtype=bool).astype(np.intp)
+
+        position = np.minimum(duration_days, MAX_DURATION_DAYS) / table.bucket_days
+        lower = np.minimum(position.astype(np.intp), table.risks.shape[3] - 2)
+        weight = (position - lower)[:, None]
+        try:
+            below = table.risks[dest, shield, gravity, lower]
+            above = table.risks[dest, shield, gravity, lower + 1]
+        except IndexError as e:
+            raise ValueError(str(e))
+        return below + (above - below) * weight
+
+    @staticmethod
+    def _indices(names: ArrayLike, index: Dict[str, int], default: int):
+        """Table index per name; a single name (the common slider case) skips np.unique"""
+        if isinstance(names, str):
+            return index.get(names, default)
+        unique, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+        return np.array([index.get(name, default) for name in unique], dtype=np.intp)[inverse]
+
+    def verify(self, max_days: int = MAX_DURATION_DAYS + 30) -> Dict:
+        """Compare every integer duration up to `max_days` for each table cell with the exact kernel"""
+        table = self.snapshot()
+        destinations = list(table.destinations) + ['unlisted']
+        shielding = list(table.shielding) + ['unlisted']
+        grid = np.meshgrid(np.arange(len(destinations)), np.arange(len(shielding)), [False, True],
+                           np.arange(max_days + 1), indexing='ij')
+        dest_index, shield_index, gravity, duration = (axis.ravel() for axis in grid)
+        args = (duration, np.array(destinations)[dest_index], gravity, np.array(shielding)[shield_index])
+        errors = np.abs(self.lookup(*args) - self.engine.calculate_risks(*args))
+        worst = np.unravel_index(np.argmax(errors), errors.shape)
+        max_error = float(errors[worst])
+        return {
+            'scenarios': int(errors.shape[0]),
+            'bucket_days': table.bucket_days,
+            'max_abs_error': max_error,
+            'mean_abs_error': float(errors.mean()),
+            'worst_case': {
+                'destination': str(args[1][worst[0]]),
+                'radiation_shielding': str(args[3][worst[0]]),
+                'artificial_gravity': bool(gravity[worst[0]]),
+                'duration_days': int(duration[worst[0]]),
+                'risk_area': RISK_AREAS[worst[1]]
+            },
+            'tolerance': settings.RISK_TABLE_TOLERANCE,
+            'passed': max_error <= settings.RISK_TABLE_TOLERANCE
+        }
+
+    def info(self) -> Dict:
+        table = self._snapshot
+        if table is None:
+            return {'ready': False}
+        return {
+            'ready': True,
+            'fingerprint': table.fingerprint[:16],
+            'bucket_days': table.bucket_days,
+            'shape': list(table.risks.shape),
+            'bytes': int(table.risks.nbytes)
+        }
+
+# Singleton instance
+risk_table = RiskLookupTable(batch_risk_engine)
@@ -0,0 +1,265 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import os
+import sys
+import threading
+import zlib
+import numpy as np
+from app.config import settings
+from app.services.concept_extractor import tokenize
+from app.services.concept_index import _csr_indptr, _file_version, _save_npz
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Frequent function words; IDF would weigh them near zero anyway, but their postings would span the corpus
+STOP_WORDS = frozenset(
+    "a an and are as at be been but by for from has have in into is it its of on or that the their these "
+    "this those to was were which with we our after during between than not no can may also".split()
+)
+
+def publication_text(pub: Dict) -> str:
+    return f"{pub.get('title') or ''} {pub.get('abstract') or ''}"
+
+def hashed_term_counts(text: str, n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Term counts of `text` hashed into `n_features` buckets, as (sorted feature ids, counts)"""
+    tokens = [token for token in tokenize(text) if len(token) > 1 and token not in STOP_WORDS]
+    # crc32 rather than hash(): feature ids must be stable across processes and saved indexes
+    buckets = np.fromiter((zlib.crc32(token.encode()) for token in tokens), dtype=np.int64, count=len(tokens))
+    features, counts = np.unique(buckets % n_features, return_counts=True)
+    return features.astype(np.int32), counts.astype(np.float32)
+
+class SimilarityArrays(NamedTuple):
+    # Publication x feature CSR; rows are positions in SimilarityIndex.publications
+    indptr: np.ndarray
+    features: np.ndarray
+    counts: np.ndarray
+    weights: np.ndarray  # L2-normalized TF-IDF
+    # The same weights transposed (feature x publication), which queries scan;
+    # float64 because bincount would otherwise convert them on every query
+    postings_indptr: np.ndarray
+    postings: np.ndarray
+    postings_weights: np.ndarray
+
+def empty_arrays(n_features: int) -> SimilarityArrays:
+    return SimilarityArrays(
+        np.zeros(1, np.int64), np.empty(0, np.int32), np.empty(0, np.float32), np.empty(0, np.float32),
+        np.zeros(n_features + 1, np.int64), np.empty(0, np.int32), np.empty(0, np.float64)
+    )
+
+def tfidf_arrays(rows: np.ndarray, features: np.ndarray, counts: np.ndarray,
+                 n_rows: int, n_features: int) -> SimilarityArrays:
+    """Index arrays for COO term counts sorted by row; weights are (1 + log tf) * smoothed idf"""
+    indptr = _csr_indptr(rows, n_rows)
+    documents = np.count_nonzero(np.diff(indptr))
+    document_frequency = np.bincount(features, minlength=n_features)
+    idf = np.log((1 + documents) / (1 + document_frequency)) + 1
+    weights = (1 + np.log(counts)) * idf[features]
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n_rows))
+    weights = (weights / norms[rows]).astype(np.float32)
+
+    order = np.argsort(features, kind='stable')
+    return SimilarityArrays(
+        indptr, features, counts, weights,
+        _csr_indptr(features[order], n_features), rows[order].astype(np.int32), weights[order].astype(np.float64)
+    )
+
+class SimilarityIndex:
+    """Hashed TF-IDF vectors of publication titles and abstracts for top-k cosine search.
+
+    Term counts are hashed into 2**SIMILARITY_HASH_BITS features and kept
+    as CSR rows, alongside the transposed, normalized TF-IDF postings that
+    queries read. As in ConceptIndex, ingest buffers new or changed
+    publications and the next read merges them, recomputing IDF over the
+    whole corpus. Batch queries are scored in blocks of rows (a sparse
+    product with the postings) whose score matrix and postings reads stay
+    within SIMILARITY_BLOCK_ELEMENTS; top-k selection runs once per block.
+    The API reloads the file the worker saves with reload_if_changed.
+    """
+
+    def __init__(self, hash_bits: Optional[int] = None):
+        self.n_features = 1 << (hash_bits or settings.SIMILARITY_HASH_BITS)
+        self.ready = False
+        self.file_version: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.publications: List[str] = []
+        self.publication_ids: Dict[str, int] = {}
+        self.arrays = empty_arrays(self.n_features)
+        self._pending: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.dirty = False
+
+    def add_publications(self, publications: Iterable[Dict]):
+        """Buffer title + abstract vectors; a publication seen before replaces its old vector.
+
+        Ignored until the index is built or loaded, as in ConceptIndex.add_edges.
+        """
+        if self.ready:
+            self._buffer(publications)
+
+    def _buffer(self, publications: Iterable[Dict]):
+        vectors = [(pub['id'], hashed_term_counts(publication_text(pub), self.n_features)) for pub in publications]
+        with self._lock:
+            for pub_id, vector in vectors:
+                row = self.publication_ids.get(pub_id)
+                if row is None:
+                    row = self.publication_ids[pub_id] = len(self.publications)
+                    self.publications.append(pub_id)
+                self._pending[row] = vector
+            if vectors:
+                self.dirty = True
+
+    def build(self, batches: Iterable[List[Dict]]) -> "SimilarityIndex":
+        """Replace the index with batches of publication dicts (id, title, abstract)"""
+        with self._lock:
+            self._reset()
+        for batch in batches:
+            self._buffer(batch)
+        self._merge()
+        self.ready = True
+        logger.info(f"Similarity index built: {self.memory_report()}")
+        return self
+
+    def _merge(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            arrays = self.arrays
+            old_rows = np.repeat(np.arange(len(arrays.indptr) - 1), np.diff(arrays.indptr))
+            keep = ~np.isin(old_rows, np.fromiter(pending, dtype=np.int64, count=len(pending)))
+            rows = np.concatenate(
+                [old_rows[keep]] + [np.full(len(features), row) for row, (features, _) in pending.items()]
+            )
+            features = np.concatenate([arrays.features[keep]] + [features for features, _ in pending.values()])
+            counts = np.concatenate([arrays.counts[keep]] + [counts for _, counts in pending.values()])
+            order = np.argsort(rows, kind='stable')
+            self.arrays = tfidf_arrays(rows[order], features[order], counts[order],
+                                       len(self.publications), self.n_features)
+
+    def _snapshot(self) -> SimilarityArrays:
+        if self._pending:
+            self._merge()
+        return self.arrays
+
+    def similar(self, publication_id: str, limit: int = 10) -> Optional[List[Dict]]:
+        """Most similar publications by cosine, best first; None if `publication_id` is not indexed"""
+        return self.similar_batch([publication_id], limit)[0]
+
+    def similar_batch(self, publication_ids: Sequence[str], limit: int = 10) -> List[Optional[List[Dict]]]:
+        arrays = self._snapshot()
+        n_rows = len(arrays.indptr) - 1
+        rows = [self.publication_ids.get(pub_id) for pub_id in publication_ids]
+        rows = [row if row is not None and row < n_rows else None for row in rows]
+        results: Dict[int, List[Dict]] = {}
+        for block in self._blocks(arrays, sorted({row for row in rows if row is not None})):
+            results.update(zip(block, self._top(self._scores(arrays, block), block, limit)))
+        return [None if row is None else results[row] for row in rows]
+
+    def _blocks(self, arrays: SimilarityArrays, rows: List[int]):
+        """Group query rows so score cells plus postings read stay within SIMILARITY_BLOCK_ELEMENTS"""
+        n_rows = len(arrays.indptr) - 1
+        block, size = [], 0
+        for row in rows:
+            features = arrays.features[arrays.indptr[row]:arrays.indptr[row + 1]]
+            work = n_rows + int((arrays.postings_indptr[features + 1] - arrays.postings_indptr[features]).sum())
+            if block and size + work > settings.SIMILARITY_BLOCK_ELEMENTS:
+                yield block
+                block, size = [], 0
+            block.append(row)
+            size += work
+        if block:
+            yield block
+
+    @staticmethod
+    def _scores(arrays: SimilarityArrays, rows: List[int]) -> np.ndarray:
+        """Cosine scores of a block of rows against every publication, (rows x features) @ postings.
+
+        Each query row gathers the postings of its terms as contiguous
+        slices and sums weight products per publication with one bincount,
+        which is several times faster than scattering term by term.
+        """
+        n_rows = len(arrays.indptr) - 1
+        scores = np.empty((len(rows), n_rows))
+        for i, row in enumerate(rows):
+            start, end = arrays.indptr[row], arrays.indptr[row + 1]
+            features = arrays.features[start:end]
+            first = arrays.postings_indptr[features].tolist()
+            last = arrays.postings_indptr[features + 1].tolist()
+            query_weights = arrays.weights[start:end].tolist()
+            documents = np.concatenate([arrays.postings[a:b] for a, b in zip(first, last)] or [arrays.postings[:0]])
+            weights = np.concatenate([arrays.postings_weights[a:b] * w for a, b, w in zip(first, last, query_weights)]
+                                     or [arrays.postings_weights[:0]])
+            scores[i] = np.bincount(documents, weights=weights, minlength=n_rows)
+        return scores
+
+    def _top(self, scores: np.ndarray, rows: List[int], limit: int) -> List[List[Dict]]:
+        """Best `limit` publications per block row, excluding the row itself and zero scores"""
+        scores[np.arange(len(rows)), rows] = 0
+        limit = min(max(limit, 1), scores.shape[1])
+        top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [{'id': self.publications[i], 'score': score} for i, score in zip(ids, values) if score > 0]
+            for ids, values in zip(top.tolist(), top_scores.tolist())
+        ]
+
+    def memory_report(self) -> Dict:
+        array_bytes = {name: int(array.nbytes) for name, array in self.arrays._asdict().items()}
+        name_bytes = sum(sys.getsizeof(name) for name in self.publications) + sys.getsizeof(self.publication_ids)
+        return {
+            'publications': len(self.publications),
+            'features': self.n_features,
+            'nonzeros': int(len(self.arrays.features)),
+            'pending_publications': len(self._pending),
+            'array_bytes': array_bytes,
+            'name_bytes': name_bytes,
+            'total_bytes': sum(array_bytes.values()) + name_bytes
+        }
+
+    def save(self, path: Optional[str] = None):
+        """Write the merged index atomically as an uncompressed npz"""
+        path = path or settings.SIMILARITY_INDEX_PATH
+        self._merge()
+        _save_npz(
+            path, publications=np.array(self.publications, dtype=str),
+            n_features=np.array(self.n_features), **self.arrays._asdict()
+        )
+        self.dirty = False
+        self.file_version = _file_version(path)
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """Load a saved index; returns False if there is none at `path`"""
+        path = path or settings.SIMILARITY_INDEX_PATH
+        if not os.path.exists(path):
+            return False
+        version = _file_version(path)
+        with np.load(path, allow_pickle=False) as saved:
+            n_features = int(saved['n_features'])
+            publications = saved['publications'].tolist()
+            arrays = SimilarityArrays(*(saved[field] for field in SimilarityArrays._fields))
+        publication_ids = {name: i for i, name in enumerate(publications)}
+        # Names before arrays, as in ConceptIndex.load
+        with self._lock:
+            self.n_features = n_features
+            self.publications, self.publication_ids = publications, publication_ids
+            self.arrays = arrays
+            self._pending = {}
+            self.dirty = False
+            self.file_version = version
+        self.ready = True
+        logger.info(f"Similarity index loaded from {path}: {len(self.publications)} publications")
+        return True
+
+    def reload_if_changed(self, path: Optional[str] = None) -> bool:
+        """Load the saved index again if the file changed since this process last loaded or saved it"""
+        path = path or settings.SIMILARITY_INDEX_PATH
+        if not os.path.exists(path) or _file_version(path) == self.file_version:
+            return False
+        return self.load(path)
+
+# Singleton instance
+similarity_index = SimilarityIndex()
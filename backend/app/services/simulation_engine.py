@@ -1,10 +1,20 @@
 from typing import Dict, List, Any
-import numpy as np
-from app.services.knowledge_graph import kg_service
+from app.dependencies import service
+from app.services.cache import result_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+RISK_AREAS = (
+    'bone_health',
+    'muscle_health',
+    'cardiovascular_health',
+    'radiation_exposure',
+    'psychological_health',
+    'immune_function'
+)
+RISK_CAP = 0.95
+
 class MissionSimulator:
     def __init__(self):
         self.risk_factors = {
@@ -22,10 +32,28 @@ class MissionSimulator:
             'isolation': {
                 'psychological_stress': 0.8,
                 'sleep_quality': 0.6,
-                'team_cohesion': 0.5
+                'team_cohesion': 0.5,
+                # Psychological health risk per year of isolation
+                'psychological_base': 0.5
             }
         }
+        self.destination_factors = {
+            'moon': {'gravity': 0.16, 'radiation': 0.4},
+            'mars': {'gravity': 0.38, 'radiation': 0.7},
+            'deep_space': {'gravity': 0.0, 'radiation': 1.0}
+        }
+        self.destinations = {
+            'moon': {'name': 'Lunar Base', 'transit_days': 3},
+            'mars': {'name': 'Mars Colony', 'transit_days': 210},
+            'deep_space': {'name': 'Deep Space Mission', 'transit_days': 365}
+        }
+        self.shielding_factors = {
+            'standard': 1.0,
+            'enhanced': 0.5
+        }
     
+    # Relevant studies come from the graph, so results share the graph namespace
+    @result_cache.cached("graph", should_cache=lambda result: 'error' not in result)
     def simulate_mission(self, mission_params: Dict) -> Dict:
         """Simulate mission impacts based on parameters"""
         try:
@@ -76,30 +104,24 @@ class MissionSimulator:
         # Duration multiplier
         duration_factor = min(duration / 365, 2.0)  # Cap at 2x
         
-        # Destination factors
-        destination_factors = {
-            'moon': {'gravity': 0.16, 'radiation': 0.4},
-            'mars': {'gravity': 0.38, 'radiation': 0.7},
-            'deep_space': {'gravity': 0.0, 'radiation': 1.0}
-        }
-        
-        dest = destination_factors.get(destination, destination_factors['mars'])
+        dest = self.destination_factors.get(destination, self.destination_factors['mars'])
+        microgravity = self.risk_factors['microgravity']
+        isolation = self.risk_factors['isolation']
         
         # Calculate risks
         if not artificial_gravity:
-            base_risks['bone_health'] = 0.8 * dest['gravity'] * duration_factor
-            base_risks['muscle_health'] = 0.7 * dest['gravity'] * duration_factor
+            base_risks['bone_health'] = microgravity['bone_density'] * dest['gravity'] * duration_factor
+            base_risks['muscle_health'] = microgravity['muscle_mass'] * dest['gravity'] * duration_factor
         
-        base_risks['cardiovascular_health'] = 0.6 * (1 - dest['gravity']) * duration_factor
+        base_risks['cardiovascular_health'] = microgravity['cardiovascular'] * (1 - dest['gravity']) * duration_factor
         base_risks['radiation_exposure'] = dest['radiation'] * duration_factor
-        base_risks['psychological_health'] = 0.5 * duration_factor
-        base_risks['immune_function'] = 0.4 * duration_factor
+        base_risks['psychological_health'] = isolation['psychological_base'] * duration_factor
+        base_risks['immune_function'] = microgravity['immune_function'] * duration_factor
         
         # Apply shielding reduction
-        if shielding == 'enhanced':
-            base_risks['radiation_exposure'] *= 0.5
+        base_risks['radiation_exposure'] *= self.shielding_factors.get(shielding, 1.0)
         
-        return {k: min(v, 0.95) for k, v in base_risks.items()}  # Cap at 95%
+        return {k: min(v, RISK_CAP) for k, v in base_risks.items()}  # Cap at 95%
     
     def _get_relevant_studies(self, risks: Dict) -> List[Dict]:
         """Get relevant studies from knowledge graph based on highest risks"""
@@ -117,13 +139,16 @@ class MissionSimulator:
             }
             
             concept = concept_map.get(risk_area, risk_area)
-            studies = kg_service.get_connected_concepts(concept, depth=1)
-            if studies:
-                relevant_studies.append({
-                    'risk_area': risk_area,
-                    'concept': concept,
-                    'studies_count': len(studies.get('nodes', []))
-                })
+            concept_index = service('concept_index')
+            if concept_index.ready:
+                studies_count = concept_index.study_count(concept)
+            else:
+                studies_count = len(service('kg_service').get_connected_concepts(concept, depth=1).get('nodes', []))
+            relevant_studies.append({
+                'risk_area': risk_area,
+                'concept': concept,
+                'studies_count': studies_count
+            })
         
         return relevant_studies
     
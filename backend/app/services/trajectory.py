@@ -0,0 +1,227 @@
+from typing import Dict, Optional
+import json
+import os
+import uuid
+import numpy as np
+from app.config import settings
+from app.services.batch_simulation import BatchRiskEngine, batch_risk_engine, risk_kernel
+from app.services.metrics import SIMULATION_SECONDS
+from app.services.simulation_engine import RISK_AREAS, RISK_CAP
+import logging
+
+logger = logging.getLogger(__name__)
+
+TRANSIT, SURFACE = 0, 1
+PHASE_NAMES = ('transit', 'surface')
+
+# Parameters that must match for a checkpoint to be resumed
+RESUME_KEYS = ('destination', 'artificial_gravity', 'radiation_shielding', 'crew_size', 'seed', 'risk_threshold')
+
+class TrajectoryState:
+    """Day-by-day risk state for a crew; one float32 row per mission day.
+
+    `mean` and `fraction_over` are (days, risk areas) crew aggregates,
+    `crew_risk` is the current cumulative risk per crew member and
+    `first_crossing` the day each member first exceeded the threshold (-1 if never).
+    """
+
+    def __init__(self, params: Dict, days_capacity: int, crew_size: int):
+        self.params = params
+        self.days = 0
+        self.mean = np.zeros((days_capacity, len(RISK_AREAS)), dtype=np.float32)
+        self.fraction_over = np.zeros((days_capacity, len(RISK_AREAS)), dtype=np.float32)
+        self.crew_risk = np.zeros((crew_size, len(RISK_AREAS)), dtype=np.float32)
+        self.first_crossing = np.full((crew_size, len(RISK_AREAS)), -1, dtype=np.int32)
+
+    def grow(self, days_capacity: int):
+        """Reallocate the per-day arrays to hold `days_capacity` rows, keeping computed days"""
+        if days_capacity <= self.mean.shape[0]:
+            return
+        for name in ('mean', 'fraction_over'):
+            old = getattr(self, name)
+            new = np.zeros((days_capacity, old.shape[1]), dtype=np.float32)
+            new[:self.days] = old[:self.days]
+            setattr(self, name, new)
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            params=np.array(json.dumps(self.params)),
+            days=np.array(self.days),
+            mean=self.mean[:self.days],
+            fraction_over=self.fraction_over[:self.days],
+            crew_risk=self.crew_risk,
+            first_crossing=self.first_crossing
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TrajectoryState":
+        with np.load(path) as data:
+            params = json.loads(str(data['params']))
+            state = cls(params, int(data['days']), data['crew_risk'].shape[0])
+            state.days = int(data['days'])
+            state.mean[:] = data['mean']
+            state.fraction_over[:] = data['fraction_over']
+            state.crew_risk[:] = data['crew_risk']
+            state.first_crossing[:] = data['first_crossing']
+        return state
+
+class TrajectorySimulator:
+    """Evolves mission risk day by day through transit and surface phases.
+
+    The outbound transit uses the deep-space environment for the destination's
+    transit_days, the remaining days use the destination environment. Each
+    crew member carries a seeded susceptibility multiplier per risk area.
+    Because a longer mission only appends surface days, a saved checkpoint can
+    be extended by computing just the additional days. Only the newest
+    max_checkpoints files are kept.
+    """
+
+    def __init__(self, engine: BatchRiskEngine, checkpoint_dir: Optional[str] = None,
+                 max_checkpoints: Optional[int] = None):
+        self.engine = engine
+        self.checkpoint_dir = checkpoint_dir or settings.TRAJECTORY_CHECKPOINT_DIR
+        self.max_checkpoints = max_checkpoints or settings.TRAJECTORY_MAX_CHECKPOINTS
+
+    def phase_schedule(self, destination: str, duration_days: int) -> np.ndarray:
+        simulator = self.engine.simulator
+        schedule = np.full(duration_days, SURFACE, dtype=np.int8)
+        if destination == 'deep_space':
+            schedule[:] = TRANSIT
+        else:
+            transit_days = simulator.destinations.get(destination, simulator.destinations['mars'])['transit_days']
+            schedule[:transit_days] = TRANSIT
+        return schedule
+
+    def daily_rates(self, destination: str, artificial_gravity: bool, shielding: str) -> np.ndarray:
+        """Per-day risk increments, one row per phase"""
+        simulator = self.engine.simulator
+        transit = simulator.destination_factors['deep_space']
+        surface = simulator.destination_factors.get(destination, simulator.destination_factors['mars'])
+        return risk_kernel(
+            1 / 365,
+            [transit['gravity'], surface['gravity']],
+            [transit['radiation'], surface['radiation']],
+            artificial_gravity,
+            simulator.shielding_factors.get(shielding, 1.0),
+            self.engine.coefficients()
+        ).astype(np.float32)
+
+    def susceptibility(self, params: Dict) -> np.ndarray:
+        if params['crew_size'] == 1:
+            return np.ones((1, len(RISK_AREAS)), dtype=np.float32)
+        rng = np.random.default_rng(params['seed'])
+        return rng.lognormal(0.0, 0.2, (params['crew_size'], len(RISK_AREAS))).astype(np.float32)
+
+    @SIMULATION_SECONDS.time('trajectory')
+    def simulate(self, mission_params: Dict, crew_size: int = 1, seed: int = 0, risk_threshold: float = 0.5,
+                 state: Optional[TrajectoryState] = None) -> TrajectoryState:
+        """Advance `state` (or a fresh one) until it covers duration_days"""
+        duration_days = mission_params.get('duration_days', 365)
+        if not 1 <= duration_days <= settings.TRAJECTORY_MAX_DAYS:
+            raise ValueError(f"duration_days must be between 1 and {settings.TRAJECTORY_MAX_DAYS}")
+        if not 1 <= crew_size <= settings.TRAJECTORY_MAX_CREW:
+            raise ValueError(f"crew_size must be between 1 and {settings.TRAJECTORY_MAX_CREW}")
+        params = {
+            'destination': mission_params.get('destination', 'mars'),
+            'artificial_gravity': bool(mission_params.get('artificial_gravity', False)),
+            'radiation_shielding': mission_params.get('radiation_shielding', 'standard'),
+            'crew_size': crew_size,
+            'seed': seed,
+            'risk_threshold': risk_threshold
+        }
+
+        if state is None:
+            state = TrajectoryState(params, duration_days, crew_size)
+        elif any(state.params[key] != params[key] for key in RESUME_KEYS):
+            raise ValueError("Checkpoint was recorded with different mission parameters")
+        state.grow(duration_days)
+
+        schedule = self.phase_schedule(params['destination'], duration_days)
+        rates = self.daily_rates(params['destination'], params['artificial_gravity'], params['radiation_shielding'])
+        crew_rates = rates[:, None, :] * self.susceptibility(params)[None, :, :]
+        over = np.empty(state.crew_risk.shape, dtype=bool)
+
+        for day in range(state.days, duration_days):
+            state.crew_risk += crew_rates[schedule[day]]
+            np.minimum(state.crew_risk, RISK_CAP, out=state.crew_risk)
+            np.greater_equal(state.crew_risk, risk_threshold, out=over)
+            state.first_crossing[over & (state.first_crossing < 0)] = day
+            state.mean[day] = state.crew_risk.mean(axis=0)
+            state.fraction_over[day] = over.mean(axis=0)
+        if duration_days > state.days:
+            logger.info(f"Trajectory advanced from day {state.days} to {duration_days}")
+            state.days = duration_days
+        return state
+
+    def summarize(self, state: TrajectoryState, duration_days: int, sample_every: int = 1) -> Dict:
+        """Report per-area crossing days and a downsampled daily trajectory"""
+        days = min(duration_days, state.days)
+        threshold = state.params['risk_threshold']
+        schedule = self.phase_schedule(state.params['destination'], days)
+        boundaries = np.flatnonzero(np.diff(schedule)) + 1
+
+        crossings = {}
+        earliest = {}
+        for column, area in enumerate(RISK_AREAS):
+            crossed = np.flatnonzero(state.mean[:days, column] >= threshold)
+            crossings[area] = int(crossed[0]) if crossed.size else None
+            crew_days = state.first_crossing[:, column]
+            crew_days = crew_days[(crew_days >= 0) & (crew_days < days)]
+            earliest[area] = int(crew_days.min()) if crew_days.size else None
+
+        sampled_days = np.arange(0, days, max(sample_every, 1))
+        return {
+            'duration_days': days,
+            'crew_size': state.crew_risk.shape[0],
+            'risk_threshold': threshold,
+            'phases': [
+                {'phase': PHASE_NAMES[schedule[start]], 'start_day': int(start), 'end_day': int(end)}
+                for start, end in zip(np.concatenate([[0], boundaries]), np.concatenate([boundaries, [days]]))
+            ],
+            'threshold_crossing_day': crossings,
+            'earliest_crew_crossing_day': earliest,
+            'trajectory': {
+                'day': sampled_days.tolist(),
+                **{area: state.mean[sampled_days, column].tolist() for column, area in enumerate(RISK_AREAS)}
+            },
+            'fraction_over_threshold': {
+                area: float(state.fraction_over[days - 1, column]) for column, area in enumerate(RISK_AREAS)
+            }
+        }
+
+    def checkpoint_path(self, checkpoint_id: str) -> str:
+        if not checkpoint_id.isalnum():
+            raise ValueError("Invalid checkpoint id")
+        return os.path.join(self.checkpoint_dir, f"{checkpoint_id}.npz")
+
+    def save_checkpoint(self, state: TrajectoryState) -> str:
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        checkpoint_id = uuid.uuid4().hex
+        state.save(self.checkpoint_path(checkpoint_id))
+        self.prune_checkpoints()
+        return checkpoint_id
+
+    def prune_checkpoints(self) -> int:
+        """Delete the oldest checkpoints beyond max_checkpoints; returns how many were removed"""
+        paths = []
+        with os.scandir(self.checkpoint_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.npz') and entry.is_file():
+                    paths.append((entry.stat().st_mtime_ns, entry.path))
+        stale = sorted(paths)[:max(len(paths) - self.max_checkpoints, 0)]
+        for _, path in stale:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return len(stale)
+
+    def load_checkpoint(self, checkpoint_id: str) -> TrajectoryState:
+        path = self.checkpoint_path(checkpoint_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Checkpoint {checkpoint_id} not found")
+        return TrajectoryState.load(path)
+
+# Singleton instance
+trajectory_simulator = TrajectorySimulator(batch_risk_engine)
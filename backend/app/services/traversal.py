@@ -0,0 +1,140 @@
+from typing import Any, Dict, List, Optional
+import base64
+import binascii
+import json
+from app.config import settings
+from app.services.cache import stable_hash
+import logging
+
+logger = logging.getLogger(__name__)
+
+START_NODE_QUERY = """
+MATCH (start:Concept {name: $concept_name})
+RETURN elementId(start) AS id, start.name AS name, labels(start)[0] AS type
+"""
+
+# One hop of a breadth-first expansion. Each frontier node scans at most
+# $scan_limit unvisited neighbours and keeps the $fanout strongest, so hub
+# concepts cost the same as leaf concepts.
+EXPAND_QUERY = """
+UNWIND $frontier AS node_id
+MATCH (n) WHERE elementId(n) = node_id
+CALL {
+    WITH n
+    MATCH (n)-[r]-(m)
+    WHERE NOT elementId(m) IN $visited AND NOT m:GraphCount
+    WITH r, m LIMIT $scan_limit
+    RETURN r, m
+    ORDER BY coalesce(r.strength, 1.0) DESC
+    LIMIT $fanout
+}
+RETURN node_id AS source,
+       elementId(m) AS id,
+       coalesce(m.name, m.title, m.id) AS name,
+       labels(m)[0] AS type,
+       type(r) AS rel_type,
+       coalesce(r.strength, 1.0) AS strength,
+       elementId(startNode(r)) = node_id AS outgoing
+"""
+
+class InvalidCursor(ValueError):
+    pass
+
+class NeighborhoodTraversal:
+    """Bounded breadth-first expansion state, independent of the driver flavour.
+
+    Nodes are deduplicated as each hop is absorbed. A node's score is the best
+    product of `r.strength` along any path that reached it in its first hop.
+    """
+
+    def __init__(self, depth: int, fanout: int, max_nodes: Optional[int] = None):
+        self.depth = min(max(depth, 1), settings.TRAVERSAL_MAX_DEPTH)
+        self.fanout = min(max(fanout, 1), settings.TRAVERSAL_MAX_FANOUT)
+        self.max_nodes = max_nodes or settings.TRAVERSAL_MAX_NODES
+        self.scan_limit = self.fanout * settings.TRAVERSAL_SCAN_FACTOR
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.relationships: List[Dict[str, Any]] = []
+        self.frontier: List[str] = []
+
+    def start(self, record: Optional[Dict]) -> bool:
+        if not record:
+            return False
+        self.nodes[record['id']] = {**record, 'hop': 0, 'score': 1.0}
+        self.frontier = [record['id']]
+        return True
+
+    def hop_params(self) -> Dict[str, Any]:
+        return {
+            'frontier': self.frontier,
+            'visited': list(self.nodes),
+            'fanout': self.fanout,
+            'scan_limit': self.scan_limit
+        }
+
+    def absorb(self, hop: int, rows: List[Dict]):
+        """Merge one hop of expansion rows and compute the next frontier"""
+        found: Dict[str, Dict[str, Any]] = {}
+        edges: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            score = self.nodes[row['source']]['score'] * row['strength']
+            current = found.get(row['id'])
+            if current is None or score > current['score']:
+                found[row['id']] = {'id': row['id'], 'name': row['name'], 'type': row['type'],
+                                    'hop': hop, 'score': score}
+                source, target = (row['source'], row['id']) if row['outgoing'] else (row['id'], row['source'])
+                edges[row['id']] = {'source': source, 'target': target, 'type': row['rel_type'],
+                                    'strength': row['strength']}
+
+        room = self.max_nodes - len(self.nodes)
+        kept = sorted(found.values(), key=lambda node: -node['score'])[:max(room, 0)]
+        for node in kept:
+            self.nodes[node['id']] = node
+            self.relationships.append(edges[node['id']])
+        self.frontier = [node['id'] for node in kept]
+
+    def expanding(self, hop: int) -> bool:
+        return hop <= self.depth and bool(self.frontier) and len(self.nodes) < self.max_nodes
+
+    def result(self) -> Dict[str, Any]:
+        ranked = sorted(self.nodes.values(), key=lambda node: (node['hop'] > 0, -node['score'], node['hop'], node['id']))
+        return {'nodes': ranked, 'relationships': self.relationships}
+
+def encode_cursor(offset: int, key: str) -> str:
+    payload = json.dumps({'o': offset, 'k': key}).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+def decode_cursor(cursor: str, key: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        offset = int(payload['o'])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+    if payload.get('k') != key or offset < 0:
+        raise InvalidCursor("Cursor does not belong to this query")
+    return offset
+
+def paginate(neighborhood: Dict[str, Any], params: Dict[str, Any], limit: int,
+             cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Slice a ranked neighborhood; cursors are bound to the query parameters"""
+    key = stable_hash(params)[:16]
+    offset = decode_cursor(cursor, key) if cursor else 0
+    limit = min(max(limit, 1), settings.TRAVERSAL_MAX_PAGE_SIZE)
+    page = neighborhood['nodes'][offset:offset + limit]
+    page_ids = {node['id'] for node in page}
+    end = offset + len(page)
+    return {
+        **params,
+        'total_nodes': len(neighborhood['nodes']),
+        'nodes': page,
+        'relationships': [rel for rel in neighborhood['relationships']
+                          if rel['source'] in page_ids or rel['target'] in page_ids],
+        'next_cursor': encode_cursor(end, key) if end < len(neighborhood['nodes']) else None
+    }
+
+def as_connected_concepts(neighborhood: Dict[str, Any]) -> Dict[str, List[Dict]]:
+    """Legacy get_connected_concepts shape"""
+    return {
+        'nodes': [{'id': n['id'], 'name': n['name'], 'type': n['type']} for n in neighborhood['nodes']],
+        'relationships': [{'source': r['source'], 'target': r['target'], 'type': r['type']}
+                          for r in neighborhood['relationships']]
+    }
@@ -0,0 +1,187 @@
+"""Background job worker: python -m app.worker --concurrency N"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+import argparse
+import asyncio
+import functools
+import logging
+import signal
+from app.config import settings
+from app.services.jobs import JobQueue, job_queue
+
+logger = logging.getLogger(__name__)
+
+Report = Callable[[Dict[str, Any]], None]
+
+async def run_ingest(job, records, report: Report, **pipeline_options) -> Dict:
+    """Run one ingest pipeline, reporting per-stage metrics as progress"""
+    from app.services.concept_extractor import concept_extractor
+    from app.services.ingest_pipeline import IngestPipeline, ingest_watermarks
+    from app.services.knowledge_graph import async_kg_service
+
+    pipeline = IngestPipeline(async_kg_service, functools.partial(concept_extractor.extract, limit=5),
+                              watermarks=ingest_watermarks, **pipeline_options)
+    task = asyncio.create_task(pipeline.run(job, records))
+    try:
+        while not task.done():
+            report({'stages': job.to_dict()['stages'], 'changes': dict(job.changes)})
+            await asyncio.wait({task}, timeout=settings.JOB_PROGRESS_INTERVAL)
+        await task
+    finally:
+        task.cancel()  # no-op unless this job itself was cancelled
+    if job.status == 'failed':
+        raise RuntimeError(job.error)
+    return job.to_dict()
+
+async def run_pubspace_ingest(params: Dict, report: Report) -> Dict:
+    from app.data.nasa_connector import nasa_connector
+    from app.services.concept_index import concept_index
+    from app.services.ingest_pipeline import IngestJob
+    from app.services.similarity_index import similarity_index
+
+    # The API reloads the saved concept and similarity indexes when they change; keep those files
+    # current. An index that was never built ignores new records (build it with app.manage first).
+    if not concept_index.ready:
+        concept_index.load()
+    if not similarity_index.ready:
+        similarity_index.load()
+    records = nasa_connector.iter_pubspace_publications(params['query'], params['max_results'])
+    result = await run_ingest(IngestJob('pubspace', params), records, report, on_batch=concept_index.add_edges,
+                              on_records=similarity_index.add_publications)
+    if concept_index.ready and concept_index.dirty:
+        await asyncio.to_thread(concept_index.save)
+    if similarity_index.ready and similarity_index.dirty:
+        await asyncio.to_thread(similarity_index.save)
+    return result
+
+async def run_genelab_ingest(params: Dict, report: Report) -> Dict:
+    from app.data.nasa_connector import nasa_connector
+    from app.services.ingest_pipeline import IngestJob
+
+    records = nasa_connector.iter_genelab_data(params['dataset_type'], params['max_results'])
+    return await run_ingest(IngestJob('genelab', params), records, report, record_kind='datasets')
+
+async def run_mission(params: Dict, report: Report) -> Dict:
+    from app.services.simulation_engine import mission_simulator
+    result = await asyncio.to_thread(mission_simulator.simulate_mission, params)
+    # The simulator reports failures as a result; a completed job would be reused for JOB_RESULT_TTL
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    return result
+
+async def run_monte_carlo(params: Dict, report: Report) -> Dict:
+    from app.services.monte_carlo import monte_carlo_simulator
+    mission_params = {k: v for k, v in params.items() if k not in ('trials', 'seed', 'distributions')}
+    return await asyncio.to_thread(
+        monte_carlo_simulator.simulate,
+        mission_params, params['trials'], params.get('seed'), params.get('distributions')
+    )
+
+HANDLERS: Dict[str, Callable[[Dict, Report], Awaitable[Any]]] = {
+    'ingest_pubspace': run_pubspace_ingest,
+    'ingest_genelab': run_genelab_ingest,
+    'mission': run_mission,
+    'monte_carlo': run_monte_carlo
+}
+
+class JobWorker:
+    """Runs up to `concurrency` queued jobs at a time in one event loop.
+
+    Each job runs as a task next to a watcher that renews its lease and
+    polls its status; a cancel request from the API cancels the task. Work already handed to a
+    thread finishes in the background but its result is discarded.
+    """
+
+    def __init__(self, queue: JobQueue, handlers: Optional[Dict] = None, concurrency: Optional[int] = None):
+        self.queue = queue
+        self.handlers = handlers or HANDLERS
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.stopping = asyncio.Event()
+
+    async def run(self):
+        logger.info(f"Job worker started with concurrency {self.concurrency}")
+        await asyncio.gather(*[self._slot() for _ in range(self.concurrency)])
+        logger.info("Job worker stopped")
+
+    def stop(self):
+        self.stopping.set()
+
+    async def _slot(self):
+        while not self.stopping.is_set():
+            job_id = await asyncio.to_thread(self.queue.next_job, 1.0)
+            if job_id is not None:
+                await self.execute(job_id)
+
+    async def execute(self, job_id: str) -> Optional[str]:
+        """Run one dequeued job to completion; returns its final status"""
+        job = self.queue.claim(job_id)
+        if job is None:
+            return None
+        handler = self.handlers[job['type']]
+        task = asyncio.create_task(handler(job['params'], functools.partial(self.queue.report, job_id)))
+        watcher = asyncio.create_task(self._watch(job_id, task))
+        try:
+            result = await task
+            self.queue.finish(job_id, 'completed', result=result)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            self.queue.finish(job_id, 'cancelled')
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.queue.finish(job_id, 'failed', error=str(e))
+        finally:
+            watcher.cancel()
+        return self.queue.status(job_id)
+
+    async def _watch(self, job_id: str, task: asyncio.Task):
+        while not task.done():
+            await asyncio.sleep(settings.JOB_PROGRESS_INTERVAL)
+            self.queue.renew(job_id)
+            if self.queue.status(job_id) == 'cancelling':
+                task.cancel()
+                return
+
+async def start_metrics_server(port: int):
+    """Serve this process's metrics (ingest throughput, graph and fetch timings) for scraping"""
+    from aiohttp import web
+    from app.services.metrics import metrics
+
+    async def handle(request):
+        return web.Response(body=metrics.render().encode(), headers={'Content-Type': metrics.CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    logger.info(f"Worker metrics on :{port}/metrics")
+    return runner
+
+async def serve(concurrency: int, metrics_port: int = 0):
+    worker = JobWorker(job_queue, concurrency=concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    metrics_runner = await start_metrics_server(metrics_port) if metrics_port else None
+    try:
+        await worker.run()
+    finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        from app.data.nasa_connector import nasa_connector
+        from app.services.knowledge_graph import async_kg_service
+        from app.services.monte_carlo import monte_carlo_simulator
+        await async_kg_service.close()
+        await nasa_connector.close()
+        monte_carlo_simulator.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.worker", description="Bio-Synapse background job worker")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    parser.add_argument("--metrics-port", type=int, default=settings.WORKER_METRICS_PORT)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.concurrency, args.metrics_port))
+
+if __name__ == "__main__":
+    main()
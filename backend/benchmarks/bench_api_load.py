@@ -0,0 +1,89 @@
+"""Load test: concurrent clients against a mix of API routes.
+
+Drives the ASGI app in-process: graph routes use the async driver stand-in
+with a simulated round trip, and mission simulations read relevant studies
+from a small in-memory concept index. Every request has unique parameters,
+so results measure the uncached paths.
+
+    python -m benchmarks.bench_api_load --requests 2000 --clients 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Callable, Dict, List
+
+import httpx
+import numpy as np
+
+from app.dependencies import get_async_kg_service
+from app.main import app
+from app.services.knowledge_graph import AsyncKnowledgeGraphService
+from benchmarks.bench_concurrent_concepts import respond
+from benchmarks.bench_simulation import ensure_concept_index
+from tests.fakes import FakeAsyncDriver
+
+def workload(run_id: int) -> Dict[str, Callable[[httpx.AsyncClient, int], object]]:
+    return {
+        'health': lambda client, i: client.get("/health"),
+        'mission': lambda client, i: client.post("/simulation/mission", json={
+            'duration_days': 30 + i, 'destination': ('mars', 'moon', 'iss')[i % 3], 'crew_age': run_id % 1000
+        }),
+        'batch': lambda client, i: client.post("/simulation/batch", json={
+            'duration_days': [30 + i + n for n in range(100)], 'destination': ["mars", "moon"] * 50
+        }),
+        'concepts': lambda client, i: client.get(f"/data/graph/concepts/load-{run_id}-{i}", params={'depth': 1})
+    }
+
+async def fire(requests: int, clients: int, run_id: int) -> Dict:
+    routes = workload(run_id)
+    names = list(routes)
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        for i in counter:
+            name = names[i % len(names)]
+            start = time.perf_counter()
+            response = await routes[name](client, i)
+            latencies[name].append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[client_loop(client) for _ in range(clients)])
+        elapsed = time.perf_counter() - start
+
+    return {
+        'seconds': elapsed,
+        'requests_per_second': requests / elapsed,
+        'errors': errors,
+        'routes': {
+            name: {
+                'requests': len(samples),
+                'p50_ms': float(np.percentile(samples, 50) * 1000),
+                'p95_ms': float(np.percentile(samples, 95) * 1000)
+            }
+            for name, samples in latencies.items() if samples
+        }
+    }
+
+def run(requests: int = 2000, clients: int = 50, latency_ms: float = 5.0) -> Dict:
+    ensure_concept_index()
+    service = AsyncKnowledgeGraphService(driver=FakeAsyncDriver(respond, latency=latency_ms / 1000))
+    app.dependency_overrides[get_async_kg_service] = lambda: service
+    try:
+        result = asyncio.run(fire(requests, clients, time.time_ns()))
+    finally:
+        app.dependency_overrides.pop(get_async_kg_service)
+    return {'requests': requests, 'clients': clients, 'latency_ms': latency_ms, **result}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.clients, args.latency_ms), indent=2))
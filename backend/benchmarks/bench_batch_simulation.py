@@ -0,0 +1,52 @@
+"""Time the vectorized batch risk engine against the scalar _calculate_risks loop.
+
+    python -m benchmarks.bench_batch_simulation --scenarios 100000
+"""
+import argparse
+import json
+import time
+from typing import Dict
+
+import numpy as np
+
+from app.services.batch_simulation import batch_risk_engine
+from app.services.simulation_engine import mission_simulator
+
+def make_scenarios(scenarios: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(1, 1100, scenarios),
+        rng.choice(["moon", "mars", "deep_space"], scenarios),
+        rng.random(scenarios) < 0.5,
+        rng.choice(["standard", "enhanced"], scenarios)
+    )
+
+def run(scenarios: int = 100_000, scalar_sample: int = 10_000) -> Dict:
+    durations, destinations, gravity, shielding = make_scenarios(scenarios)
+
+    start = time.perf_counter()
+    batch_risk_engine.calculate_risks(durations, destinations, gravity, shielding)
+    batch_seconds = time.perf_counter() - start
+
+    sample = min(scalar_sample, scenarios)
+    rows = list(zip(durations[:sample].tolist(), destinations[:sample].tolist(),
+                    gravity[:sample].tolist(), shielding[:sample].tolist()))
+    start = time.perf_counter()
+    for row in rows:
+        mission_simulator._calculate_risks(*row)
+    scalar_seconds = (time.perf_counter() - start) * scenarios / sample
+
+    return {
+        'scenarios': scenarios,
+        'batch_seconds': batch_seconds,
+        'batch_scenarios_per_second': scenarios / batch_seconds,
+        'scalar_seconds_extrapolated': scalar_seconds,
+        'speedup': scalar_seconds / batch_seconds,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=100_000)
+    parser.add_argument("--scalar-sample", type=int, default=10_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.scenarios, args.scalar_sample), indent=2))
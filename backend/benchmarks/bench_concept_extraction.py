@@ -0,0 +1,81 @@
+"""Measure concept automaton build and match cost as the vocabulary grows.
+
+Build time should grow linearly with the number of terms while per-abstract
+matching cost stays flat. run_default() times the API helper
+extract_concepts_from_text with the shipped vocabulary.
+
+    python -m benchmarks.bench_concept_extraction --sizes 1000 10000 50000
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+from app.services.concept_extractor import ConceptExtractor, DEFAULT_VOCABULARY
+
+def synthetic_vocabulary(size: int, seed: int = 0) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(max(size // 2, 100))]
+    vocabulary = dict(DEFAULT_VOCABULARY)
+    while len(vocabulary) < size:
+        concept = " ".join(rng.sample(words, rng.randint(1, 3)))
+        vocabulary[concept] = [" ".join(rng.sample(words, rng.randint(1, 4))) for _ in range(2)]
+    return vocabulary
+
+def synthetic_corpus(abstracts: int, vocabulary: Dict[str, List[str]], seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    filler = "the crew of the mission observed changes during long duration flight in".split()
+    terms = list(vocabulary)
+    corpus = []
+    for _ in range(abstracts):
+        words = [rng.choice(filler) for _ in range(180)]
+        for _ in range(10):
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        corpus.append(" ".join(words))
+    return corpus
+
+def run(sizes=(1000, 10_000, 50_000), abstracts: int = 2000) -> Dict:
+    results = []
+    for size in sizes:
+        vocabulary = synthetic_vocabulary(size)
+        start = time.perf_counter()
+        extractor = ConceptExtractor(vocabulary)
+        build_seconds = time.perf_counter() - start
+
+        corpus = synthetic_corpus(abstracts, vocabulary)
+        start = time.perf_counter()
+        extractor.extract_batch(corpus)
+        extract_seconds = time.perf_counter() - start
+        results.append({
+            'vocabulary_size': size,
+            'automaton_states': len(extractor.goto),
+            'build_seconds': build_seconds,
+            'build_microseconds_per_term': build_seconds / size * 1e6,
+            'abstracts_per_second': abstracts / extract_seconds,
+        })
+    return {'abstracts': abstracts, 'runs': results}
+
+def run_default(abstracts: int = 2000, repeats: int = 3) -> Dict:
+    from app.routes.data import extract_concepts_from_text
+
+    corpus = synthetic_corpus(abstracts, DEFAULT_VOCABULARY)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in corpus:
+            extract_concepts_from_text(text)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        'abstracts': abstracts,
+        'abstracts_per_second': abstracts / best,
+        'microseconds_per_abstract': best / abstracts * 1e6
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 50_000])
+    parser.add_argument("--abstracts", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.abstracts), indent=2))
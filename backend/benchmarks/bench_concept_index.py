@@ -0,0 +1,77 @@
+"""Measure concept index build, save/load and lookup cost against the graph round trip.
+
+    python -m benchmarks.bench_concept_index --publications 100000 --latency-ms 2
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+
+from app.services.concept_index import ConceptIndex
+from app.services.knowledge_graph import KnowledgeGraphService
+from app.services.traversal import START_NODE_QUERY
+from tests.fakes import FakeDriver
+
+def synthetic_edges(publications: int, concepts: int, per_publication: int = 5, seed: int = 0):
+    rng = random.Random(seed)
+    names = [f"concept-{i}" for i in range(concepts)]
+    for pub in range(publications):
+        for concept in rng.sample(names, per_publication):
+            yield f"pub-{pub}", concept
+
+def respond(query, params):
+    if query == START_NODE_QUERY:
+        return [{'id': params['concept_name'], 'name': params['concept_name'], 'type': 'Concept'}]
+    return []
+
+def run(publications: int = 100_000, concepts: int = 500, lookups: int = 1000, latency_ms: float = 2.0) -> Dict:
+    start = time.perf_counter()
+    index = ConceptIndex().build(synthetic_edges(publications, concepts))
+    build_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.npz")
+        start = time.perf_counter()
+        index.save(path)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        ConceptIndex().load(path)
+        load_seconds = time.perf_counter() - start
+
+    names = [f"concept-{i}" for i in range(concepts)]
+    start = time.perf_counter()
+    for i in range(lookups):
+        index.study_count(names[i % concepts])
+        index.related(names[i % concepts], 5)
+    index_seconds = time.perf_counter() - start
+
+    graph = KnowledgeGraphService(driver=FakeDriver(respond, latency=latency_ms / 1000))
+    graph_lookups = min(lookups, 100)
+    start = time.perf_counter()
+    for i in range(graph_lookups):
+        with graph.driver.session() as session:
+            session.execute_read(graph._traverse_neighborhood, names[i % concepts], 1, 100)
+    graph_seconds = (time.perf_counter() - start) / graph_lookups * lookups
+
+    return {
+        'publications': publications,
+        'concepts': concepts,
+        'build_seconds': build_seconds,
+        'save_seconds': save_seconds,
+        'load_seconds': load_seconds,
+        'memory': index.memory_report(),
+        'index_lookups_per_second': lookups / index_seconds,
+        'graph_lookups_per_second': lookups / graph_seconds,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publications", type=int, default=100_000)
+    parser.add_argument("--concepts", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.publications, args.concepts, args.lookups, args.latency_ms), indent=2))
@@ -0,0 +1,73 @@
+"""Load test: concurrent /data/graph/concepts/{name} requests.
+
+Drives the ASGI app in-process with the async driver stand-in (each query
+awaits a simulated round trip) and compares it with the old pattern of calling
+the sync driver from the event loop. With the async service, wall time stays
+near one round trip; with the blocking call, it grows with the request count.
+
+    python -m benchmarks.bench_concurrent_concepts --requests 100 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict
+
+import httpx
+
+from app.dependencies import get_async_kg_service
+from app.main import app
+from app.services.knowledge_graph import AsyncKnowledgeGraphService, KnowledgeGraphService
+from app.services.traversal import START_NODE_QUERY
+from tests.fakes import FakeAsyncDriver, FakeDriver
+
+def respond(query, params):
+    if query == START_NODE_QUERY:
+        return [{'id': params['concept_name'], 'name': params['concept_name'], 'type': 'Concept'}]
+    return []
+
+async def fire(requests: int, prefix: str) -> float:
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.get(f"/data/graph/concepts/{prefix}-{i}", params={'depth': 1}) for i in range(requests)
+        ])
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses)
+    return elapsed
+
+def run(requests: int = 100, latency_ms: float = 20.0) -> Dict:
+    latency = latency_ms / 1000
+    run_id = time.time_ns()
+    service = AsyncKnowledgeGraphService(driver=FakeAsyncDriver(respond, latency=latency))
+    try:
+        app.dependency_overrides[get_async_kg_service] = lambda: service
+        async_seconds = asyncio.run(fire(requests, f"async-{run_id}"))
+
+        # Previous behaviour: a sync driver call made directly inside the async route
+        blocking = KnowledgeGraphService(driver=FakeDriver(respond, latency=latency))
+
+        class BlockingAdapter:
+            async def get_connected_concepts(self, concept_name, depth=2):
+                return blocking.get_connected_concepts(concept_name, depth)
+
+        app.dependency_overrides[get_async_kg_service] = BlockingAdapter
+        blocking_seconds = asyncio.run(fire(requests, f"sync-{run_id}"))
+    finally:
+        app.dependency_overrides.pop(get_async_kg_service, None)
+
+    return {
+        'requests': requests,
+        'latency_ms': latency_ms,
+        'async_seconds': async_seconds,
+        'blocking_seconds': blocking_seconds,
+        'async_requests_per_second': requests / async_seconds,
+        'blocking_requests_per_second': requests / blocking_seconds,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.latency_ms), indent=2))
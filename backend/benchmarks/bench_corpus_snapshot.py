@@ -0,0 +1,55 @@
+"""Measure corpus snapshot append, incremental re-export and streaming re-extraction.
+
+    python -m benchmarks.bench_corpus_snapshot --publications 100000
+"""
+import argparse
+import json
+import tempfile
+import time
+from typing import Dict
+
+from app.services.concept_extractor import DEFAULT_VOCABULARY, concept_extractor
+from app.services.corpus_snapshot import CorpusSnapshot
+from benchmarks.bench_concept_extraction import synthetic_corpus
+
+def synthetic_publications(count: int):
+    abstracts = synthetic_corpus(min(count, 2000), DEFAULT_VOCABULARY)
+    for i in range(count):
+        yield {'id': f"pub-{i:08d}", 'title': f"Study {i}", 'abstract': abstracts[i % len(abstracts)],
+               'authors': ["A. Author", "B. Author"], 'source': 'pubspace'}
+
+def run(publications: int = 100_000, page_size: int = 5000) -> Dict:
+    with tempfile.TemporaryDirectory() as path:
+        snapshot = CorpusSnapshot(path)
+        pubs = list(synthetic_publications(publications))
+
+        start = time.perf_counter()
+        for offset in range(0, publications, page_size):
+            snapshot.append(pubs[offset:offset + page_size])
+        append_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        snapshot = CorpusSnapshot(path)
+        for offset in range(0, publications, page_size):
+            snapshot.append(pubs[offset:offset + page_size])
+        reexport_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extracted = sum(len(batch) for batch, _ in snapshot.reextract(concept_extractor, batch_size=page_size))
+        reextract_seconds = time.perf_counter() - start
+        stats = snapshot.stats()
+
+    return {
+        'publications': publications,
+        'append_rows_per_second': publications / append_seconds,
+        'unchanged_reexport_rows_per_second': publications / reexport_seconds,
+        'reextract_rows_per_second': extracted / reextract_seconds,
+        'column_bytes': stats['column_bytes'],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publications", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.publications, args.page_size), indent=2))
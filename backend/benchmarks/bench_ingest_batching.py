@@ -0,0 +1,77 @@
+"""Compare one-transaction-per-publication and batched publication ingest throughput.
+
+Runs against an in-process driver stand-in that simulates a fixed round trip
+per statement, or against the Neo4j instance from settings with --neo4j.
+
+    python -m benchmarks.bench_ingest_batching --publications 5000
+"""
+import argparse
+import json
+import time
+from typing import Dict
+
+from app.services.knowledge_graph import KnowledgeGraphService
+from tests.fakes import FakeDriver
+
+CONCEPTS = ["microgravity", "radiation", "bone loss", "muscle atrophy", "cardiovascular"]
+
+def make_corpus(publications: int, concepts_per_pub: int):
+    pubs = [
+        {
+            'id': f"bench-{i}", 'title': f"Benchmark publication {i}", 'abstract': "",
+            'authors': [], 'publication_date': None, 'journal': None, 'doi': None, 'source': 'benchmark'
+        }
+        for i in range(publications)
+    ]
+    concepts_by_pub = {pub['id']: CONCEPTS[:concepts_per_pub] for pub in pubs}
+    return pubs, concepts_by_pub
+
+def run(publications: int = 2000, concepts_per_pub: int = 5, latency_ms: float = 0.2,
+        batch_size: int = 500, use_neo4j: bool = False) -> Dict:
+    pubs, concepts_by_pub = make_corpus(publications, concepts_per_pub)
+
+    def make_service():
+        if use_neo4j:
+            return KnowledgeGraphService(batch_size=batch_size)
+        return KnowledgeGraphService(driver=FakeDriver(latency=latency_ms / 1000), batch_size=batch_size)
+
+    service = make_service()
+    start = time.perf_counter()
+    service.upsert_publications_batch(pubs, concepts_by_pub, batch_size=1)
+    per_row_seconds = time.perf_counter() - start
+    per_row_round_trips = len(service.driver.queries) if not use_neo4j else None
+    service.close()
+
+    service = make_service()
+    start = time.perf_counter()
+    service.upsert_publications_batch(pubs, concepts_by_pub)
+    batched_seconds = time.perf_counter() - start
+    batched_round_trips = len(service.driver.queries) if not use_neo4j else None
+    service.close()
+
+    return {
+        'publications': publications,
+        'batch_size': batch_size,
+        'per_row': {
+            'seconds': per_row_seconds,
+            'publications_per_second': publications / per_row_seconds,
+            'round_trips': per_row_round_trips,
+        },
+        'batched': {
+            'seconds': batched_seconds,
+            'publications_per_second': publications / batched_seconds,
+            'round_trips': batched_round_trips,
+        },
+        'speedup': per_row_seconds / batched_seconds,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publications", type=int, default=2000)
+    parser.add_argument("--concepts-per-pub", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.2, help="simulated round trip for the stand-in")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--neo4j", action="store_true", help="run against settings.NEO4J_URI instead")
+    args = parser.parse_args()
+    print(json.dumps(run(args.publications, args.concepts_per_pub, args.latency_ms,
+                         args.batch_size, args.neo4j), indent=2))
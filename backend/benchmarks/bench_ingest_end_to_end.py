@@ -0,0 +1,116 @@
+"""End-to-end ingest: stand-in PubSpace HTTP server -> connector -> pipeline -> graph.
+
+The server answers paged searches with synthetic abstracts after a fixed
+delay; the graph is the async driver stand-in with a simulated round trip
+per statement. A second pass over the same corpus measures the
+unchanged-record path (content hashes match, nothing is written).
+
+    python -m benchmarks.bench_ingest_end_to_end --publications 5000
+"""
+import argparse
+import asyncio
+import functools
+import json
+import time
+from typing import Dict
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.data.nasa_connector import NASADataConnector
+from app.services.concept_extractor import DEFAULT_VOCABULARY, concept_extractor
+from app.services.ingest_pipeline import IngestJob, IngestPipeline
+from app.services.knowledge_graph import CONTENT_HASHES_QUERY, AsyncKnowledgeGraphService
+from benchmarks.bench_concept_extraction import synthetic_corpus
+from tests.fakes import FakeAsyncDriver
+
+def make_app(publications: int, latency: float):
+    abstracts = synthetic_corpus(min(publications, 500), DEFAULT_VOCABULARY)
+    state = {'requests': 0}
+
+    async def pubspace(request):
+        page, size = int(request.query['page']), int(request.query['size'])
+        state['requests'] += 1
+        await asyncio.sleep(latency)
+        start = (page - 1) * size
+        results = [
+            {'id': f"pub-{i}", 'title': f"Publication {i}", 'abstract': abstracts[i % len(abstracts)],
+             'publication_date': f"2020-01-{1 + i % 28:02d}"}
+            for i in range(start, min(start + size, publications))
+        ]
+        return web.json_response({'results': results, 'total': publications})
+
+    app = web.Application()
+    app.router.add_get('/pubspace/', pubspace)
+    return app, state
+
+class GraphStandIn:
+    """Remembers written content hashes so a second pass sees unchanged records"""
+
+    def __init__(self):
+        self.hashes: Dict[str, str] = {}
+
+    def respond(self, query, params):
+        if query == CONTENT_HASHES_QUERY:
+            return [{'id': i, 'content_hash': self.hashes[i]} for i in params['ids'] if i in self.hashes]
+        for row in params.get('rows', ()):
+            self.hashes[row['id']] = row['content_hash']
+        return []
+
+async def ingest_pass(connector: NASADataConnector, kg: AsyncKnowledgeGraphService, publications: int,
+                      batch_size: int) -> Dict:
+    pipeline = IngestPipeline(kg, functools.partial(concept_extractor.extract, limit=5), batch_size=batch_size)
+    job = IngestJob('pubspace', {'query': 'benchmark', 'max_results': publications})
+    records = connector.iter_pubspace_publications('benchmark', publications)
+    start = time.perf_counter()
+    await pipeline.run(job, records)
+    seconds = time.perf_counter() - start
+    if job.status != 'completed':
+        raise RuntimeError(job.error)
+    return {
+        'seconds': seconds,
+        'records_per_second': publications / seconds,
+        'changes': dict(job.changes)
+    }
+
+async def run_async(publications: int, page_size: int, http_latency: float, graph_latency: float,
+                    batch_size: int) -> Dict:
+    app, state = make_app(publications, http_latency)
+    server = TestServer(app)
+    await server.start_server()
+    connector = NASADataConnector(
+        base_urls={'pubspace': str(server.make_url('/pubspace/'))},
+        page_size=page_size, concurrency=4, rate_limit=0, max_retries=0
+    )
+    graph = GraphStandIn()
+    driver = FakeAsyncDriver(graph.respond, latency=graph_latency)
+    kg = AsyncKnowledgeGraphService(driver)
+    try:
+        first = await ingest_pass(connector, kg, publications, batch_size)
+        requests, transactions = state['requests'], driver.transactions
+        second = await ingest_pass(connector, kg, publications, batch_size)
+    finally:
+        await connector.close()
+        await server.close()
+    return {
+        'publications': publications,
+        'http_requests': requests,
+        'graph_transactions': transactions,
+        'initial': first,
+        'unchanged': second
+    }
+
+def run(publications: int = 5000, page_size: int = 100, http_latency_ms: float = 5.0,
+        graph_latency_ms: float = 1.0, batch_size: int = 500) -> Dict:
+    return asyncio.run(run_async(publications, page_size, http_latency_ms / 1000, graph_latency_ms / 1000, batch_size))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publications", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--http-latency-ms", type=float, default=5.0)
+    parser.add_argument("--graph-latency-ms", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.publications, args.page_size, args.http_latency_ms,
+                         args.graph_latency_ms, args.batch_size), indent=2))
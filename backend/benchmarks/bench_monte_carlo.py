@@ -0,0 +1,39 @@
+"""Time seeded Monte Carlo mission runs across the process pool.
+
+    python -m benchmarks.bench_monte_carlo --trials 1000000
+"""
+import argparse
+import json
+import time
+from typing import Dict
+
+from app.services.batch_simulation import batch_risk_engine
+from app.services.monte_carlo import MonteCarloSimulator
+
+MISSION = {'duration_days': 900, 'destination': 'mars', 'radiation_shielding': 'enhanced'}
+
+def run(trials: int = 1_000_000, workers: int = 0, chunk_size: int = 0) -> Dict:
+    simulator = MonteCarloSimulator(batch_risk_engine, chunk_size=chunk_size or None, max_workers=workers or None)
+    try:
+        # Warm the pool so process start-up is not billed to the first run
+        simulator.simulate(MISSION, trials=2 * simulator.chunk_size, seed=0)
+        start = time.perf_counter()
+        simulator.simulate(MISSION, trials=trials, seed=42)
+        seconds = time.perf_counter() - start
+    finally:
+        simulator.close()
+    return {
+        'trials': trials,
+        'workers': simulator.max_workers,
+        'chunk_size': simulator.chunk_size,
+        'seconds': seconds,
+        'trials_per_second': trials / seconds,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=0, help="defaults to MONTE_CARLO_WORKERS")
+    parser.add_argument("--chunk-size", type=int, default=0, help="defaults to MONTE_CARLO_CHUNK_SIZE")
+    args = parser.parse_args()
+    print(json.dumps(run(args.trials, args.workers, args.chunk_size), indent=2))
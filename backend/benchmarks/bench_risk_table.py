@@ -0,0 +1,62 @@
+"""Compare what-if lookups from the precomputed risk table with the exact paths.
+
+A slider sweep asks for one risk curve (many durations, one destination,
+shielding and gravity setting); single points are what the scalar
+simulator handles. Reports the table build cost and its verified error.
+
+    python -m benchmarks.bench_risk_table --points 1000
+"""
+import argparse
+import json
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from app.services.batch_simulation import BatchRiskEngine
+from app.services.risk_table import RiskLookupTable
+from app.services.simulation_engine import MissionSimulator
+
+def per_call(func: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+def run(points: int = 1000, calls: int = 1000) -> Dict:
+    simulator = MissionSimulator()
+    engine = BatchRiskEngine(simulator)
+    table = RiskLookupTable(engine)
+
+    start = time.perf_counter()
+    table.snapshot()
+    build_seconds = time.perf_counter() - start
+
+    durations = np.linspace(0, 1000, points)
+    sweep_table = per_call(lambda: table.lookup(durations, 'mars', False, 'enhanced'), calls // 10)
+    sweep_exact = per_call(lambda: engine.calculate_risks(durations, 'mars', False, 'enhanced'), calls // 10)
+    point_table = per_call(lambda: table.lookup(365, 'mars', False, 'enhanced'), calls)
+    point_exact = per_call(lambda: simulator._calculate_risks(365, 'mars', False, 'enhanced'), calls)
+
+    return {
+        'build_seconds': build_seconds,
+        'table': table.info(),
+        'verification': table.verify(),
+        'sweep': {
+            'points': points,
+            'table_curves_per_second': 1 / sweep_table,
+            'exact_curves_per_second': 1 / sweep_exact,
+            'speedup': sweep_exact / sweep_table
+        },
+        'single_point': {
+            'table_lookups_per_second': 1 / point_table,
+            'scalar_lookups_per_second': 1 / point_exact
+        }
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.points, args.calls), indent=2))
@@ -0,0 +1,76 @@
+"""Build, incremental update and query cost of the similar-publication index.
+
+Synthetic abstracts draw from topic vocabularies with a Zipf-like word
+distribution, so postings lengths look like a real corpus. Batch queries go
+through blocked scoring; `single_queries_per_second` issues the same ids one
+call at a time. `update_seconds` covers hashing a batch of new publications
+and the merge (IDF and postings rebuild) on the next query.
+
+    python -m benchmarks.bench_similarity --publications 50000 --queries 1000
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+from app.services.similarity_index import SimilarityIndex
+
+def synthetic_publications(count: int, topics: int = 50, words: int = 20_000, seed: int = 0,
+                           prefix: str = "pub") -> List[Dict]:
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(words)]
+    weights = [1 / (rank + 1) for rank in range(words)]
+    topic_words = [rng.sample(vocabulary, 40) for _ in range(topics)]
+    publications = []
+    for i in range(count):
+        topic = topic_words[rng.randrange(topics)]
+        text = rng.choices(vocabulary, weights, k=120) + rng.choices(topic, k=30)
+        rng.shuffle(text)
+        publications.append({'id': f"{prefix}-{i}", 'title': " ".join(text[:10]), 'abstract': " ".join(text[10:])})
+    return publications
+
+def run(publications: int = 20_000, queries: int = 500, update_batch: int = 1000, limit: int = 10) -> Dict:
+    corpus = synthetic_publications(publications)
+    start = time.perf_counter()
+    index = SimilarityIndex().build([corpus[i:i + 5000] for i in range(0, len(corpus), 5000)])
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.add_publications(synthetic_publications(update_batch, seed=1, prefix="new"))
+    index.similar("new-0", limit)
+    update_seconds = time.perf_counter() - start
+
+    ids = [f"pub-{i}" for i in random.Random(2).sample(range(publications), min(queries, publications))]
+    start = time.perf_counter()
+    index.similar_batch(ids, limit)
+    batch_seconds = time.perf_counter() - start
+
+    singles = ids[:max(len(ids) // 5, 1)]
+    start = time.perf_counter()
+    for pub_id in singles:
+        index.similar(pub_id, limit)
+    single_seconds = time.perf_counter() - start
+
+    report = index.memory_report()
+    return {
+        'publications': publications,
+        'nonzeros': report['nonzeros'],
+        'index_bytes': report['total_bytes'],
+        'build_seconds': build_seconds,
+        'build_publications_per_second': publications / build_seconds,
+        'update_batch': update_batch,
+        'update_seconds': update_seconds,
+        'batch_queries_per_second': len(ids) / batch_seconds,
+        'single_queries_per_second': len(singles) / single_seconds,
+        'single_query_ms': single_seconds / len(singles) * 1000
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publications", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--update-batch", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.publications, args.queries, args.update_batch, args.limit), indent=2))
@@ -0,0 +1,69 @@
+"""Throughput of the single-mission simulator at a range of batch sizes.
+
+Times simulate_mission below its result cache, the scalar _calculate_risks
+loop and the vectorized batch engine over the same N scenarios. Relevant
+studies come from a small in-memory concept index, so no Neo4j is needed.
+
+    python -m benchmarks.bench_simulation --batch-sizes 1 100 10000
+"""
+import argparse
+import json
+import time
+from typing import Dict, List
+
+from app.services.batch_simulation import batch_risk_engine
+from app.services.concept_extractor import concept_extractor
+from app.services.concept_index import concept_index
+from app.services.simulation_engine import MissionSimulator, mission_simulator
+from benchmarks.bench_batch_simulation import make_scenarios
+
+# Small batches are looped until a timing covers at least this many scenarios
+MIN_SCENARIOS = 2000
+
+def ensure_concept_index(publications: int = 1000):
+    if not concept_index.ready:
+        concepts = concept_extractor.concepts
+        concept_index.build((f"bench-{i}", concept) for i in range(publications) for concept in concepts[i % 7::7])
+
+def per_second(count: int, func, repeats: int) -> float:
+    rounds = max(1, MIN_SCENARIOS // count)
+    best = min(timed(func, rounds) for _ in range(repeats))
+    return count * rounds / best
+
+def timed(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return time.perf_counter() - start
+
+def run(batch_sizes=(1, 100, 10_000), repeats: int = 3) -> Dict:
+    ensure_concept_index()
+    simulate = MissionSimulator.simulate_mission.__wrapped__  # skip the result cache
+    results = {}
+    for size in batch_sizes:
+        durations, destinations, gravity, shielding = make_scenarios(size)
+        rows = list(zip(durations.tolist(), destinations.tolist(), gravity.tolist(), shielding.tolist()))
+        missions: List[Dict] = [
+            {'duration_days': d, 'destination': dest, 'artificial_gravity': g, 'radiation_shielding': s}
+            for d, dest, g, s in rows
+        ]
+        results[f"batch_{size}"] = {
+            'scenarios': size,
+            'simulate_mission_per_second': per_second(
+                size, lambda: [simulate(mission_simulator, mission) for mission in missions], repeats
+            ),
+            'calculate_risks_per_second': per_second(
+                size, lambda: [mission_simulator._calculate_risks(*row) for row in rows], repeats
+            ),
+            'batch_engine_per_second': per_second(
+                size, lambda: batch_risk_engine.calculate_risks(durations, destinations, gravity, shielding), repeats
+            )
+        }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.batch_sizes, args.repeats), indent=2))
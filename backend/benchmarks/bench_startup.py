@@ -0,0 +1,132 @@
+"""Cold start and per-worker memory of the API.
+
+Imports app.main in a fresh interpreter (time and which heavy modules it
+pulls in), then starts the pre-forked server (python -m app.serve) and times
+it until /health answers. After a warm-up of what-if and mission requests it
+reads each worker's memory from /proc/<pid>/smaps_rollup: `private_mb` is
+what a worker costs on its own, `pss_mb` its fair share including the pages
+it shares with the parent. Memory figures are Linux only.
+
+    python -m benchmarks.bench_startup --workers 4
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('numpy', 'neo4j', 'aiohttp', 'pandas')
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+print(json.dumps({{
+    'seconds': time.perf_counter() - start,
+    'heavy': [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+}}))
+"""
+
+def measure_import() -> Dict:
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND, check=True,
+                            capture_output=True, text=True).stdout
+    wall = time.perf_counter() - start
+    probe = json.loads(output.strip().splitlines()[-1])
+    return {'import_seconds': probe['seconds'], 'interpreter_seconds': wall, 'heavy_modules': probe['heavy']}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def children(pid: int) -> List[int]:
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # ppid is the second field after the parenthesised command name
+                if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                    found.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return sorted(found)
+
+def memory_mb(pid: int) -> Dict[str, float]:
+    """Rss, Pss and private memory of one process in MiB; empty where /proc has no smaps_rollup"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in f if line.rstrip().endswith("kB")}
+    except OSError:
+        return {}
+    return {
+        'rss_mb': fields['Rss'] / 1024,
+        'pss_mb': fields['Pss'] / 1024,
+        'private_mb': (fields['Private_Clean'] + fields['Private_Dirty']) / 1024
+    }
+
+def warm_up(client: httpx.Client, requests: int):
+    for i in range(requests):
+        client.post("/simulation/what-if", json={'duration_days': [i % 700, 365], 'destination': ['mars']})
+        client.post("/simulation/mission", json={'duration_days': 100 + i})
+
+def measure_server(workers: int, warmup_requests: int, timeout: float) -> Dict:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", str(workers), "--port", str(port),
+         "--host", "127.0.0.1", "--log-level", "warning"],
+        cwd=BACKEND, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"app.serve exited with status {server.returncode}")
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"No /health response within {timeout}s")
+                try:
+                    if client.get("/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.02)
+            cold_start = time.perf_counter() - start
+            warm_up(client, warmup_requests)
+
+        pids = children(server.pid)
+        per_worker = [memory_mb(pid) for pid in pids]
+        per_worker = [usage for usage in per_worker if usage]
+        result = {'workers': len(pids), 'cold_start_seconds': cold_start}
+        if per_worker:
+            result['parent'] = memory_mb(server.pid)
+            result['per_worker'] = {
+                key: sum(usage[key] for usage in per_worker) / len(per_worker) for key in per_worker[0]
+            }
+            result['total_pss_mb'] = result['parent']['pss_mb'] + sum(usage['pss_mb'] for usage in per_worker)
+        return result
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+def run(workers: int = 4, warmup_requests: int = 50, timeout: float = 30.0) -> Dict:
+    return {'import': measure_import(), 'server': measure_server(workers, warmup_requests, timeout)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--warmup-requests", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.workers, args.warmup_requests, args.timeout), indent=2))
@@ -0,0 +1,47 @@
+"""Time a day-by-day trajectory run and a checkpointed extension.
+
+    python -m benchmarks.bench_trajectory --days 1000 --crew 10000
+"""
+import argparse
+import json
+import tempfile
+import time
+from typing import Dict
+
+from app.services.batch_simulation import batch_risk_engine
+from app.services.trajectory import TrajectorySimulator
+
+def run(days: int = 1000, crew: int = 10_000, extend_from: int = 800) -> Dict:
+    mission = {'destination': 'mars', 'radiation_shielding': 'standard'}
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        simulator = TrajectorySimulator(batch_risk_engine, checkpoint_dir=checkpoint_dir)
+
+        start = time.perf_counter()
+        state = simulator.simulate({**mission, 'duration_days': days}, crew_size=crew, seed=1)
+        full_seconds = time.perf_counter() - start
+
+        partial = simulator.simulate({**mission, 'duration_days': extend_from}, crew_size=crew, seed=1)
+        checkpoint_id = simulator.save_checkpoint(partial)
+        start = time.perf_counter()
+        resumed = simulator.load_checkpoint(checkpoint_id)
+        simulator.simulate({**mission, 'duration_days': days}, crew_size=crew, seed=1, state=resumed)
+        resume_seconds = time.perf_counter() - start
+
+    return {
+        'days': days,
+        'crew': crew,
+        'full_seconds': full_seconds,
+        'crew_days_per_second': days * crew / full_seconds,
+        'resume_from_day': extend_from,
+        'resume_seconds': resume_seconds,
+        'state_bytes': state.mean.nbytes + state.fraction_over.nbytes
+                       + state.crew_risk.nbytes + state.first_crossing.nbytes,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--crew", type=int, default=10_000)
+    parser.add_argument("--extend-from", type=int, default=800)
+    args = parser.parse_args()
+    print(json.dumps(run(args.days, args.crew, args.extend_from), indent=2))
@@ -0,0 +1,167 @@
+"""Run the benchmark suite, write results as JSON and compare with a baseline.
+
+Throughput metrics (`*_per_second`) regress when they drop, latency and
+memory metrics (`*seconds`, `*_ms`, `*_mb`) when they rise, by more than --threshold (a fraction
+of the baseline value). Other numbers are recorded but not compared. Each
+suite runs --repeats times and keeps the best value of every metric, which
+filters out most scheduler and frequency-scaling noise. Exits with status 1
+on any regression.
+
+--update-baseline only adds metrics the baseline does not have yet (a new
+suite), so existing values cannot drift and hide a regression.
+--refresh-baseline replaces every value; commit that on its own, with the
+reason for it.
+
+    python -m benchmarks.run --quick
+    python -m benchmarks.run --suite simulation ingest --threshold 0.1
+    python -m benchmarks.run --quick --suite similarity --update-baseline
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(HERE, "results.json")
+
+# name -> (module, function, full-size kwargs, --quick kwargs)
+SUITES = {
+    'simulation': ("benchmarks.bench_simulation", "run", {}, {'batch_sizes': (1, 100, 1000), 'repeats': 2}),
+    'extraction': ("benchmarks.bench_concept_extraction", "run_default", {}, {'abstracts': 500}),
+    'ingest': ("benchmarks.bench_ingest_end_to_end", "run", {}, {'publications': 1000}),
+    'api_load': ("benchmarks.bench_api_load", "run", {}, {'requests': 400, 'clients': 20}),
+    'what_if': ("benchmarks.bench_risk_table", "run", {}, {'calls': 200}),
+    'similarity': ("benchmarks.bench_similarity", "run", {}, {'publications': 5000, 'queries': 200}),
+    'startup': ("benchmarks.bench_startup", "run", {}, {'workers': 2, 'warmup_requests': 20}),
+}
+
+def flatten(result, prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves of a nested result, keyed by dotted path"""
+    if isinstance(result, dict):
+        flat = {}
+        for key, value in result.items():
+            flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(result, (int, float)) and not isinstance(result, bool):
+        return {prefix: float(result)}
+    return {}
+
+def direction(metric: str) -> Optional[int]:
+    """+1 if higher is better, -1 if lower is better, None if not compared"""
+    name = metric.rsplit(".", 1)[-1]
+    if name.endswith("per_second"):
+        return 1
+    if name.endswith("seconds") or name.endswith("_ms") or name.endswith("_mb"):
+        return -1
+    return None
+
+def best_of(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """Per-metric best across repeated runs; uncompared metrics keep the last value"""
+    best = dict(runs[-1])
+    for run in runs[:-1]:
+        for metric, value in run.items():
+            sign = direction(metric)
+            if sign is not None and metric in best and sign * (value - best[metric]) > 0:
+                best[metric] = value
+    return best
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[Dict]:
+    """Per-metric relative change, positive when the current run is better"""
+    rows = []
+    for metric, value in sorted(current.items()):
+        sign = direction(metric)
+        base = baseline.get(metric)
+        if sign is None or not base:
+            continue
+        change = sign * (value - base) / base
+        status = 'regression' if change < -threshold else 'improvement' if change > threshold else 'ok'
+        rows.append({'metric': metric, 'baseline': base, 'current': value, 'change': change, 'status': status})
+    return rows
+
+def merge_baseline(baseline: Optional[Dict], report: Dict) -> Dict:
+    """`baseline` plus the suites and metrics of `report` it lacks; existing values are kept"""
+    if baseline is None:
+        return report
+    merged = dict(baseline)
+    merged['results'] = {**report['results'], **baseline['results']}
+    merged['metrics'] = {**report['metrics'], **baseline['metrics']}
+    return merged
+
+def run_suites(names: List[str], quick: bool, repeats: int = 3) -> Dict:
+    results, metrics = {}, {}
+    for name in names:
+        module, function, full, small = SUITES[name]
+        bench = getattr(importlib.import_module(module), function)
+        start = time.perf_counter()
+        runs = []
+        for _ in range(repeats):
+            results[name] = bench(**(small if quick else full))
+            runs.append(flatten(results[name], name))
+        metrics.update(best_of(runs))
+        print(f"{name}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return {
+        'created_at': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        'mode': 'quick' if quick else 'full',
+        'repeats': repeats,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count()
+        },
+        'results': results,
+        'metrics': metrics
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--quick", action="store_true", help="smaller workloads, for CI")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per suite; the best value of each metric is kept")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="add metrics missing from the baseline; existing values are kept")
+    parser.add_argument("--refresh-baseline", action="store_true", help="replace the baseline with this run")
+    args = parser.parse_args(argv)
+
+    report = run_suites(args.suite, args.quick, args.repeats)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if baseline is not None and baseline.get('mode') != report['mode'] and not args.refresh_baseline:
+        print(f"Baseline is a {baseline.get('mode')} run; not comparable with a {report['mode']} run", file=sys.stderr)
+        return 0
+    if args.update_baseline or args.refresh_baseline:
+        updated = report if args.refresh_baseline else merge_baseline(baseline, report)
+        with open(args.baseline, "w") as f:
+            json.dump(updated, f, indent=2)
+        print(f"Baseline written: {args.baseline} ({len(updated['metrics'])} metrics)", file=sys.stderr)
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one", file=sys.stderr)
+        return 0
+
+    rows = compare(report['metrics'], baseline['metrics'], args.threshold)
+    for row in rows:
+        if row['status'] != 'ok':
+            print(f"{row['status']:>11}  {row['metric']}: {row['baseline']:.4g} -> {row['current']:.4g} "
+                  f"({row['change']:+.0%})")
+    regressions = [row for row in rows if row['status'] == 'regression']
+    print(f"{len(rows)} metrics compared, {len(regressions)} regressions (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""In-process stand-ins for external services used by tests and benchmarks"""
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+COUNTER_FIELDS = ('nodes_created', 'relationships_created', 'relationships_deleted', 'properties_set')
+
+
+class FakeRecord(dict):
+    def data(self) -> Dict:
+        return dict(self)
+
+
+class FakeResult:
+    def __init__(self, records: List[Dict], counters: Optional[Dict[str, int]] = None):
+        self._records = [FakeRecord(r) for r in records]
+        self._counters = {field: 0 for field in COUNTER_FIELDS}
+        self._counters.update(counters or {})
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def data(self) -> List[Dict]:
+        return [r.data() for r in self._records]
+
+    def consume(self):
+        return SimpleNamespace(counters=SimpleNamespace(**self._counters))
+
+
+class FakeTransaction:
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    def run(self, query: str, parameters: Optional[Dict] = None, **kwargs) -> FakeResult:
+        return self._driver._execute(query, {**(parameters or {}), **kwargs})
+
+
+class FakeSession:
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query: str, parameters: Optional[Dict] = None, **kwargs) -> FakeResult:
+        self._driver.transactions += 1
+        return self._driver._execute(query, {**(parameters or {}), **kwargs})
+
+    def execute_write(self, fn: Callable, *args, **kwargs):
+        self._driver.transactions += 1
+        return fn(FakeTransaction(self._driver), *args, **kwargs)
+
+    def execute_read(self, fn: Callable, *args, **kwargs):
+        self._driver.transactions += 1
+        return fn(FakeTransaction(self._driver), *args, **kwargs)
+
+
+class FakeDriver:
+    """Records every query and optionally simulates a network round trip per statement.
+
+    `responder` returns the records for a statement and `counters` its
+    summary counters (nodes_created, relationships_created, ...).
+    """
+
+    def __init__(self, responder: Optional[Callable[[str, Dict], List[Dict]]] = None, latency: float = 0.0,
+                 counters: Optional[Callable[[str, Dict], Dict[str, int]]] = None):
+        self.responder = responder or (lambda query, params: [])
+        self.counters = counters or (lambda query, params: {})
+        self.latency = latency
+        self.queries: List[tuple] = []
+        self.transactions = 0
+
+    def session(self, **kwargs) -> FakeSession:
+        return FakeSession(self)
+
+    def close(self):
+        pass
+
+    def _execute(self, query: str, params: Dict[str, Any]) -> FakeResult:
+        if self.latency:
+            time.sleep(self.latency)
+        self.queries.append((query, params))
+        return FakeResult(self.responder(query, params), self.counters(query, params))
+
+
+class FakeAsyncResult(FakeResult):
+    async def single(self):
+        return FakeResult.single(self)
+
+    async def data(self) -> List[Dict]:
+        return FakeResult.data(self)
+
+    async def consume(self):
+        return FakeResult.consume(self)
+
+
+class FakeAsyncTransaction:
+    def __init__(self, driver: "FakeAsyncDriver"):
+        self._driver = driver
+
+    async def run(self, query: str, parameters: Optional[Dict] = None, **kwargs) -> FakeAsyncResult:
+        return await self._driver._execute(query, {**(parameters or {}), **kwargs})
+
+
+class FakeAsyncSession:
+    def __init__(self, driver: "FakeAsyncDriver"):
+        self._driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_write(self, fn: Callable, *args, **kwargs):
+        self._driver.transactions += 1
+        return await fn(FakeAsyncTransaction(self._driver), *args, **kwargs)
+
+    async def execute_read(self, fn: Callable, *args, **kwargs):
+        self._driver.transactions += 1
+        return await fn(FakeAsyncTransaction(self._driver), *args, **kwargs)
+
+
+class FakeAsyncDriver:
+    """Async twin of FakeDriver; latency is awaited so concurrent sessions overlap"""
+
+    def __init__(self, responder: Optional[Callable[[str, Dict], List[Dict]]] = None, latency: float = 0.0,
+                 counters: Optional[Callable[[str, Dict], Dict[str, int]]] = None):
+        self.responder = responder or (lambda query, params: [])
+        self.counters = counters or (lambda query, params: {})
+        self.latency = latency
+        self.queries: List[tuple] = []
+        self.transactions = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def session(self, **kwargs) -> FakeAsyncSession:
+        return FakeAsyncSession(self)
+
+    async def close(self):
+        pass
+
+    async def _execute(self, query: str, params: Dict[str, Any]) -> FakeAsyncResult:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        self.queries.append((query, params))
+        return FakeAsyncResult(self.responder(query, params), self.counters(query, params))
+
+
+class FakeRedis:
+    """Dict-backed subset of the redis-py client API"""
+
+    def __init__(self):
+        self.store: Dict[str, Any] = {}
+        self.expiry: Dict[str, float] = {}
+
+    def _expire(self, name: str):
+        if name in self.expiry and self.expiry[name] < time.monotonic():
+            self.store.pop(name, None)
+            self.expiry.pop(name, None)
+
+    def get(self, name: str):
+        self._expire(name)
+        return self.store.get(name)
+
+    def set(self, name: str, value: Any, ex: Optional[int] = None, nx: bool = False):
+        self._expire(name)
+        if nx and name in self.store:
+            return None
+        self.store[name] = value.encode() if isinstance(value, str) else value
+        if ex:
+            self.expiry[name] = time.monotonic() + ex
+        else:
+            self.expiry.pop(name, None)
+        return True
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        self._expire(name)
+        value = int(self.store.get(name, 0)) + amount
+        self.store[name] = str(value).encode()
+        return value
+
+    def hset(self, name: str, key: Optional[str] = None, value: Any = None, mapping: Optional[Dict] = None) -> int:
+        fields = self.store.setdefault(name, {})
+        updates = dict(mapping or {})
+        if key is not None:
+            updates[key] = value
+        for field, item in updates.items():
+            fields[field.encode()] = item if isinstance(item, bytes) else str(item).encode()
+        return len(updates)
+
+    def hget(self, name: str, key: str):
+        self._expire(name)
+        return self.store.get(name, {}).get(key.encode())
+
+    def hgetall(self, name: str) -> Dict[bytes, bytes]:
+        self._expire(name)
+        return dict(self.store.get(name, {}))
+
+    def expire(self, name: str, seconds: int) -> bool:
+        if name not in self.store:
+            return False
+        self.expiry[name] = time.monotonic() + seconds
+        return True
+
+    def lpush(self, name: str, *values: Any) -> int:
+        items = self.store.setdefault(name, [])
+        for value in values:
+            items.insert(0, value.encode() if isinstance(value, str) else value)
+        return len(items)
+
+    def brpop(self, name: str, timeout: float = 0):
+        """Non-blocking: the in-memory queue cannot be filled while we wait"""
+        items = self.store.get(name)
+        if not items:
+            return None
+        return name.encode(), items.pop()
+
+    def delete(self, *names: str) -> int:
+        removed = 0
+        for name in names:
+            removed += self.store.pop(name, None) is not None
+            self.expiry.pop(name, None)
+        return removed
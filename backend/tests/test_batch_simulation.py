@@ -0,0 +1,52 @@
+import itertools
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.batch_simulation import batch_risk_engine, total_risk_scores
+from app.services.simulation_engine import mission_simulator, RISK_AREAS
+
+client = TestClient(app)
+
+def test_batch_matches_scalar_path_exactly():
+    grid = list(itertools.product(
+        [1, 30, 180, 365, 500, 730, 1000],
+        ["moon", "mars", "deep_space", "europa"],
+        [False, True],
+        ["standard", "enhanced"]
+    ))
+    durations, destinations, gravity, shielding = zip(*grid)
+
+    risks = batch_risk_engine.calculate_risks(durations, destinations, gravity, shielding)
+    totals = total_risk_scores(risks)
+
+    for row, total, scenario in zip(risks, totals, grid):
+        expected = mission_simulator._calculate_risks(*scenario)
+        assert row.tolist() == [expected[area] for area in RISK_AREAS]
+        assert total == sum(expected.values()) / len(expected)
+
+def test_batch_endpoint_broadcasts_columns():
+    response = client.post("/simulation/batch", json={
+        "duration_days": [100, 200, 300],
+        "destination": ["moon"]
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["scenarios"] == 3
+    assert body["risk_areas"] == list(RISK_AREAS)
+    assert len(body["risks"]) == 3
+
+def test_batch_endpoint_rejects_mismatched_columns():
+    response = client.post("/simulation/batch", json={
+        "duration_days": [100, 200, 300],
+        "destination": ["moon", "mars"]
+    })
+    assert response.status_code == 422
+
+def test_psychological_risk_follows_its_own_coefficient(monkeypatch):
+    isolation = mission_simulator.risk_factors['isolation']
+    monkeypatch.setitem(isolation, 'team_cohesion', 0.9)
+    assert mission_simulator._calculate_risks(365, "mars", False, "standard")['psychological_health'] == 0.5
+
+    monkeypatch.setitem(isolation, 'psychological_base', 0.3)
+    column = RISK_AREAS.index('psychological_health')
+    assert mission_simulator._calculate_risks(365, "mars", False, "standard")['psychological_health'] == 0.3
+    assert batch_risk_engine.calculate_risks([365], ["mars"], [False], ["standard"])[0, column] == 0.3
@@ -0,0 +1,36 @@
+from benchmarks.run import best_of, compare, flatten, merge_baseline
+
+def test_flatten_keeps_numeric_leaves_by_dotted_path():
+    result = {'batch_1': {'scenarios': 1, 'runs_per_second': 10.0}, 'ok': True, 'name': 'x'}
+    assert flatten(result, 'simulation') == {
+        'simulation.batch_1.scenarios': 1.0,
+        'simulation.batch_1.runs_per_second': 10.0
+    }
+
+def test_best_of_respects_metric_direction():
+    runs = [
+        {'a.items_per_second': 90.0, 'a.seconds': 1.2, 'a.items': 5.0},
+        {'a.items_per_second': 110.0, 'a.seconds': 1.0, 'a.items': 6.0},
+        {'a.items_per_second': 100.0, 'a.seconds': 1.1, 'a.items': 7.0}
+    ]
+    assert best_of(runs) == {'a.items_per_second': 110.0, 'a.seconds': 1.0, 'a.items': 7.0}
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {'x.items_per_second': 100.0, 'x.p95_ms': 10.0, 'x.seconds': 2.0, 'x.count': 5.0, 'x.pss_mb': 50.0}
+    current = {'x.items_per_second': 70.0, 'x.p95_ms': 10.5, 'x.seconds': 1.0, 'x.count': 1.0, 'x.pss_mb': 70.0}
+    rows = {row['metric']: row['status'] for row in compare(current, baseline, threshold=0.25)}
+    assert rows == {
+        'x.items_per_second': 'regression', 'x.p95_ms': 'ok', 'x.seconds': 'improvement', 'x.pss_mb': 'regression'
+    }
+
+def test_update_baseline_only_adds_missing_metrics():
+    baseline = {'mode': 'quick', 'results': {'a': {'x_per_second': 100.0}}, 'metrics': {'a.x_per_second': 100.0}}
+    report = {
+        'mode': 'quick',
+        'results': {'a': {'x_per_second': 50.0}, 'b': {'y_ms': 2.0}},
+        'metrics': {'a.x_per_second': 50.0, 'b.y_ms': 2.0}
+    }
+    merged = merge_baseline(baseline, report)
+    assert merged['metrics'] == {'a.x_per_second': 100.0, 'b.y_ms': 2.0}
+    assert merged['results'] == {'a': {'x_per_second': 100.0}, 'b': {'y_ms': 2.0}}
+    assert merge_baseline(None, report) is report
@@ -0,0 +1,57 @@
+from app.services.cache import ResultCache, stable_hash
+from tests.fakes import FakeRedis
+
+def test_stable_hash_ignores_key_order():
+    assert stable_hash({'a': 1, 'b': [1, 2]}) == stable_hash({'b': [1, 2], 'a': 1})
+    assert stable_hash({'a': 1}) != stable_hash({'a': 2})
+
+def test_local_then_redis_tiers():
+    redis = FakeRedis()
+    calls = []
+
+    def make_cache():
+        cache = ResultCache(redis_client=redis)
+
+        @cache.cached("graph")
+        def lookup(name, depth=1):
+            calls.append(name)
+            return {'name': name, 'depth': depth}
+        return cache, lookup
+
+    cache, lookup = make_cache()
+    assert lookup("radiation") == {'name': "radiation", 'depth': 1}
+    assert lookup("radiation") == {'name': "radiation", 'depth': 1}
+    assert calls == ["radiation"]
+    assert cache.stats()['local_hits'] == 1
+
+    # A second worker sees the entry through Redis
+    other, other_lookup = make_cache()
+    assert other_lookup("radiation") == {'name': "radiation", 'depth': 1}
+    assert calls == ["radiation"]
+    assert other.stats()['redis_hits'] == 1
+
+def test_invalidate_reaches_other_workers():
+    redis = FakeRedis()
+    first = ResultCache(redis_client=redis)
+    second = ResultCache(redis_client=redis)
+    first.set("graph", "stats", {'nodes': 1})
+    assert second.get("graph", "stats") == {'nodes': 1}
+
+    first.invalidate("graph")
+    second.GENERATION_REFRESH_SECONDS = 0
+
+    assert first.get("graph", "stats") != {'nodes': 1}
+    assert second.get("graph", "stats") != {'nodes': 1}
+
+def test_redis_errors_fall_back_to_local_tier():
+    class BrokenRedis:
+        def __getattr__(self, name):
+            def fail(*args, **kwargs):
+                raise ConnectionError("redis down")
+            return fail
+
+    cache = ResultCache(redis_client=BrokenRedis())
+    cache.set("simulation", {'duration_days': 365}, {'risk': 0.4})
+
+    assert cache.get("simulation", {'duration_days': 365}) == {'risk': 0.4}
+    assert cache.stats()['redis_errors'] == 1
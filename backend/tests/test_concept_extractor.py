@@ -0,0 +1,28 @@
+from app.routes.data import extract_concepts_from_text
+from app.services.concept_extractor import ConceptExtractor, load_vocabulary
+
+def test_matches_respect_word_boundaries():
+    concepts = extract_concepts_from_text("Mission planning for a crewed transmission relay")
+    assert "iss" not in concepts
+
+def test_synonyms_map_to_canonical_concepts_ranked_by_frequency():
+    text = ("Lunar dust and radiation. Space radiation dosimetry aboard the "
+            "International Space Station; ionizing radiation shielding on the Moon.")
+    concepts = extract_concepts_from_text(text)
+    assert concepts == ["radiation", "moon", "iss"]
+
+def test_overlapping_synonyms_count_once():
+    extractor = ConceptExtractor({"immune system": ["immune", "immune function"]})
+    assert extractor.count("Immune function declines; the immune system adapts") == {"immune system": 2}
+
+def test_failure_links_find_suffix_terms():
+    extractor = ConceptExtractor({"a": ["bone density loss"], "b": ["density"], "c": ["bone loss"]})
+    assert extractor.count("bone density change and bone loss") == {"b": 1, "c": 1}
+
+def test_batch_and_tsv_vocabulary(tmp_path):
+    path = tmp_path / "vocab.tsv"
+    path.write_text("# concept\tsynonyms\nhypoxia\tlow oxygen|oxygen deprivation\nfluid shift\n")
+    extractor = ConceptExtractor(load_vocabulary(str(path)))
+    assert extractor.extract_batch(["Low oxygen caused hypoxia", "cephalad fluid shift", "nothing"]) == [
+        ["hypoxia"], ["fluid shift"], []
+    ]
@@ -0,0 +1,126 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from app.services.concept_index import ConceptIndex
+from app.services.ingest_pipeline import IngestJob, IngestPipeline
+from app.services.simulation_engine import MissionSimulator
+import app.services.simulation_engine as simulation_engine
+
+EDGES = [
+    ("pub-1", "radiation"), ("pub-1", "mars"), ("pub-1", "sleep"),
+    ("pub-2", "radiation"), ("pub-2", "mars"),
+    ("pub-3", "radiation"), ("pub-3", "sleep"),
+    ("pub-4", "radiation"), ("pub-4", "mars")
+]
+
+def test_study_counts_and_related_concepts():
+    index = ConceptIndex(top_k=1).build(EDGES)
+
+    assert index.study_count("radiation") == 4
+    assert index.study_count("mars") == 3
+    assert index.study_count("unknown") == 0
+    assert sorted(index.studies("sleep")) == ["pub-1", "pub-3"]
+    assert index.related("radiation") == [{'concept': "mars", 'co_occurrences': 3}]
+    assert index.related("sleep") == [{'concept': "radiation", 'co_occurrences': 2}]
+
+def test_incremental_edges_are_deduplicated():
+    index = ConceptIndex().build(EDGES)
+    index.add_edges({"pub-1": ["radiation", "mars", "sleep"], "pub-5": ["sleep", "exercise"]})
+
+    assert index.study_count("radiation") == 4
+    assert index.study_count("sleep") == 3
+    assert index.related("exercise") == [{'concept': "sleep", 'co_occurrences': 1}]
+    assert index.memory_report()['edges'] == len(EDGES) + 2
+
+def test_readded_publication_replaces_its_edges():
+    index = ConceptIndex().build(EDGES)
+    index.add_edges({"pub-1": ["radiation", "exercise"]})
+    index.add_edges({"pub-2": []})
+    index.add_edges({"pub-1": ["radiation"], "pub-5": ["sleep"]})
+
+    rebuilt = ConceptIndex().build(
+        [edge for edge in EDGES if edge[0] not in ("pub-1", "pub-2")] + [("pub-1", "radiation"), ("pub-5", "sleep")]
+    )
+    for concept in ("radiation", "mars", "sleep", "exercise"):
+        assert index.study_count(concept) == rebuilt.study_count(concept)
+        assert sorted(index.studies(concept)) == sorted(rebuilt.studies(concept))
+        # Ties rank by concept id, which depends on the order names were first seen
+        by_name = lambda related: sorted(related, key=lambda entry: entry['concept'])
+        assert by_name(index.related(concept)) == by_name(rebuilt.related(concept))
+    assert index.study_count("mars") == 1 and index.study_count("exercise") == 0
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "index.npz")
+    original = ConceptIndex(top_k=2).build(EDGES)
+    original.save(path)
+
+    loaded = ConceptIndex()
+    assert loaded.load(path)
+    assert loaded.ready and loaded.top_k == 2
+    assert loaded.related("radiation") == original.related("radiation")
+    assert loaded.study_count("mars") == 3
+    assert not ConceptIndex().load(str(tmp_path / "missing.npz"))
+
+def test_reloads_file_saved_by_another_process(tmp_path):
+    path = str(tmp_path / "index.npz")
+    ConceptIndex().build(EDGES).save(path)
+    api = ConceptIndex()
+    assert api.reload_if_changed(path) and api.study_count("sleep") == 2
+    assert not api.reload_if_changed(path)
+
+    worker = ConceptIndex()
+    worker.load(path)
+    worker.add_edges({"pub-5": ["sleep"]})
+    worker.save(path)
+
+    assert api.reload_if_changed(path)
+    assert api.study_count("sleep") == 3
+
+def test_concurrent_saves_do_not_share_a_temp_file(tmp_path):
+    path = str(tmp_path / "index.npz")
+    index = ConceptIndex().build(EDGES)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: index.save(path), range(16)))
+
+    assert os.listdir(tmp_path) == ["index.npz"]
+    loaded = ConceptIndex()
+    assert loaded.load(path) and loaded.study_count("radiation") == 4
+
+def test_unbuilt_index_ignores_edges():
+    index = ConceptIndex()
+    index.add_edges({"pub-1": ["radiation"]})
+
+    assert not index.ready
+    assert index.memory_report()['pending_batches'] == 0 and not index.dirty
+
+def test_pipeline_refreshes_index_after_each_batch():
+    class Graph:
+        async def upsert_publications_batch(self, publications, concepts_by_pub):
+            return len(publications)
+
+        async def existing_content_hashes(self, ids, label='Publication'):
+            return {}
+
+    async def records():
+        for i in range(5):
+            yield {'id': f"pub-{i}", 'title': "radiation", 'abstract': None}
+
+    index = ConceptIndex().build([])
+    pipeline = IngestPipeline(Graph(), lambda text: [text.strip()], batch_size=2, on_batch=index.add_edges)
+    asyncio.run(pipeline.run(IngestJob('pubspace', {}), records()))
+
+    assert index.study_count("radiation") == 5
+
+def test_simulator_reads_study_counts_from_index(monkeypatch):
+    index = ConceptIndex().build(EDGES)
+
+    class Graph:
+        def get_connected_concepts(self, *args, **kwargs):
+            raise AssertionError("graph should not be queried")
+
+    services = {'concept_index': index, 'kg_service': Graph()}
+    monkeypatch.setattr(simulation_engine, 'service', services.__getitem__)
+    studies = MissionSimulator()._get_relevant_studies({'radiation_exposure': 0.9, 'sleep': 0.2})
+
+    assert studies == [{'risk_area': 'radiation_exposure', 'concept': 'radiation', 'studies_count': 4}]
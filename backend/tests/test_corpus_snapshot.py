@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+from app import manage
+from app.services import knowledge_graph
+from app.services.concept_extractor import concept_extractor
+from app.services.corpus_snapshot import CorpusSnapshot
+from app.services.knowledge_graph import (
+    EXPORT_FIRST_PUBLICATIONS_QUERY, EXPORT_NEXT_PUBLICATIONS_QUERY, UPSERT_DISCUSSES_QUERY,
+    UPSERT_PUBLICATIONS_QUERY, KnowledgeGraphService
+)
+from tests.fakes import FakeDriver
+
+def publication(i, abstract="Bone loss in microgravity", source='pubspace'):
+    return {'id': f"pub-{i:03d}", 'title': f"Study {i}", 'abstract': abstract, 'authors': ["A. B", "C. D"],
+            'publication_date': None, 'journal': None, 'doi': None, 'source': source}
+
+def test_append_skips_unchanged_and_supersedes_changed_rows(tmp_path):
+    snapshot = CorpusSnapshot(str(tmp_path))
+    assert snapshot.append([publication(i) for i in range(3)]) == {'appended': 3, 'updated': 0, 'unchanged': 0}
+
+    counts = snapshot.append([publication(0), publication(1, abstract="Radiation"), publication(1, source='genelab')])
+    assert counts == {'appended': 1, 'updated': 1, 'unchanged': 1}
+
+    reopened = CorpusSnapshot(str(tmp_path))
+    assert reopened.rows == 5 and len(reopened) == 4
+    rows = [pub for batch in reopened.iter_batches(batch_size=2) for pub in batch]
+    assert [(pub['id'], pub['source']) for pub in rows] == [
+        ("pub-000", 'pubspace'), ("pub-002", 'pubspace'), ("pub-001", 'pubspace'), ("pub-001", 'genelab')
+    ]
+    assert rows[2]['abstract'] == "Radiation"
+    assert rows[0]['authors'] == ["A. B", "C. D"] and rows[0]['journal'] is None
+
+def test_uncommitted_bytes_are_ignored_and_truncated(tmp_path):
+    snapshot = CorpusSnapshot(str(tmp_path))
+    snapshot.append([publication(0)])
+    with open(tmp_path / "title.data", 'ab') as f:
+        f.write(b"partial write")
+
+    snapshot = CorpusSnapshot(str(tmp_path))
+    assert snapshot.columns['title'][0] == "Study 0"
+    snapshot.append([publication(1)])
+    assert [pub['title'] for batch in snapshot.iter_batches(('title',)) for pub in batch] == ["Study 0", "Study 1"]
+
+def test_reextract_streams_concepts(tmp_path):
+    snapshot = CorpusSnapshot(str(tmp_path))
+    snapshot.append([publication(0), publication(1, abstract="Radiation on Mars"),
+                     publication(1, abstract="Sleep on the ISS", source='lsda')])
+
+    batches = list(snapshot.reextract(concept_extractor, batch_size=3))
+
+    assert batches[0][1] == {
+        ('pubspace', "pub-000"): ["bone loss", "microgravity"], ('pubspace', "pub-001"): ["radiation", "mars"],
+        ('lsda', "pub-001"): ["sleep", "iss"]
+    }
+
+def test_reextract_update_graph_keeps_publication_properties(tmp_path, monkeypatch):
+    graph = {"pub-000": {'title': "Newer title", 'content_hash': "abc"}}
+    edges = []
+
+    def respond(query, params):
+        if query == UPSERT_PUBLICATIONS_QUERY:
+            for row in params['rows']:
+                graph[row['id']].update(title=row['title'], content_hash=row['content_hash'])
+        if query == UPSERT_DISCUSSES_QUERY:
+            edges.extend((row['id'], concept) for row in params['rows'] for concept in row['concepts'])
+        return []
+
+    CorpusSnapshot(str(tmp_path)).append([publication(0)])
+    monkeypatch.setattr(knowledge_graph, 'kg_service', KnowledgeGraphService(driver=FakeDriver(respond)),
+                        raising=False)
+    manage.reextract_corpus(SimpleNamespace(path=str(tmp_path), batch_size=10, update_graph=True))
+
+    assert graph == {"pub-000": {'title': "Newer title", 'content_hash': "abc"}}
+    assert edges == [("pub-000", "bone loss"), ("pub-000", "microgravity")]
+
+def test_export_pages_graph_by_id(tmp_path):
+    corpus = [publication(i) for i in range(5)]
+
+    def respond(query, params):
+        after = params.get('after', '')
+        return [pub for pub in corpus if pub['id'] > after][:params['limit']]
+
+    driver = FakeDriver(respond)
+    totals = CorpusSnapshot(str(tmp_path)).export_from(KnowledgeGraphService(driver=driver), page_size=2)
+
+    assert totals == {'appended': 5, 'updated': 0, 'unchanged': 0}
+    queries = [query for query, _ in driver.queries]
+    assert queries == [EXPORT_FIRST_PUBLICATIONS_QUERY, EXPORT_NEXT_PUBLICATIONS_QUERY, EXPORT_NEXT_PUBLICATIONS_QUERY]
+    assert [params.get('after') for _, params in driver.queries] == [None, "pub-001", "pub-003"]
@@ -0,0 +1,116 @@
+import asyncio
+from app.data.nasa_connector import PageFetchError, content_hash
+from app.services.ingest_pipeline import IngestJob, IngestPipeline, WatermarkStore
+from tests.fakes import FakeRedis
+
+class RecordingGraph:
+    def __init__(self):
+        self.batches = []
+
+    async def upsert_publications_batch(self, publications, concepts_by_pub):
+        self.batches.append((list(publications), dict(concepts_by_pub)))
+        return len(publications)
+
+    async def existing_content_hashes(self, ids, label='Publication'):
+        return {}
+
+async def generate(count):
+    for i in range(count):
+        yield {'id': f"pub-{i}", 'title': "Radiation on Mars" if i % 2 else "Sleep", 'abstract': None}
+
+def test_pipeline_streams_bounded_batches():
+    graph = RecordingGraph()
+    pipeline = IngestPipeline(graph, lambda text: [word.lower() for word in text.split()[:1]],
+                              queue_size=4, batch_size=10)
+    job = IngestJob('pubspace', {'max_results': 95})
+
+    asyncio.run(pipeline.run(job, generate(95)))
+
+    assert job.status == 'completed'
+    assert [len(pubs) for pubs, _ in graph.batches] == [10] * 9 + [5]
+    assert graph.batches[0][1]['pub-1'] == ["radiation"]
+    stages = job.to_dict()['stages']
+    assert stages['fetch']['items'] == stages['write']['items'] == 95
+    assert stages['write']['batches'] == 10
+    assert stages['extract']['max_queue_depth'] <= 4
+
+def test_pipeline_reports_stage_failure():
+    class FailingGraph(RecordingGraph):
+        async def upsert_publications_batch(self, publications, concepts_by_pub):
+            raise RuntimeError("neo4j unavailable")
+
+    pipeline = IngestPipeline(FailingGraph(), lambda text: [], queue_size=2, batch_size=5)
+    job = IngestJob('pubspace', {})
+
+    asyncio.run(pipeline.run(job, generate(50)))
+
+    assert job.status == 'failed'
+    assert job.error == "neo4j unavailable"
+
+class HashedGraph(RecordingGraph):
+    def __init__(self):
+        super().__init__()
+        self.hashes = {}
+
+    async def upsert_publications_batch(self, publications, concepts_by_pub):
+        self.hashes.update({pub['id']: pub['content_hash'] for pub in publications})
+        return await super().upsert_publications_batch(publications, concepts_by_pub)
+
+    async def existing_content_hashes(self, ids, label='Publication'):
+        return {i: self.hashes[i] for i in ids if i in self.hashes}
+
+def dated_records(version=0, order=range(6), limit=None):
+    async def generate_records():
+        for i in list(order)[:limit]:
+            title = "revised" if version and i == 4 else "original"
+            pub = {'id': f"pub-{i}", 'title': title, 'abstract': None, 'publication_date': f"2024-01-0{i + 1}"}
+            yield {**pub, 'content_hash': content_hash(pub)}
+    return generate_records()
+
+def test_incremental_ingest_skips_unchanged_and_old_records():
+    graph = HashedGraph()
+    watermarks = WatermarkStore(redis_client=FakeRedis())
+    pipeline = IngestPipeline(graph, lambda text: [], batch_size=4, watermarks=watermarks)
+
+    first = asyncio.run(pipeline.run(IngestJob('pubspace', {'query': "bone"}), dated_records(0)))
+    assert first.changes == {'new': 6, 'updated': 0, 'skipped': 0}
+    assert watermarks.get(first.watermark_scope) == "2024-01-06"
+
+    # Everything but the mark day is dropped unseen; pub-5 is re-checked by hash
+    second = asyncio.run(pipeline.run(IngestJob('pubspace', {'query': "bone"}), dated_records(1)))
+    assert second.changes == {'new': 0, 'updated': 0, 'skipped': 6}
+
+    full = asyncio.run(pipeline.run(IngestJob('pubspace', {'query': "bone", 'full_refresh': True}), dated_records(1)))
+    assert full.changes == {'new': 0, 'updated': 6, 'skipped': 0}
+    assert [pub['id'] for batch, _ in graph.batches[-2:] for pub in batch] == [f"pub-{i}" for i in range(6)]
+
+def test_capped_run_does_not_advance_watermark():
+    graph = HashedGraph()
+    watermarks = WatermarkStore(redis_client=FakeRedis())
+    pipeline = IngestPipeline(graph, lambda text: [], batch_size=4, watermarks=watermarks)
+
+    # Pages arrive out of order, so the newest records can come first in a capped run
+    capped = asyncio.run(pipeline.run(IngestJob('pubspace', {'query': "bone", 'max_results': 3}),
+                                      dated_records(order=[5, 1, 4, 0, 3, 2], limit=3)))
+    assert capped.changes == {'new': 3, 'updated': 0, 'skipped': 0}
+    assert watermarks.get(capped.watermark_scope) is None
+
+    larger = asyncio.run(pipeline.run(IngestJob('pubspace', {'query': "bone", 'max_results': 10}),
+                                      dated_records(order=[5, 1, 4, 0, 3, 2])))
+    assert larger.changes == {'new': 3, 'updated': 0, 'skipped': 3}
+    assert sorted(graph.hashes) == [f"pub-{i}" for i in range(6)]
+    assert watermarks.get(larger.watermark_scope) == "2024-01-06"
+
+def test_failed_listing_does_not_advance_watermark():
+    async def failing_records():
+        async for record in dated_records(limit=2):
+            yield record
+        raise PageFetchError('PubSpace', 2)
+
+    watermarks = WatermarkStore(redis_client=FakeRedis())
+    pipeline = IngestPipeline(HashedGraph(), lambda text: [], watermarks=watermarks)
+    job = asyncio.run(pipeline.run(IngestJob('pubspace', {'query': "bone"}), failing_records()))
+
+    assert job.status == 'failed'
+    assert job.error == "PubSpace page 2 could not be fetched"
+    assert watermarks.get(job.watermark_scope) is None
@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.services.jobs import JobQueue, job_queue
+from app.worker import JobWorker
+from tests.fakes import FakeRedis
+
+@pytest.fixture
+def queue():
+    return JobQueue(redis_client=FakeRedis())
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(job_queue, '_redis', FakeRedis())
+    return TestClient(app)
+
+def test_identical_submissions_are_deduplicated(queue):
+    first, created = queue.submit('mission', {'duration_days': 180})
+    duplicate, duplicate_created = queue.submit('mission', {'duration_days': 180})
+    other, _ = queue.submit('mission', {'duration_days': 365})
+
+    assert created and not duplicate_created
+    assert duplicate['job_id'] == first['job_id']
+    assert other['job_id'] != first['job_id']
+
+    queue.finish(first['job_id'], 'failed', error="boom")
+    retried, retried_created = queue.submit('mission', {'duration_days': 180})
+    assert retried_created and retried['job_id'] != first['job_id']
+
+def test_completed_ingest_is_not_a_duplicate(queue):
+    params = {'query': "bone", 'max_results': 20, 'full_refresh': False}
+    ingest, _ = queue.submit('ingest_pubspace', params)
+    assert queue.submit('ingest_pubspace', params)[0]['job_id'] == ingest['job_id']
+    mission, _ = queue.submit('mission', {'duration_days': 180})
+
+    queue.finish(ingest['job_id'], 'completed', result={})
+    queue.finish(mission['job_id'], 'completed', result={})
+    rerun, rerun_created = queue.submit('ingest_pubspace', params)
+    assert rerun_created and rerun['job_id'] != ingest['job_id']
+    assert queue.submit('mission', {'duration_days': 180}) == (queue.get(mission['job_id']), False)
+
+def test_worker_runs_job_and_stores_progress_and_result(queue):
+    async def handler(params, report):
+        report({'done': 1, 'total': 2})
+        return {'doubled': params['value'] * 2}
+
+    job, _ = queue.submit('mission', {'value': 21})
+    worker = JobWorker(queue, handlers={'mission': handler}, concurrency=1)
+
+    assert asyncio.run(worker.execute(queue.next_job())) == 'completed'
+    stored = queue.get(job['job_id'])
+    assert stored['result'] == {'doubled': 42}
+    assert stored['progress'] == {'done': 1, 'total': 2}
+    assert stored['started_at'] <= stored['finished_at']
+
+def test_failed_and_cancelled_jobs(queue, monkeypatch):
+    monkeypatch.setattr(settings, 'JOB_PROGRESS_INTERVAL', 0.01)
+
+    async def failing(params, report):
+        raise RuntimeError("no data")
+
+    async def slow(params, report):
+        await asyncio.sleep(10)
+
+    worker = JobWorker(queue, handlers={'mission': failing, 'monte_carlo': slow}, concurrency=1)
+    failed, _ = queue.submit('mission', {})
+    assert asyncio.run(worker.execute(queue.next_job())) == 'failed'
+    assert queue.get(failed['job_id'])['error'] == "no data"
+
+    running, _ = queue.submit('monte_carlo', {})
+
+    async def cancel_while_running():
+        execution = asyncio.create_task(worker.execute(queue.next_job()))
+        await asyncio.sleep(0.02)
+        assert queue.cancel(running['job_id'])['status'] == 'cancelling'
+        return await asyncio.wait_for(execution, 1)
+
+    assert asyncio.run(cancel_while_running()) == 'cancelled'
+
+    pending, _ = queue.submit('monte_carlo', {'trials': 5})
+    assert queue.cancel(pending['job_id'])['status'] == 'cancelled'
+    assert asyncio.run(worker.execute(queue.next_job())) is None
+
+def test_expired_lease_fails_the_job_and_allows_a_resubmit(queue, monkeypatch):
+    job, _ = queue.submit('mission', {'duration_days': 180})
+    monkeypatch.setattr(settings, 'JOB_LEASE_SECONDS', -1)
+    queue.claim(queue.next_job())
+
+    resubmitted, created = queue.submit('mission', {'duration_days': 180})
+    assert created and resubmitted['job_id'] != job['job_id']
+    lost = queue.get(job['job_id'])
+    assert lost['status'] == 'failed' and lost['error'] == "Worker lease expired"
+
+def test_worker_renews_the_lease_while_running(queue, monkeypatch):
+    monkeypatch.setattr(settings, 'JOB_PROGRESS_INTERVAL', 0.01)
+    leases = []
+
+    async def slow(params, report):
+        for _ in range(3):
+            await asyncio.sleep(0.03)
+            leases.append(queue.get(job['job_id'])['lease_expires_at'])
+
+    job, _ = queue.submit('monte_carlo', {})
+    worker = JobWorker(queue, handlers={'monte_carlo': slow}, concurrency=1)
+
+    assert asyncio.run(worker.execute(queue.next_job())) == 'completed'
+    assert leases == sorted(leases) and leases[0] < leases[-1]
+
+def test_mission_error_result_fails_the_job(queue, monkeypatch):
+    from app.services.simulation_engine import mission_simulator
+    monkeypatch.setattr(mission_simulator, 'simulate_mission', lambda params: {'error': "no graph"})
+
+    job, _ = queue.submit('mission', {'duration_days': 180})
+    assert asyncio.run(JobWorker(queue, concurrency=1).execute(queue.next_job())) == 'failed'
+    assert queue.get(job['job_id'])['error'] == "no graph"
+    assert queue.submit('mission', {'duration_days': 180})[1]
+
+def test_job_routes(client):
+    submitted = client.post("/jobs", json={'type': 'mission', 'params': {'destination': 'moon'}})
+    assert submitted.status_code == 202
+    job = submitted.json()
+    assert job['params']['duration_days'] == 365 and not job['deduplicated']
+
+    again = client.post("/jobs", json={'type': 'mission', 'params': {'destination': 'moon', 'duration_days': 365}})
+    assert again.json()['job_id'] == job['job_id'] and again.json()['deduplicated']
+
+    assert client.get(f"/jobs/{job['job_id']}").json()['status'] == 'pending'
+    assert client.get(f"/jobs/{job['job_id']}/result").status_code == 409
+    assert client.delete(f"/jobs/{job['job_id']}").json()['status'] == 'cancelled'
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.post("/jobs", json={'type': 'unknown'}).status_code == 422
+    assert client.post("/jobs", json={'type': 'mission', 'params': {'duration_days': "long"}}).status_code == 422
+
+    ingest = client.post("/data/ingest/pubspace", params={'query': "bone", 'max_results': 5})
+    assert ingest.status_code == 202
+    assert client.get(f"/jobs/{ingest.json()['job_id']}").json()['type'] == 'ingest_pubspace'
@@ -0,0 +1,216 @@
+import asyncio
+import httpx
+from app.dependencies import get_async_kg_service
+from app.main import app
+from app.services.ingest_pipeline import IngestJob, IngestPipeline
+from app.services.knowledge_graph import (
+    AsyncKnowledgeGraphService, KnowledgeGraphService, DELETE_DATASET_LINKS_QUERY, DELETE_STALE_DISCUSSES_QUERY,
+    GRAPH_COUNTS_SEEDED_QUERY, READ_GRAPH_COUNTS_QUERY, UPDATE_GRAPH_COUNTS_QUERY, UPSERT_CONCEPTS_QUERY,
+    UPSERT_CONDUCTED_IN_QUERY, UPSERT_DATASETS_QUERY, UPSERT_DISCUSSES_QUERY, UPSERT_ENVIRONMENTS_QUERY,
+    UPSERT_ORGANISMS_QUERY, UPSERT_PUBLICATIONS_QUERY, UPSERT_STUDIES_QUERY
+)
+from app.services.traversal import START_NODE_QUERY
+from tests.fakes import FakeAsyncDriver, FakeDriver, FakeTransaction
+
+def make_publications(count):
+    return [
+        {'id': f"pub-{i}", 'title': f"Title {i}", 'abstract': "", 'authors': [], 'source': 'pubspace'}
+        for i in range(count)
+    ]
+
+def make_datasets(count):
+    return [
+        {'id': f"GLDS-{i}", 'title': f"Dataset {i}", 'description': "Radiation exposure in mice",
+         'organism': "Mus musculus" if i % 2 else 'Unknown', 'space_mission': "RR-1", 'source': 'genelab'}
+        for i in range(count)
+    ]
+
+def created_counters(query, params):
+    """Pretend every MERGE in the statement created something new"""
+    if query in (UPSERT_PUBLICATIONS_QUERY, UPSERT_DATASETS_QUERY):
+        return {'nodes_created': len(params['rows'])}
+    if query == UPSERT_CONCEPTS_QUERY:
+        return {'nodes_created': len(params['concepts'])}
+    if query == UPSERT_ORGANISMS_QUERY:
+        return {'nodes_created': len(params['organisms'])}
+    if query == UPSERT_ENVIRONMENTS_QUERY:
+        return {'nodes_created': len(params['environments'])}
+    if query == UPSERT_STUDIES_QUERY:
+        return {'relationships_created': sum(1 for row in params['rows'] if row['organism'])}
+    if query == UPSERT_CONDUCTED_IN_QUERY:
+        return {'relationships_created': sum(1 for row in params['rows'] if row['space_mission'])}
+    if query == UPSERT_DISCUSSES_QUERY:
+        return {'relationships_created': sum(len(row['concepts']) for row in params['rows'])}
+    return {}
+
+def test_upsert_publications_batch_chunks_rows():
+    driver = FakeDriver(counters=created_counters)
+    service = KnowledgeGraphService(driver=driver, batch_size=2)
+    publications = make_publications(5)
+
+    written = service.upsert_publications_batch(publications, {'pub-0': ["radiation", "mars"]})
+
+    assert written == 5
+    assert driver.transactions == 3
+    upserts = [params for query, params in driver.queries if query == UPSERT_PUBLICATIONS_QUERY]
+    assert [len(params['rows']) for params in upserts] == [2, 2, 1]
+    first_row = upserts[0]['rows'][0]
+    assert first_row['concepts'] == ["radiation", "mars"]
+    assert first_row['journal'] is None
+
+def test_batch_write_maintains_graph_counts_in_same_transaction():
+    driver = FakeDriver(counters=created_counters)
+    service = KnowledgeGraphService(driver=driver, batch_size=10)
+
+    service.upsert_publications_batch(make_publications(3), {'pub-0': ["radiation", "mars"], 'pub-1': ["mars"]})
+
+    assert driver.transactions == 1
+    deltas = [params['deltas'] for query, params in driver.queries if query == UPDATE_GRAPH_COUNTS_QUERY]
+    assert deltas == [[
+        {'key': "node:Publication", 'kind': 'node', 'name': "Publication", 'count': 3},
+        {'key': "node:Concept", 'kind': 'node', 'name': "Concept", 'count': 2},
+        {'key': "relationship:DISCUSSES", 'kind': 'relationship', 'name': "DISCUSSES", 'count': 3}
+    ]]
+
+def test_rewrite_replaces_stale_concept_edges():
+    def counters(query, params):
+        if query == DELETE_STALE_DISCUSSES_QUERY:
+            return {'relationships_deleted': 2}
+        if query == UPSERT_DISCUSSES_QUERY:
+            return {'relationships_created': 1}
+        return {}
+
+    driver = FakeDriver(counters=counters)
+    KnowledgeGraphService(driver=driver).upsert_publications_batch(make_publications(1), {'pub-0': ["mars"]})
+
+    queries = [query for query, _ in driver.queries]
+    assert queries.index(DELETE_STALE_DISCUSSES_QUERY) < queries.index(UPSERT_DISCUSSES_QUERY)
+    deltas = [params['deltas'] for query, params in driver.queries if query == UPDATE_GRAPH_COUNTS_QUERY]
+    assert deltas == [[{'key': "relationship:DISCUSSES", 'kind': 'relationship', 'name': "DISCUSSES", 'count': -1}]]
+
+def test_graph_stats_and_reconcile():
+    counts = {'Publication': 4, 'Concept': 2, 'GraphCount': 3}
+
+    def respond(query, params):
+        if query == READ_GRAPH_COUNTS_QUERY:
+            return [{'kind': 'node', 'name': "Publication", 'count': 4},
+                    {'kind': 'relationship', 'name': "DISCUSSES", 'count': 7}]
+        if "db.labels" in query:
+            return [{'label': label} for label in counts]
+        if "db.relationshipTypes" in query:
+            return [{'relationshipType': "DISCUSSES"}]
+        if query.startswith("MATCH (n:"):
+            return [{'count': counts[query.split('`')[1]]}]
+        if query.startswith("MATCH ()-[r:"):
+            return [{'count': 7}]
+        return []
+
+    service = KnowledgeGraphService(driver=FakeDriver(respond))
+    assert service._read_graph_stats(FakeTransaction(service.driver)) == {
+        'node_counts': {'Publication': 4}, 'relationship_counts': {'DISCUSSES': 7}, 'total_relationships': 7
+    }
+    assert service.reconcile_graph_stats() == {
+        'node_counts': {'Publication': 4, 'Concept': 2}, 'relationship_counts': {'DISCUSSES': 7},
+        'total_relationships': 7
+    }
+
+def test_init_schema_seeds_missing_graph_counts():
+    def respond(query, params):
+        if query == GRAPH_COUNTS_SEEDED_QUERY and seeded:
+            return [{'key': "node:Publication"}]
+        if "db.labels" in query:
+            return [{'label': "Publication"}]
+        if query.startswith("MATCH (n:"):
+            return [{'count': 3}]
+        return []
+
+    for seeded in (True, False):
+        driver = FakeDriver(respond)
+        KnowledgeGraphService(driver=driver).init_schema()
+        updates = [params for query, params in driver.queries if query == UPDATE_GRAPH_COUNTS_QUERY]
+        assert updates == ([] if seeded else [{'deltas': [
+            {'key': "node:Publication", 'kind': 'node', 'name': "Publication", 'count': 3}
+        ]}])
+
+def test_concurrent_concept_requests_overlap():
+    def respond(query, params):
+        if query == START_NODE_QUERY:
+            return [{'id': params['concept_name'], 'name': params['concept_name'], 'type': 'Concept'}]
+        return []
+
+    driver = FakeAsyncDriver(responder=respond, latency=0.05)
+    service = AsyncKnowledgeGraphService(driver=driver)
+    app.dependency_overrides[get_async_kg_service] = lambda: service
+
+    async def fire():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.get(f"/data/graph/concepts/overlap-{i}", params={'depth': 1}) for i in range(10)
+            ])
+
+    try:
+        responses = asyncio.run(fire())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [r.json()['nodes'][0]['name'] for r in responses] == [f"overlap-{i}" for i in range(10)]
+    assert driver.max_in_flight == 10
+
+def test_dataset_batch_upserts_organisms_and_missions():
+    driver = FakeDriver(counters=created_counters)
+    service = KnowledgeGraphService(driver=driver, batch_size=10)
+
+    service.upsert_datasets_batch(make_datasets(3), {'GLDS-1': ["radiation"]})
+
+    params = dict((query, params) for query, params in driver.queries)
+    assert [row['organism'] for row in params[UPSERT_DATASETS_QUERY]['rows']] == [None, "Mus musculus", None]
+    assert params[UPSERT_ORGANISMS_QUERY]['organisms'] == ["Mus musculus"]
+    assert params[UPSERT_ENVIRONMENTS_QUERY]['environments'] == ["RR-1"]
+    counts = {delta['key']: delta['count'] for delta in params[UPDATE_GRAPH_COUNTS_QUERY]['deltas']}
+    assert counts == {
+        "node:Dataset": 3, "node:Organism": 1, "node:Environment": 1, "node:Concept": 1,
+        "relationship:STUDIES": 1, "relationship:CONDUCTED_IN": 3
+    }
+
+def test_reingested_dataset_replaces_its_links():
+    def responder(query, params):
+        if query == DELETE_DATASET_LINKS_QUERY:
+            return [{'rel_type': 'STUDIES', 'deleted': 1}, {'rel_type': 'CONDUCTED_IN', 'deleted': 3}]
+        return []
+
+    driver = FakeAsyncDriver(responder=responder, counters=created_counters)
+    service = AsyncKnowledgeGraphService(driver=driver, batch_size=10)
+
+    asyncio.run(service.upsert_datasets_batch(make_datasets(3), {}))
+
+    queries = [query for query, _ in driver.queries]
+    assert queries.index(DELETE_DATASET_LINKS_QUERY) < queries.index(UPSERT_STUDIES_QUERY)
+    assert queries.index(DELETE_DATASET_LINKS_QUERY) < queries.index(UPSERT_CONDUCTED_IN_QUERY)
+    deltas = dict(driver.queries)[UPDATE_GRAPH_COUNTS_QUERY]['deltas']
+    counts = {delta['key']: delta['count'] for delta in deltas}
+    assert "relationship:STUDIES" not in counts and "relationship:CONDUCTED_IN" not in counts
+
+def test_genelab_and_pubspace_ingest_share_the_driver_pool():
+    driver = FakeAsyncDriver(latency=0.01, counters=created_counters)
+    service = AsyncKnowledgeGraphService(driver=driver, batch_size=5)
+
+    async def records(items):
+        for item in items:
+            yield item
+
+    async def ingest():
+        pubs = IngestPipeline(service, lambda text: ["radiation"], batch_size=5)
+        datasets = IngestPipeline(service, lambda text: ["radiation"], batch_size=5, record_kind='datasets')
+        return await asyncio.gather(
+            pubs.run(IngestJob('pubspace', {}), records(make_publications(10))),
+            datasets.run(IngestJob('genelab', {}), records(make_datasets(10)))
+        )
+
+    pub_job, dataset_job = asyncio.run(ingest())
+
+    assert pub_job.status == dataset_job.status == 'completed'
+    assert dataset_job.changes == {'new': 10, 'updated': 0, 'skipped': 0}
+    assert dataset_job.to_dict()['stages']['write']['batches'] == 2
+    assert driver.max_in_flight == 2
+    queries = [query for query, _ in driver.queries]
+    assert queries.count(UPSERT_DATASETS_QUERY) == queries.count(UPSERT_PUBLICATIONS_QUERY) == 2
@@ -1,6 +1,12 @@
+import os
+import subprocess
+import sys
 from fastapi.testclient import TestClient
+from app.dependencies import get_mission_simulator
 from app.main import app
 
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 client = TestClient(app)
 
 def test_root():
@@ -11,4 +17,24 @@ def test_root():
 def test_health():
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json()["status"] == "healthy"
\ No newline at end of file
+    assert response.json()["status"] == "healthy"
+
+def test_import_defers_heavy_modules_and_services():
+    probe = (
+        "import sys, app.main\n"
+        "from app.services import knowledge_graph\n"
+        "print([m for m in ('numpy', 'neo4j', 'aiohttp') if m in sys.modules], 'kg_service' in vars(knowledge_graph))"
+    )
+    output = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND, check=True, capture_output=True, text=True)
+    assert output.stdout.split() == ["[]", "False"]
+
+def test_services_are_injected():
+    class Simulator:
+        destinations = {'titan': {'name': "Titan"}}
+
+    app.dependency_overrides[get_mission_simulator] = Simulator
+    try:
+        response = client.get("/simulation/destinations")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.json() == {'destinations': [{'id': 'titan', 'name': "Titan"}]}
@@ -0,0 +1,111 @@
+import asyncio
+import urllib.request
+from fastapi.testclient import TestClient
+from app.main import app
+from app.serve import start_metrics_server
+from app.services.metrics import FETCH_RETRIES, GRAPH_QUERY_SECONDS, MetricsRegistry, metrics
+from app.services.knowledge_graph import KnowledgeGraphService, pool_usage
+from tests.fakes import FakeDriver, FakeTransaction
+
+client = TestClient(app)
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo", ('stage',), buckets=(0.1, 1.0))
+    histogram.observe(0.05, ('fetch',))
+    histogram.observe(0.5, ('fetch',))
+    histogram.observe(5.0, ('fetch',))
+
+    text = registry.render()
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="fetch",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="fetch",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="fetch",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="fetch"} 3' in text
+    assert 'demo_seconds_sum{stage="fetch"} 5.55' in text
+
+def test_timer_as_decorator_and_context_manager():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("work_seconds", "Work", ('phase',))
+
+    @histogram.time('sync')
+    def work():
+        return 1
+
+    @histogram.time('async')
+    async def async_work():
+        return 2
+
+    with histogram.time('block'):
+        pass
+    assert work() == 1
+    assert asyncio.run(async_work()) == 2
+    assert [histogram.count((phase,)) for phase in ('sync', 'async', 'block')] == [1, 1, 1]
+
+def test_counter_and_gauge_collect_at_scrape_time():
+    registry = MetricsRegistry()
+    source = {'hits': 3}
+    registry.counter("lookups_total", "Lookups", ('result',), collect=lambda: {('hit',): source['hits']})
+    registry.gauge("ratio", "Ratio", collect=lambda: {(): 0.25})
+    source['hits'] = 7
+
+    text = registry.render()
+    assert 'lookups_total{result="hit"} 7' in text
+    assert 'ratio 0.25' in text
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("names_total", "Names", ('name',)).inc(labels=('say "hi"\n',))
+    assert 'names_total{name="say \\"hi\\"\\n"} 1' in registry.render()
+
+def test_constant_labels_mark_every_sample():
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits").inc()
+    registry.histogram("wait_seconds", "Wait", ('stage',), buckets=(1.0,)).observe(0.5, ('fetch',))
+    registry.constant_labels = {'worker': "1"}
+
+    text = registry.render()
+    assert 'hits_total{worker="1"} 1' in text
+    assert 'wait_seconds_bucket{worker="1",stage="fetch",le="1"} 1' in text
+
+def test_prefork_worker_serves_its_own_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, 'constant_labels', {'worker': "3"})
+    FETCH_RETRIES.inc(labels=('PubSpace',))
+    server = start_metrics_server("127.0.0.1", 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            text = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'biosynapse_http_fetch_retries_total{worker="3",source="PubSpace"}' in text
+    assert all('worker="3"' in line for line in text.splitlines() if not line.startswith('#'))
+
+def test_graph_transactions_are_timed_by_query_name():
+    before = GRAPH_QUERY_SECONDS.count(('traverse_neighborhood',))
+    KnowledgeGraphService._traverse_neighborhood(FakeTransaction(FakeDriver(lambda query, params: [])), "bone", 2, 5)
+    assert GRAPH_QUERY_SECONDS.count(('traverse_neighborhood',)) == before + 1
+
+def test_pool_usage_reads_driver_connections():
+    class Connection:
+        def __init__(self, in_use):
+            self.in_use = in_use
+
+    class Pool:
+        connections = {'neo4j:7687': [Connection(True), Connection(False), Connection(False)]}
+
+    class Driver:
+        _pool = Pool()
+
+    assert pool_usage(Driver()) == {'in_use': 1, 'idle': 2}
+    assert pool_usage(object()) == {}
+
+def test_metrics_endpoint_reports_route_latency():
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    text = response.text
+    assert 'biosynapse_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in text
+    assert 'biosynapse_cache_hit_ratio' in text
@@ -0,0 +1,38 @@
+from app.services.batch_simulation import batch_risk_engine
+from app.services.monte_carlo import MonteCarloSimulator, SAMPLED_COEFFICIENTS
+from app.services.simulation_engine import mission_simulator, RISK_AREAS
+
+MISSION = {'duration_days': 400, 'destination': 'mars', 'radiation_shielding': 'standard'}
+
+def test_seeded_runs_match_inline_and_pooled():
+    inline = MonteCarloSimulator(batch_risk_engine, chunk_size=5000, max_workers=1)
+    pooled = MonteCarloSimulator(batch_risk_engine, chunk_size=5000, max_workers=2)
+    try:
+        first = inline.simulate(MISSION, trials=20000, seed=7)
+        second = inline.simulate(MISSION, trials=20000, seed=7)
+        chunked = pooled.simulate(MISSION, trials=20000, seed=7)
+    finally:
+        pooled.close()
+
+    assert first == second == chunked
+    assert set(chunked['risk_percentiles']) == set(RISK_AREAS)
+    assert chunked['trials'] == 20000
+
+def test_percentiles_bracket_point_estimate():
+    simulator = MonteCarloSimulator(batch_risk_engine)
+    results = simulator.simulate(MISSION, trials=20000, seed=1)
+    point = mission_simulator._calculate_risks(400, 'mars', False, 'standard')
+
+    for area in RISK_AREAS:
+        stats = results['risk_percentiles'][area]
+        assert stats['p5'] <= stats['p50'] <= stats['p95']
+        assert abs(stats['p50'] - point[area]) < 0.01
+
+def test_fixed_distributions_collapse_to_point_estimate():
+    simulator = MonteCarloSimulator(batch_risk_engine)
+    fixed = {name: {'distribution': 'fixed'} for name in SAMPLED_COEFFICIENTS}
+    results = simulator.simulate(MISSION, trials=1000, seed=3, distributions=fixed)
+    point = mission_simulator._calculate_risks(400, 'mars', False, 'standard')
+
+    for area in RISK_AREAS:
+        assert results['risk_percentiles'][area]['p95'] == point[area]
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.data.nasa_connector import NASADataConnector, PageFetchError, content_hash
+
+TOTAL = 45
+
+def make_app(failures=None):
+    """Stand-in PubSpace/GeneLab API; `failures` maps page -> statuses to return first"""
+    failures = {page: list(statuses) for page, statuses in (failures or {}).items()}
+    state = {'in_flight': 0, 'max_in_flight': 0, 'requests': 0}
+
+    async def pubspace(request):
+        page = int(request.query['page'])
+        size = int(request.query['size'])
+        state['requests'] += 1
+        state['in_flight'] += 1
+        state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        try:
+            await asyncio.sleep(0.01)
+            if failures.get(page):
+                return web.Response(status=failures[page].pop(0), headers={'Retry-After': '0'})
+            start = (page - 1) * size
+            results = [{'id': f"pub-{i}", 'title': f"Publication {i}"} for i in range(start, min(start + size, TOTAL))]
+            return web.json_response({'results': results, 'total': TOTAL})
+        finally:
+            state['in_flight'] -= 1
+
+    async def genelab(request):
+        page = int(request.query['page'])
+        size = int(request.query['size'])
+        start = (page - 1) * size
+        data = [{'accession': f"GLDS-{i}", 'organism': "Mus musculus"} for i in range(start, min(start + size, 12))]
+        return web.json_response({'data': data})
+
+    app = web.Application()
+    app.router.add_get('/pubspace/', pubspace)
+    app.router.add_get('/genelab/search/{dataset_type}', genelab)
+    return app, state
+
+async def run_with_server(app, coro_factory):
+    server = TestServer(app)
+    await server.start_server()
+    connector = NASADataConnector(
+        base_urls={'pubspace': str(server.make_url('/pubspace/')), 'genelab': str(server.make_url('/genelab/'))},
+        page_size=10, concurrency=2, rate_limit=0, max_retries=3, backoff_base=0.001
+    )
+    try:
+        return await coro_factory(connector)
+    finally:
+        await connector.close()
+        await server.close()
+
+def test_walks_all_pages_with_bounded_concurrency():
+    app, state = make_app()
+    pubs = asyncio.run(run_with_server(app, lambda c: c.fetch_pubspace_publications("microgravity", max_results=None)))
+
+    assert sorted(int(p['id'].split('-')[1]) for p in pubs) == list(range(TOTAL))
+    assert state['requests'] == 5
+    assert state['max_in_flight'] <= 2
+
+def test_max_results_limits_pages():
+    app, state = make_app()
+    pubs = asyncio.run(run_with_server(app, lambda c: c.fetch_pubspace_publications("microgravity", max_results=15)))
+
+    assert len(pubs) == 15
+    assert state['requests'] == 2
+
+def test_retries_transient_errors():
+    app, state = make_app(failures={1: [503, 429], 3: [502]})
+    pubs = asyncio.run(run_with_server(app, lambda c: c.fetch_pubspace_publications("microgravity", max_results=None)))
+
+    assert len(pubs) == TOTAL
+    assert state['requests'] == 8
+
+def test_page_failing_after_retries_raises():
+    app, _ = make_app(failures={3: [503] * 4})
+    with pytest.raises(PageFetchError) as failure:
+        asyncio.run(run_with_server(app, lambda c: c.fetch_pubspace_publications("microgravity", max_results=None)))
+
+    assert failure.value.page == 3
+
+def test_genelab_pages_until_short_page():
+    app, _ = make_app()
+    datasets = asyncio.run(run_with_server(app, lambda c: c.fetch_genelab_data("transcriptomics")))
+
+    assert len(datasets) == 12
+    assert all(d['source'] == 'genelab' for d in datasets)
+
+def test_parsed_records_carry_content_hash():
+    connector = NASADataConnector()
+    first = connector._parse_pubspace_data({'results': [{'id': "pub-1", 'title': "A"}]})[0]
+    same = connector._parse_pubspace_data({'results': [{'id': "pub-1", 'title': "A"}]})[0]
+    edited = connector._parse_pubspace_data({'results': [{'id': "pub-1", 'title': "B"}]})[0]
+
+    assert first['content_hash'] == same['content_hash'] != edited['content_hash']
+    assert first['content_hash'] == content_hash({k: v for k, v in first.items() if k != 'content_hash'})
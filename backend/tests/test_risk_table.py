@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.batch_simulation import BatchRiskEngine
+from app.services.risk_table import RiskLookupTable
+from app.services.simulation_engine import MissionSimulator, RISK_AREAS
+
+client = TestClient(app)
+
+def make_table(bucket_days=5):
+    return RiskLookupTable(BatchRiskEngine(MissionSimulator()), bucket_days)
+
+def test_matches_exact_kernel_on_bucket_boundaries():
+    table = make_table()
+    durations = np.arange(0, 1000, 5)
+    args = (durations, 'deep_space', False, 'standard')
+    np.testing.assert_allclose(table.lookup(*args), table.engine.calculate_risks(*args), atol=1e-12)
+
+def test_interpolation_error_within_tolerance():
+    report = make_table(bucket_days=10).verify()
+    assert report['passed']
+    assert 0 < report['max_abs_error'] <= report['tolerance']
+
+def test_scalar_lookup_matches_scalar_simulator():
+    table = make_table()
+    simulator = table.engine.simulator
+    expected = simulator._calculate_risks(400, 'moon', True, 'enhanced')
+    risks = table.lookup(400, 'moon', True, 'enhanced')[0]
+    assert risks == pytest.approx([expected[area] for area in RISK_AREAS])
+
+def test_unknown_names_fall_back_like_exact_path():
+    table = make_table()
+    args = ([100, 500], ['europa', 'mars'], [False, True], ['lead', 'standard'])
+    np.testing.assert_allclose(table.lookup(*args), table.engine.calculate_risks(*args), atol=1e-12)
+
+def test_rebuilds_when_coefficients_change():
+    table = make_table()
+    before = table.lookup(365, 'mars', False, 'standard')[0, 0]
+    fingerprint = table.info()['fingerprint']
+
+    table.engine.simulator.risk_factors['microgravity']['bone_density'] = 0.4
+    after = table.lookup(365, 'mars', False, 'standard')[0, 0]
+
+    assert after == pytest.approx(before / 2)
+    assert table.info()['fingerprint'] != fingerprint
+
+def test_rejects_negative_and_mismatched_inputs():
+    table = make_table()
+    with pytest.raises(ValueError):
+        table.lookup(-1, 'mars', False, 'standard')
+    with pytest.raises(ValueError):
+        table.lookup([1, 2, 3], ['mars', 'moon'], False, 'standard')
+
+def test_what_if_route():
+    response = client.post("/simulation/what-if", json={'duration_days': [0, 180, 365], 'destination': ['mars']})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['scenarios'] == 3
+    assert body['risks'][0] == [0.0] * len(RISK_AREAS)
+
+    response = client.post("/simulation/what-if", json={'duration_days': [-5]})
+    assert response.status_code == 422
+
+    response = client.get("/simulation/what-if/table", params={'verify': True})
+    assert response.json()['verification']['passed']
@@ -0,0 +1,124 @@
+import asyncio
+import numpy as np
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.dependencies import get_similarity_index
+from app.main import app
+from app.services.ingest_pipeline import IngestJob, IngestPipeline
+from app.services.similarity_index import SimilarityIndex
+
+client = TestClient(app)
+
+PUBLICATIONS = [
+    {'id': "pub-1", 'title': "Bone loss in microgravity", 'abstract': "Astronauts lose bone density in orbit"},
+    {'id': "pub-2", 'title': "Bone density of mice", 'abstract': "Microgravity causes bone loss in mice"},
+    {'id': "pub-3", 'title': "Plant growth in space", 'abstract': "Arabidopsis roots grow in microgravity"},
+    {'id': "pub-4", 'title': "Radiation and sleep", 'abstract': "Crew sleep quality under radiation exposure"},
+    {'id': "pub-5", 'title': "Empty record", 'abstract': None}
+]
+
+def make_index(publications=PUBLICATIONS):
+    return SimilarityIndex(hash_bits=12).build([publications[:2], publications[2:]])
+
+def dense_cosine(index):
+    arrays = index._snapshot()
+    matrix = np.zeros((len(arrays.indptr) - 1, index.n_features))
+    rows = np.repeat(np.arange(len(arrays.indptr) - 1), np.diff(arrays.indptr))
+    matrix[rows, arrays.features] = arrays.weights
+    return matrix @ matrix.T
+
+def test_ranks_related_publications_first():
+    similar = make_index().similar("pub-1", limit=3)
+
+    assert [result['id'] for result in similar][:2] == ["pub-2", "pub-3"]
+    assert all(0 < result['score'] <= 1 for result in similar)
+    assert "pub-1" not in [result['id'] for result in similar]
+    assert make_index().similar("unknown") is None
+
+def test_blocked_batch_matches_dense_cosine(monkeypatch):
+    index = make_index()
+    cosine = dense_cosine(index)
+    monkeypatch.setattr(settings, 'SIMILARITY_BLOCK_ELEMENTS', 1)  # one query per block
+
+    for pub_id, similar in zip(["pub-4", "pub-1", "pub-2"], index.similar_batch(["pub-4", "pub-1", "pub-2"], 4)):
+        row = index.publication_ids[pub_id]
+        for result in similar:
+            assert np.isclose(result['score'], cosine[row, index.publication_ids[result['id']]], atol=1e-6)
+    assert index.similar_batch(["pub-1", "missing"]) == [index.similar("pub-1"), None]
+
+def test_incremental_updates_match_full_build():
+    index = make_index(PUBLICATIONS[:3])
+    index.add_publications(PUBLICATIONS[3:])
+    index.add_publications([{**PUBLICATIONS[2], 'abstract': "Sleep and radiation exposure of plants"}])
+
+    rebuilt = make_index(PUBLICATIONS[:2] + [{**PUBLICATIONS[2], 'abstract': "Sleep and radiation exposure of plants"}]
+                         + PUBLICATIONS[3:])
+    assert index.publications == rebuilt.publications
+    np.testing.assert_allclose(dense_cosine(index), dense_cosine(rebuilt), atol=1e-6)
+    assert index.similar("pub-4", limit=1)[0]['id'] == "pub-3"
+
+def test_pipeline_adds_written_publications():
+    class Graph:
+        async def upsert_publications_batch(self, publications, concepts_by_pub):
+            return len(publications)
+
+        async def existing_content_hashes(self, ids, label='Publication'):
+            return {'pub-2': 'unchanged'}
+
+    async def records():
+        for pub in PUBLICATIONS:
+            yield {**pub, 'content_hash': 'unchanged' if pub['id'] == 'pub-2' else 'new'}
+
+    index = SimilarityIndex(hash_bits=12).build([])
+    pipeline = IngestPipeline(Graph(), lambda text: [], batch_size=2, on_records=index.add_publications)
+    asyncio.run(pipeline.run(IngestJob('pubspace', {}), records()))
+
+    assert sorted(index.publications) == ["pub-1", "pub-3", "pub-4", "pub-5"]
+    assert index.similar("pub-1", limit=1)[0]['id'] == "pub-3"
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "similarity.npz")
+    original = make_index()
+    original.save(path)
+
+    loaded = SimilarityIndex()
+    assert loaded.load(path)
+    assert loaded.ready and loaded.n_features == original.n_features
+    assert loaded.similar("pub-2") == original.similar("pub-2")
+    assert not SimilarityIndex(hash_bits=12).load(str(tmp_path / "missing.npz"))
+
+def test_reloads_file_saved_by_another_process(tmp_path):
+    path = str(tmp_path / "similarity.npz")
+    make_index(PUBLICATIONS[:3]).save(path)
+    api = SimilarityIndex()
+    assert api.reload_if_changed(path)
+    assert not api.reload_if_changed(path)
+
+    worker = SimilarityIndex()
+    worker.load(path)
+    worker.add_publications(PUBLICATIONS[3:])
+    worker.save(path)
+
+    assert api.reload_if_changed(path)
+    assert api.similar("pub-4") == worker.similar("pub-4")
+
+def test_unbuilt_index_ignores_publications():
+    index = SimilarityIndex(hash_bits=12)
+    index.add_publications(PUBLICATIONS)
+
+    assert index.memory_report()['pending_publications'] == 0 and not index.dirty
+
+def test_similar_publications_routes():
+    app.dependency_overrides[get_similarity_index] = lambda: SimilarityIndex(hash_bits=12)
+    try:
+        assert client.get("/data/publications/pub-1/similar").status_code == 503
+        index = make_index()
+        app.dependency_overrides[get_similarity_index] = lambda: index
+        assert client.get("/data/publications/missing/similar").status_code == 404
+
+        response = client.get("/data/publications/pub-1/similar", params={'limit': 1})
+        assert response.json() == {'publication_id': "pub-1", 'similar': index.similar("pub-1", 1)}
+        response = client.post("/data/publications/similar", json={'publication_ids': ["pub-2", "nope"], 'limit': 2})
+        assert response.json() == {'results': {'pub-2': index.similar("pub-2", 2), 'nope': None}}
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,63 @@
+import os
+import numpy as np
+from fastapi.testclient import TestClient
+from app.dependencies import get_trajectory_simulator
+from app.main import app
+from app.services.batch_simulation import batch_risk_engine
+from app.services.trajectory import TrajectorySimulator
+from app.services.simulation_engine import RISK_AREAS
+
+client = TestClient(app)
+
+MISSION = {'destination': 'mars', 'radiation_shielding': 'standard'}
+
+def test_resumed_checkpoint_matches_full_run(tmp_path):
+    simulator = TrajectorySimulator(batch_risk_engine, checkpoint_dir=str(tmp_path))
+
+    full = simulator.simulate({**MISSION, 'duration_days': 700}, crew_size=50, seed=4)
+
+    partial = simulator.simulate({**MISSION, 'duration_days': 500}, crew_size=50, seed=4)
+    checkpoint_id = simulator.save_checkpoint(partial)
+    resumed = simulator.simulate({**MISSION, 'duration_days': 700}, crew_size=50, seed=4,
+                                 state=simulator.load_checkpoint(checkpoint_id))
+
+    assert resumed.days == 700
+    assert resumed.mean.dtype == np.float32
+    np.testing.assert_array_equal(resumed.mean[:700], full.mean[:700])
+    np.testing.assert_array_equal(resumed.first_crossing, full.first_crossing)
+
+def test_summary_reports_transit_then_surface_phases(tmp_path):
+    simulator = TrajectorySimulator(batch_risk_engine, checkpoint_dir=str(tmp_path))
+    state = simulator.simulate({**MISSION, 'duration_days': 900})
+
+    summary = simulator.summarize(state, 900, sample_every=100)
+
+    assert [phase['phase'] for phase in summary['phases']] == ['transit', 'surface']
+    assert summary['phases'][0]['end_day'] == 210
+    assert len(summary['trajectory']['day']) == 9
+    assert set(summary['threshold_crossing_day']) == set(RISK_AREAS)
+    assert summary['threshold_crossing_day']['radiation_exposure'] is not None
+
+def test_keeps_only_the_newest_checkpoints(tmp_path):
+    simulator = TrajectorySimulator(batch_risk_engine, checkpoint_dir=str(tmp_path), max_checkpoints=2)
+    state = simulator.simulate({**MISSION, 'duration_days': 30})
+
+    ids = []
+    for mtime in range(4):
+        ids.append(simulator.save_checkpoint(state))
+        os.utime(simulator.checkpoint_path(ids[-1]), ns=(mtime, mtime))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{checkpoint_id}.npz" for checkpoint_id in ids[2:])
+
+def test_route_saves_a_checkpoint_only_on_request(tmp_path):
+    simulator = TrajectorySimulator(batch_risk_engine, checkpoint_dir=str(tmp_path))
+    app.dependency_overrides[get_trajectory_simulator] = lambda: simulator
+    try:
+        response = client.post("/simulation/trajectory", json={'duration_days': 30})
+        assert response.json()['checkpoint_id'] is None
+        assert not os.path.exists(tmp_path) or not os.listdir(tmp_path)
+
+        response = client.post("/simulation/trajectory", json={'duration_days': 30, 'save_checkpoint': True})
+        assert os.listdir(tmp_path) == [f"{response.json()['checkpoint_id']}.npz"]
+    finally:
+        app.dependency_overrides.clear()
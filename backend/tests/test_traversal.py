@@ -0,0 +1,61 @@
+import pytest
+from app.services.knowledge_graph import KnowledgeGraphService
+from app.services.traversal import EXPAND_QUERY, START_NODE_QUERY, InvalidCursor, paginate
+from tests.fakes import FakeDriver, FakeTransaction
+
+# Undirected adjacency with strengths; "hub" links to every leaf
+EDGES = [('radiation', 'hub', 0.9), ('radiation', 'mars', 0.5), ('mars', 'hub', 0.8)] + [
+    ('hub', f"leaf-{i}", 0.1 + i / 100) for i in range(10)
+]
+
+def respond(query, params):
+    if query == START_NODE_QUERY:
+        return [{'id': params['concept_name'], 'name': params['concept_name'], 'type': 'Concept'}]
+    if query == EXPAND_QUERY:
+        rows = []
+        for node in params['frontier']:
+            neighbours = [(b if a == node else a, s, a == node) for a, b, s in EDGES if node in (a, b)]
+            neighbours = [n for n in neighbours if n[0] not in params['visited']][:params['scan_limit']]
+            neighbours.sort(key=lambda n: -n[1])
+            for other, strength, outgoing in neighbours[:params['fanout']]:
+                rows.append({'source': node, 'id': other, 'name': other, 'type': 'Concept',
+                             'rel_type': 'RELATED_TO', 'strength': strength, 'outgoing': outgoing})
+        return rows
+    return []
+
+def traverse(depth, fanout):
+    return KnowledgeGraphService._traverse_neighborhood(FakeTransaction(FakeDriver(respond)), "radiation", depth, fanout)
+
+def test_traversal_deduplicates_and_ranks_by_path_strength():
+    result = traverse(depth=2, fanout=3)
+    names = [node['name'] for node in result['nodes']]
+
+    assert names[0] == "radiation"
+    assert len(names) == len(set(names))
+    # mars is reached directly (0.5) and through hub (0.9 * 0.8); the best path wins
+    mars = next(node for node in result['nodes'] if node['name'] == "mars")
+    assert mars['hop'] == 1 and mars['score'] == 0.5
+    assert names[1] == "hub"
+    assert len(result['relationships']) == len(names) - 1
+
+def test_traversal_caps_fanout_per_node():
+    result = traverse(depth=2, fanout=2)
+    leaves = [node['name'] for node in result['nodes'] if node['name'].startswith("leaf")]
+
+    assert sorted(leaves) == ["leaf-8", "leaf-9"]
+
+def test_cursor_pagination_walks_every_node_once():
+    neighborhood = traverse(depth=2, fanout=20)
+    params = {'concept': "radiation", 'depth': 2, 'fanout': 20}
+    seen, cursor = [], None
+    while True:
+        page = paginate(neighborhood, params, limit=4, cursor=cursor)
+        seen.extend(node['id'] for node in page['nodes'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == [node['id'] for node in neighborhood['nodes']]
+    with pytest.raises(InvalidCursor):
+        paginate(neighborhood, {**params, 'depth': 1}, limit=4,
+                 cursor=paginate(neighborhood, params, limit=4)['next_cursor'])